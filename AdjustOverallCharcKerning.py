@@ -2,11 +2,14 @@
 # -*- coding: utf-8 -*-
 __doc__ = """
 Adjusts kerning for both left and right groups of one or more glyphs
-by a defined value, in the current master.
+by a defined value, in the current master or in all masters.
+Every affected pair is adjusted once, even if both of its sides match.
+Exceptions kerned to the glyph itself (keyed by glyph ID) are adjusted too.
 """
 
 import GlyphsApp
-from vanilla import FloatingWindow, EditText, TextBox, Button
+from vanilla import FloatingWindow, EditText, TextBox, Button, CheckBox
+from kerningCore import GlyphIdCache, KerningIndex, kerningKeysForGlyph
 
 font = Glyphs.font
 master = font.selectedFontMaster
@@ -14,7 +17,7 @@ master = font.selectedFontMaster
 
 class KerningAdjusterUI:
     def __init__(self):
-        self.w = FloatingWindow((300, 140), "Adjust Kerning Groups")
+        self.w = FloatingWindow((300, 165), "Adjust Kerning Groups")
 
         self.w.text1 = TextBox((15, 15, -15, 20), "Glyph (e.g. A v ?):")
         self.w.glyphsInput = EditText((15, 35, -15, 22), placeholder="A o …")
@@ -22,7 +25,9 @@ class KerningAdjusterUI:
         self.w.text2 = TextBox((15, 65, 140, 20), "Adjustment (e.g. 5):")
         self.w.valueInput = EditText((160, 65, 50, 22), text="0")
 
-        self.w.runButton = Button((15, 100, -15, 25), "Apply Value", callback=self.applyAdjustment)
+        self.w.allMasters = CheckBox((15, 95, -15, 20), "All masters", value=False)
+
+        self.w.runButton = Button((15, 125, -15, 25), "Apply Value", callback=self.applyAdjustment)
 
         self.w.open()
 
@@ -34,40 +39,43 @@ class KerningAdjusterUI:
             Glyphs.showNotification("Kerning Adjuster", "⚠️ Enter a valid number.")
             return
 
-        totalCount = 0
-
+        # group keys plus the glyph's own ID for exception pairs
+        glyphIds = GlyphIdCache(font)
+        keysPerGlyph = {}
         for glyphName in glyphNames:
             g = font.glyphs[glyphName]
             if not g:
                 print(f"⚠️ Glyph '{glyphName}' not found.")
                 continue
+            keysPerGlyph[glyphName] = set(kerningKeysForGlyph(g)) | glyphIds.exceptionKeys(glyphName)
 
-            leftGroup = f"@MMK_L_{g.leftKerningGroup or glyphName}"
-            rightGroup = f"@MMK_R_{g.rightKerningGroup or glyphName}"
+        masters = font.masters if self.w.allMasters.get() else [master]
+        allKeys = {key for keys in keysPerGlyph.values() for key in keys}
+        totalCount = 0
 
-            kerningDict = font.kerning[master.id]
-            count = 0
+        for m in masters:
+            # one index per master, shared by all glyphs of this run
+            index = KerningIndex(font.kerning.get(m.id) or {})
 
-            for leftKey in kerningDict.keys():
-                for rightKey in kerningDict[leftKey].keys():
-                    if leftKey in (leftGroup, rightGroup) or rightKey in (leftGroup, rightGroup):
-                        oldValue = kerningDict[leftKey][rightKey]
-                        newValue = oldValue + adjustment
-                        kerningDict[leftKey][rightKey] = newValue
-                        count += 1
+            for glyphName, keys in keysPerGlyph.items():
+                count = len(index.pairsForKeys(keys))
+                if count:
+                    print(f"{m.name}: {count} pairs for {glyphName} ({', '.join(sorted(key for key in keys if key.startswith('@')))} + exceptions).")
+                else:
+                    print(f"{m.name}: No kerning pairs found for {glyphName}.")
 
-            if count:
-                print(f"Adjusted {count} pairs for {glyphName} ({leftGroup}, {rightGroup}) by {adjustment}.")
-            else:
-                print(f"No kerning pairs found for {glyphName}.")
+            # pairs shared by several glyphs (or matching on both sides) are adjusted once
+            count = index.adjust(allKeys, adjustment)
+            print(f"{m.name}: Adjusted {count} unique pairs by {adjustment}.")
             totalCount += count
 
+        mastersName = "all masters" if len(masters) > 1 else master.name
         if totalCount > 0:
             Glyphs.showNotification(
                 "Kerning Adjusted",
-                f"Adjusted {totalCount} pairs across {len(glyphNames)} glyphs by {adjustment} in {master.name}."
+                f"Adjusted {totalCount} pairs across {len(keysPerGlyph)} glyphs by {adjustment} in {mastersName}."
             )
-            print(f"✅ Done! Adjusted {totalCount} kerning pairs in {master.name}.")
+            print(f"✅ Done! Adjusted {totalCount} kerning pairs in {mastersName}.")
             self.w.close()
         else:
             Glyphs.showNotification(
@@ -0,0 +1,61 @@
+# MenuTitle: Auto Kerning Groups
+# -*- coding: utf-8 -*-
+__doc__ = """
+Proposes left and right kerning groups from the outlines: each glyph's side
+profile is sampled at fixed heights, glyphs with matching profiles share a
+group, and composites follow their base glyph.
+Profiles are cached next to the .glyphs file, so only edited layers are
+sampled again. Set applyProposals to True to write the groups.
+"""
+
+import GlyphsApp
+from profileCore import ProfileCache, applyGroups, collectProfiles, proposeGroups
+
+# Largest difference (in units) at any sample height for two sides to share a group
+tolerance = 10
+# Compare the profiles of all masters instead of the current one (stricter, slower)
+useAllMasters = False
+# Only selected glyphs (otherwise all glyphs)
+selectedGlyphsOnly = False
+# Only fill empty groups, keep the ones already set
+keepExisting = True
+# Set to True to write the proposed groups (otherwise report only)
+applyProposals = False
+
+font = Glyphs.font
+if not font:
+    Message("No Font Open", "Open a font and run again.")
+    raise Exception("No font open")
+
+Glyphs.clearLog()
+print("🔍 Sampling side profiles…\n")
+
+if selectedGlyphsOnly:
+    glyphs = [layer.parent for layer in font.selectedLayers]
+else:
+    glyphs = list(font.glyphs)
+masters = list(font.masters) if useAllMasters else [font.selectedFontMaster]
+
+# Profiles per layer, only edited layers are sampled again
+cache = ProfileCache.forFont(font)
+profiles, bases = collectProfiles(font, glyphs, masters, cache)
+if cache:
+    cache.save()
+    print(f"Profiles: {cache.misses} sampled, {cache.hits} from cache.")
+print(f"{len(profiles)} outlined glyphs, {len(bases)} composites.\n")
+
+proposals = proposeGroups(font, profiles, bases, tolerance, keepExisting)
+if not proposals:
+    Message("All Good!", "No kerning groups to change.")
+    raise SystemExit
+
+for glyphName, side, oldGroup, newGroup in proposals:
+    print(f"{glyphName} {side}: {oldGroup or '–'} → {newGroup}")
+
+if applyProposals:
+    changed = applyGroups(font, proposals)
+    print(f"\n✅ Set {len(proposals)} kerning groups on {changed} glyphs.")
+    Glyphs.showNotification("Auto Kerning Groups", f"Set kerning groups on {changed} glyphs.")
+else:
+    print(f"\n{len(proposals)} kerning groups proposed. Set applyProposals = True to write them.")
+    Glyphs.showMacroWindow()
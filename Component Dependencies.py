@@ -0,0 +1,65 @@
+# MenuTitle: Component Dependencies
+# -*- coding: utf-8 -*-
+__doc__ = """
+Lists every glyph that uses the selected glyphs as a component, directly
+or through other composites, in all masters. With 'action' they are edited
+in dependency order (base glyphs first).
+"""
+
+from GlyphsApp import *
+from componentCore import ComponentGraph, copyComponents, decomposeComponents, reanchorComponents
+
+# None      = list only
+# reanchor  = attach components to the current anchors of their base glyphs
+# decompose = decompose components
+# copy      = copy components from the current master into all others
+action = None
+
+# For action = "copy", see Copy components in all Masters
+policy = "skip"
+placement = "copy"
+
+font = Glyphs.font
+
+if not font:
+    Message("No font open.", "Error")
+else:
+    selectedNames = []
+    for layer in font.selectedLayers or []:
+        if layer.parent.name not in selectedNames:
+            selectedNames.append(layer.parent.name)
+
+    if not selectedNames:
+        Message("Please select at least one glyph.", "No selection")
+    else:
+        Glyphs.clearLog()
+
+        # Graph from the .componentgraph.json, only changed glyphs are read again
+        graph = ComponentGraph.forFont(font)
+        print(f"🔗 Component graph: {graph.updated} glyphs read again.\n")
+
+        for glyphName in selectedNames:
+            users = graph.dependents([glyphName])
+            print(f"{glyphName}: {len(users)} dependent glyphs")
+            for master in font.masters:
+                inMaster = graph.dependents([glyphName], master.id)
+                if inMaster != users:
+                    print(f"   {master.name}: {len(inMaster)}")
+
+        stale = graph.stale(selectedNames)
+        glyphs = [font.glyphs[name] for name in stale]
+        print(f"\nOrder: {', '.join(stale) or '–'}\n")
+
+        report = []
+        if action == "reanchor":
+            report, unchanged = reanchorComponents(font, glyphs, font.masters, makePoint=NSPoint, graph=graph)
+        elif action == "decompose":
+            report = decomposeComponents(font, glyphs, font.masters, graph=graph)
+        elif action == "copy":
+            report, unchanged = copyComponents(font, glyphs, font.selectedFontMaster, policy, placement, makePoint=NSPoint, graph=graph)
+        graph.save()
+
+        if report:
+            print("\n".join(report))
+            Glyphs.showNotification("Component Dependencies", f"{len(report)} layers edited ({action}).")
+        Glyphs.showMacroWindow()
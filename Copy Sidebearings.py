@@ -12,6 +12,10 @@ Copy sidebearings from one font to another.
 import vanilla
 import traceback
 from GlyphsApp import Glyphs
+from sidebearingCore import applyMetrics, extractMetrics, matchMasters, metricsDeltas, reportPathForFont, scaleFactors, transformMetrics, writeMetricsReport
+
+SCALE_BASES = ["absolute", "upm", "xheight"]
+ROUNDINGS = ["round", "none", "floor", "ceil"]
 
 class CopySidebearings(object):
     """GUI for copying glyph sidebearings from one to another"""
@@ -29,7 +33,7 @@ class CopySidebearings(object):
         
         # Window 'self.w':
         windowWidth = 200
-        windowHeight = 260
+        windowHeight = 455
         self.w = vanilla.FloatingWindow(
             (windowWidth, windowHeight),  # default window size
             "Copy Sidebearings",  # window title
@@ -62,6 +66,32 @@ class CopySidebearings(object):
         self.w.glyphsRadioGroup.set(0)  # default to all glyphs
         linePos += 60
 
+        # Masters
+        self.w.allMastersCheck = vanilla.CheckBox((inset, linePos, -inset, 20), "All masters", value=False, sizeStyle="small", callback=self.updateUI)
+        linePos += 22
+        self.w.matchByText = vanilla.TextBox((inset, linePos + 2, 60, 17), "Match by:", sizeStyle="small")
+        self.w.matchByPopup = vanilla.PopUpButton((inset + 60, linePos, -inset, 17), ["Master name", "Axis coordinates"], sizeStyle="small")
+        linePos += 25
+        self.w.reportText = vanilla.TextBox((inset, linePos + 2, 60, 17), "Report:", sizeStyle="small")
+        self.w.reportPopup = vanilla.PopUpButton((inset + 60, linePos, -inset, 17), ["CSV", "JSON"], sizeStyle="small")
+        linePos += 30
+
+        # Divider
+        self.w.divider3 = vanilla.HorizontalLine((inset, linePos, -inset, 1))
+        linePos += 15
+
+        # Transform (different UPM / x-height)
+        self.w.scaleText = vanilla.TextBox((inset, linePos + 2, 60, 17), "Values:", sizeStyle="small")
+        self.w.scalePopup = vanilla.PopUpButton((inset + 60, linePos, -inset, 17), ["Absolute", "Scale by UPM", "Scale by x-height"], sizeStyle="small")
+        linePos += 25
+        self.w.roundingText = vanilla.TextBox((inset, linePos + 2, 60, 17), "Rounding:", sizeStyle="small")
+        self.w.roundingPopup = vanilla.PopUpButton((inset + 60, linePos, -inset, 17), ["Round", "None", "Floor", "Ceil"], sizeStyle="small")
+        linePos += 25
+        self.w.ratiosEdit = vanilla.EditText((inset, linePos, -inset, 19), placeholder="Category ratios: Letter=1, Number=0.95", sizeStyle="small")
+        linePos += 27
+        self.w.dryRunCheck = vanilla.CheckBox((inset, linePos, -inset, 20), "Dry run (report only)", value=False, sizeStyle="small")
+        linePos += 30
+
         # Divider
         self.w.divider2 = vanilla.HorizontalLine((inset, linePos, -inset, 1))
         linePos += 15
@@ -71,11 +101,15 @@ class CopySidebearings(object):
         linePos += 30
 
         # Note
-        self.w.note = vanilla.TextBox((inset, linePos, -inset, 15), "Open output window for results.", sizeStyle="mini", alignment="center")
+        self.w.note = vanilla.TextBox((inset, linePos, -inset, 15), "Report is saved next to the destination font.", sizeStyle="mini", alignment="center")
 
+        self.updateUI()
         self.w.open()  # go go gadget window
         self.w.makeKey()
 
+    def updateUI(self, sender=None):
+        self.w.matchByPopup.enable(self.w.allMastersCheck.get())
+
     def copySidebearings(self, sender):
         try:
             sourceFont = self.fonts[self.w.sourceUFODropDown.get()]
@@ -87,6 +121,10 @@ class CopySidebearings(object):
             
             copyAll = (self.w.glyphsRadioGroup.get() == 0)
             
+            # Glyph names of both fonts, computed once
+            sourceNames = {glyph.name for glyph in sourceFont.glyphs}
+            destinationNames = {glyph.name for glyph in destinationFont.glyphs}
+            
             # Get scope
             if copyAll:
                 glyphs = sourceFont.glyphs  # all glyphs
@@ -104,74 +142,95 @@ class CopySidebearings(object):
                     print("Please select at least one glyph in the source font from which to copy the sidebearings.")
                     return
                 
-                glyphs = [layer.parent for layer in selectedLayers if layer.parent in sourceFont.glyphs]
+                glyphs = [layer.parent for layer in selectedLayers if layer.parent.name in sourceNames]
                 if not glyphs:
                     Glyphs.showMacroWindow()
                     print("No selected glyphs found in the source font.")
                     return
             
-            # Copy sidebearings
-            for glyph in glyphs:
-                if glyph.name in destinationFont.glyphs:
-                    destGlyph = destinationFont.glyphs[glyph.name]
-                    
-                    # Begin undo group
-                    destinationFont.disableUpdateInterface()
-                    
+            # Pair up masters (first master only, or all masters by name/axes)
+            if self.w.allMastersCheck.get():
+                matchBy = "axes" if self.w.matchByPopup.get() == 1 else "name"
+                masterPairs = matchMasters(sourceFont.masters, destinationFont.masters, by=matchBy)
+                if not masterPairs:
+                    Glyphs.showMacroWindow()
+                    print(f"No matching masters found (matched by {matchBy}).")
+                    return
+            else:
+                masterPairs = [(sourceFont.masters[0], destinationFont.masters[0])]
+            
+            scopeNames = list(dict.fromkeys(glyph.name for glyph in glyphs))
+            glyphNames = [glyphName for glyphName in scopeNames if glyphName in destinationNames]
+            sourceGlyphsNotInDestination = list(set(scopeNames) - destinationNames)
+            
+            # Category ratios, e.g. "Letter=1, Number=0.95"
+            categoryRatios = {}
+            for item in self.w.ratiosEdit.get().replace(";", ",").split(","):
+                if "=" in item:
+                    category, ratio = [part.strip() for part in item.split("=", 1)]
                     try:
-                        # For empty glyphs, copy width only
-                        if not glyph.layers[0].paths:  # no contours
-                            destGlyph.layers[0].width = glyph.layers[0].width
-                        else:
-                            # Copy left and right margins (sidebearings)
-                            destGlyph.layers[0].LSB = glyph.layers[0].LSB  # Left Side Bearing
-                            destGlyph.layers[0].RSB = glyph.layers[0].RSB  # Right Side Bearing
-                        
-                        sourceGlyphsCopied.append(glyph.name)
-                        
-                    except Exception as e:
-                        print(f"Error copying {glyph.name}: {e}")
-                    finally:
-                        destinationFont.enableUpdateInterface()
-                        
-                else:
-                    sourceGlyphsNotInDestination.append(glyph.name)
+                        categoryRatios[category] = float(ratio)
+                    except ValueError:
+                        Glyphs.showMacroWindow()
+                        print(f"Invalid category ratio: {item.strip()}")
+                        return
+            categories = {}
+            if categoryRatios:
+                glyphNameSet = set(glyphNames)
+                categories = {glyph.name: glyph.category for glyph in sourceFont.glyphs if glyph.name in glyphNameSet}
+            
+            # Copy sidebearings: read everything in one pass, transform as a batch, write in one update-disabled batch
+            table = extractMetrics(sourceFont, glyphNames, [source.id for source, destination in masterPairs])
+            basis = SCALE_BASES[self.w.scalePopup.get()]
+            rounding = ROUNDINGS[self.w.roundingPopup.get()]
+            if basis != "absolute" or categoryRatios:
+                factors = scaleFactors(masterPairs, basis, sourceFont, destinationFont)
+                table = transformMetrics(table, factors, categories, categoryRatios, rounding)
+            before = extractMetrics(destinationFont, glyphNames, [destination.id for source, destination in masterPairs])
+            
+            dryRun = self.w.dryRunCheck.get()
+            if dryRun:
+                written = None
+            else:
+                written, errors = applyMetrics(destinationFont, table, [destination.id for source, destination in masterPairs])
+                for glyphName, e in errors:
+                    print(f"Error copying {glyphName}: {e}")
+                sourceGlyphsCopied = list(written)
             
             # Check for glyphs in destination not in source (only when copying all)
             if copyAll:
-                for glyph in destinationFont.glyphs:
-                    if glyph.name not in sourceFont.glyphs:
-                        destGlyphsNotInSource.append(glyph.name)
+                destGlyphsNotInSource = list(destinationNames - sourceNames)
             
             # Sort results
             sourceGlyphsCopied.sort()
             sourceGlyphsNotInDestination.sort()
             destGlyphsNotInSource.sort()
             
-            # Show macro window and print results
-            Glyphs.showMacroWindow()
-            print("### Source Glyph Sidebearings Successfully Copied ###")
-            for glyphName in sourceGlyphsCopied:
-                print(glyphName)
-            print("")
+            # Write the structured report instead of listing every glyph
+            extension = "json" if self.w.reportPopup.get() == 1 else "csv"
+            deltas = metricsDeltas(table, before, masterPairs, written, status="planned" if dryRun else "copied")
+            reportPath = writeMetricsReport(reportPathForFont(destinationFont, extension), deltas, sourceGlyphsNotInDestination, destGlyphsNotInSource)
             
-            print("### Source Glyphs NOT in Destination (skipped) ###")
-            for glyphName in sourceGlyphsNotInDestination:
-                print(glyphName)
-            print("")
-            
-            if copyAll:
-                print("### Glyphs in Destination NOT in Source (missed) ###")
-                for glyphName in destGlyphsNotInSource:
-                    print(glyphName)
-                print("")
+            if dryRun:
+                # Keep the window open so the copy can be run for real
+                Glyphs.showMacroWindow()
+                changed = [row for row in deltas if row["status"] != "empty" and row["deltaWidth"]]
+                print(f"Dry run: {len(changed)} of {len(deltas)} glyph layers would change their advance width.")
+                for row in sorted(changed, key=lambda row: -abs(row["deltaWidth"]))[:20]:
+                    print(f"{row['glyph']} ({row['destinationMaster']}): {row['oldWidth']:g} → {row['newWidth']:g} ({row['deltaWidth']:+g})")
+                print(f"Report: {reportPath}")
+                return
             
             # Close
             self.w.close()
             
             # Show completion message
             Glyphs.showMacroWindow()
-            print(f"Copy completed!\nCopied: {len(sourceGlyphsCopied)} glyphs\nSkipped: {len(sourceGlyphsNotInDestination)} glyphs")
+            masterNames = ", ".join(f"{source.name} → {destination.name}" for source, destination in masterPairs)
+            print(f"Copy completed!\nMasters: {masterNames}\nCopied: {len(sourceGlyphsCopied)} glyphs\nSkipped: {len(sourceGlyphsNotInDestination)} glyphs")
+            if copyAll:
+                print(f"Missed (in destination, not in source): {len(destGlyphsNotInSource)} glyphs")
+            print(f"Report: {reportPath}")
             
         except Exception as e:
             Glyphs.showMacroWindow()
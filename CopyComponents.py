@@ -1,75 +1,65 @@
 #MenuTitle: Copy components in all Masters
 # -*- coding: utf-8 -*-
 __doc__ = """
-Kopiert alle Komponenten der ausgewählten Glyphe aus dem aktuellen Master
-in alle anderen Master.
+Copies all components of the selected glyphs from the current master
+into all other masters. Mode via 'policy': replace, merge or skip.
+With placement = "anchors" the positions are recalculated per master.
+With includeDependents = True every glyph that uses the selection as a
+component is edited as well (base glyphs first).
 """
 
 from GlyphsApp import *
+from componentCore import ComponentGraph, copyComponents
+
+# replace = replace the target components
+# merge   = replace components of the same name, keep others, add missing ones
+# skip    = skip layers that already have components
+policy = "skip"
+
+# copy    = take the positions 1:1 from the current master
+# anchors = recalculate positions per target master from its anchors and widths
+placement = "copy"
+
+# True = also glyphs that use the selection (directly or nested) as a component
+includeDependents = False
 
 font = Glyphs.font
 
 if not font:
-    Message("Kein Font geöffnet.", "Fehler")
+    Message("No font open.", "Error")
 else:
-    # Aktuell geöffneter Master (im Edit-View oder Font-Übersicht)
+    # Currently open master (in the Edit view or Font view)
     currentMasterIndex = font.masterIndex
     currentMaster = font.masters[currentMasterIndex]
 
-    # Ausgewählte Glyphen (funktioniert in der Font-Übersicht & Edit-View)
+    # Selected glyphs (works in the Font view & Edit view)
     selectedGlyphs = []
 
-    # Font-Übersicht: font.selectedLayers
+    # Font view: font.selectedLayers
     if font.selectedLayers:
         for layer in font.selectedLayers:
             if layer.parent not in selectedGlyphs:
                 selectedGlyphs.append(layer.parent)
 
     if not selectedGlyphs:
-        Message("Bitte mindestens eine Glyphe auswählen.", "Keine Auswahl")
+        Message("Please select at least one glyph.", "No selection")
     else:
-        report = []
-
-        for glyph in selectedGlyphs:
-            # Quell-Layer = aktueller Master
-            sourceLayer = glyph.layers[currentMaster.id]
-
-            if not sourceLayer:
-                report.append(f"⚠️  {glyph.name}: Kein Layer für aktuellen Master gefunden.")
-                continue
-
-            sourceComponents = sourceLayer.components
-
-            if not sourceComponents:
-                report.append(f"⚠️  {glyph.name}: Keine Komponenten im aktuellen Master ({currentMaster.name}).")
-                continue
-
-            for master in font.masters:
-                # Quell-Master überspringen
-                if master.id == currentMaster.id:
-                    continue
-
-                targetLayer = glyph.layers[master.id]
-
-                if not targetLayer:
-                    report.append(f"⚠️  {glyph.name} → {master.name}: Kein Ziel-Layer gefunden.")
-                    continue
-
-                # Überspringen wenn bereits Komponenten vorhanden
-                if targetLayer.components:
-                    report.append(f"⏭️  {glyph.name} → {master.name}: Bereits Komponenten vorhanden, übersprungen.")
-                    continue
-
-                # Komponenten kopieren und in Ziel-Layer einfügen
-                addedCount = 0
-                for comp in sourceComponents:
-                    newComp = comp.copy()
-                    targetLayer.components.append(newComp)
-                    addedCount += 1
-
-                report.append(f"✅  {glyph.name} → {master.name}: {addedCount} Komponent(en) hinzugefügt.")
-
-        # Zusammenfassung anzeigen
+        graph = None
+        if includeDependents:
+            # Dependencies from the .componentgraph.json, only changed glyphs are read again
+            graph = ComponentGraph.forFont(font)
+            glyphNames = {g.name for g in selectedGlyphs}
+            glyphNames |= graph.dependents(glyphNames)
+            selectedGlyphs = [font.glyphs[name] for name in graph.topologicalOrder(glyphNames)]
+
+        report, unchanged = copyComponents(font, selectedGlyphs, currentMaster, policy, placement, makePoint=NSPoint, graph=graph)
+        if graph:
+            graph.save()
+
+        if unchanged:
+            report.append(f"ℹ️  {unchanged} layers already identical, left unchanged.")
+
+        # Show summary
         summary = "\n".join(report)
         print(summary)
-        Message(summary, "Komponenten kopiert")
\ No newline at end of file
+        Message(summary, "Components copied")
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 from GlyphsApp import *
 from vanilla import *
+from kerningCore import GlyphIdCache, planKerningGroupCopies
 
 class CopyKerningGroupWindow(object):
     def __init__(self):
@@ -14,15 +15,6 @@ class CopyKerningGroupWindow(object):
         self.w.copyButton = Button((-110, -40, 90, 30), "Copy", callback=self.copyKerningGroups)
         self.w.open()
 
-    def resolveKey(self, font, key):
-        """Return readable name or group name for kerning key (string or UUID)."""
-        if isinstance(key, str):
-            # It's either a group (@MMK_L_ or @MMK_R_) or glyph name
-            return key
-        # Otherwise, assume it's a UUID (Glyphs 3)
-        g = font.glyphForId_(key)
-        return g.name if g else None
-
     def copyKerningGroups(self, sender):
         font = Glyphs.font
         if not font:
@@ -43,40 +35,30 @@ class CopyKerningGroupWindow(object):
 
         successfulPairs = 0
 
-        for base, target in pairs:
-            leftSource = f"@MMK_L_{base}"
-            leftTarget = f"@MMK_L_{target}"
-            rightSource = f"@MMK_R_{base}"
-            rightTarget = f"@MMK_R_{target}"
-
-            for master in font.masters:
-                kerningDict = font.kerning[master.id]
+        # Glyph ID ↔ name, resolved once for all masters and pairs
+        glyphIds = GlyphIdCache(font)
 
-                # --- LEFT SIDE COPY ---
-                if leftSource in kerningDict:
-                    for rightKey, value in kerningDict[leftSource].items():
-                        rightName = self.resolveKey(font, rightKey)
-                        if not rightName:
-                            continue
-                        try:
-                            font.setKerningForPair(master.id, leftTarget, rightName, value)
-                            successfulPairs += 1
-                        except Exception as e:
-                            print(f"Error copying {leftSource} → {leftTarget} ({rightName}): {e}")
-                else:
-                    print(f"⚠️ No left kerning found for {leftSource} in master {master.name}")
+        # Plan all copies first (one pass per master), then write in one batch
+        plans = []
+        for master in font.masters:
+            kerningDict = font.kerning[master.id]
+            for base, target in pairs:
+                if f"@MMK_L_{base}" not in kerningDict:
+                    print(f"⚠️ No left kerning found for @MMK_L_{base} in master {master.name}")
+            plan = planKerningGroupCopies(kerningDict, pairs, glyphIds.resolveKey)
+            plans.append((master, plan))
 
-                # --- RIGHT SIDE COPY ---
-                for leftKey, rightDict in kerningDict.items():
-                    leftName = self.resolveKey(font, leftKey)
-                    if not leftName or rightSource not in rightDict:
-                        continue
-                    value = rightDict[rightSource]
+        font.disableUpdateInterface()
+        try:
+            for master, plan in plans:
+                for (leftKey, rightKey), value in plan.items():
                     try:
-                        font.setKerningForPair(master.id, leftName, rightTarget, value)
+                        font.setKerningForPair(master.id, leftKey, rightKey, value)
                         successfulPairs += 1
                     except Exception as e:
-                        print(f"Error copying {rightSource} → {rightTarget} ({leftName}): {e}")
+                        print(f"Error copying kerning {leftKey} → {rightKey} in {master.name}: {e}")
+        finally:
+            font.enableUpdateInterface()
 
         if successfulPairs > 0:
             Message("Kerning copied!", f"Successfully copied {successfulPairs} kerning pairs.")
@@ -7,10 +7,18 @@ __doc__ = """
 Find base glyphs that contain anchors which are not referenced by any components or marks.
 Opens a tab listing them and prints a detailed report in the macro window.
 Ignores mark glyphs themselves.
-Only checks one master layer per glyph to avoid duplicates.
+Only checks one master layer per glyph to avoid duplicates, unless checkAllMasters
+or checkAllLayers is set. Layer results are cached next to the .glyphs file,
+so re-runs only read the glyphs that changed.
 """
 
 import GlyphsApp
+from anchorCore import AnchorLayerCache, findUnusedAnchorsInFont
+
+# Set to True to check every master on its own (report lists glyph per master)
+checkAllMasters = False
+# Set to True to also check brace/bracket layers (implies all masters)
+checkAllLayers = False
 
 font = Glyphs.font
 if not font:
@@ -19,50 +27,33 @@ if not font:
 
 print("🔍 Collecting anchor usage per base glyph…")
 
-# Only consider non-mark (base) glyphs
-baseGlyphs = [g for g in font.glyphs if g.category != "Mark"]
-
-# Map base glyph name to set of anchors used by any components or marks
-anchorUsagePerBase = {g.name: set() for g in baseGlyphs}
-
-# 1. Check components: if a component references a base, the anchor used counts for that base
-for g in baseGlyphs:
-    l = g.layers[0]  # only check first master layer
-    for comp in l.components:
-        baseName = comp.componentName
-        if baseName in anchorUsagePerBase and comp.anchor:
-            anchorUsagePerBase[baseName].add(comp.anchor)
-
-# 2. Check mark attachments: a mark uses its _xxx anchors on base glyphs
-for g in font.glyphs:
-    if g.category == "Mark":
-        l = g.layers[0]  # only check first master layer
-        for a in l.anchors:
-            baseAnchorName = a.name[1:] if a.name.startswith("_") else a.name
-            for baseGlyph in baseGlyphs:
-                if baseAnchorName in [b.name for b in baseGlyph.layers[0].anchors]:
-                    anchorUsagePerBase[baseGlyph.name].add(baseAnchorName)
-
-# 3. Determine truly unused anchors per base glyph
-unusedAnchorsPerGlyph = {}
-for g in baseGlyphs:
-    l = g.layers[0]  # only check first master layer
-    unused = [a.name for a in l.anchors if a.name not in anchorUsagePerBase[g.name]]
-    if unused:
-        unusedAnchorsPerGlyph[g.name] = sorted(set(unused))  # dedupe
+# 1.–3. Index anchors once and find the unused ones per master/layer
+cache = AnchorLayerCache.forFont(font)
+rows = findUnusedAnchorsInFont(font, allMasters=checkAllMasters, allLayers=checkAllLayers, cache=cache)
+if cache:
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"⚠️ Could not write anchor cache: {e}")
 
 # 4. Print report
 Glyphs.clearLog()
-if not unusedAnchorsPerGlyph:
+if cache:
+    print(f"Re-analysed {cache.misses} of {cache.hits + cache.misses} layers.\n")
+if not rows:
     Message("All Good!", "No unused anchors found in base glyphs.")
     print("No unused anchors found in base glyphs.")
     raise SystemExit
 
 print("🔹 Unused Anchor Report (base glyphs only):\n")
-for gName in sorted(unusedAnchorsPerGlyph.keys()):
-    print(f"{gName}: {', '.join(unusedAnchorsPerGlyph[gName])}")
+showLocation = checkAllMasters or checkAllLayers
+tabLayers = []
+for master, layerName, gName, layerId, unusedAnchors in rows:
+    location = f" [{master.name}{' ' + layerName if layerName else ''}]" if showLocation else ""
+    print(f"{gName}{location}: {', '.join(unusedAnchors)}")
+    tabLayers.append(font.glyphs[gName].layers[layerId])
 
 # 5. Open tab with affected base glyphs
 tab = font.newTab()
-tab.layers = [font.glyphs[gName].layers[0] for gName in sorted(unusedAnchorsPerGlyph.keys())]
+tab.layers = tabLayers
 print("\nOpened tab with base glyphs containing unused anchors.")
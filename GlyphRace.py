@@ -1,21 +1,47 @@
 # MenuTitle: Samara's Glyph Race
 # -*- coding: utf-8 -*-
-# Glyph Timer with history of last 20 glyphs (per glyph name, not per master)
-import timer
+# Glyph Timer with history of the last 20 glyph layers (per glyph and master)
+# Timings are buffered and flushed on close, on Report, and every FLUSH_INTERVAL
+# seconds after a glyph or master switch: totals go to the font's userData,
+# every stretch of work to MyFont.glyphrace.csv. An idle font is never touched.
+# "Report" rolls that log up into MyFont.glyphrace-report.csv/.json.
+import os
+import time
+from collections import deque
+from AppKit import NSTimer
 from vanilla import FloatingWindow, TextBox, Button
+from raceCore import aggregateSessionLog, appendSessionLog, readSessionLog, sessionLogPath, writeReport
+
+# Seconds between repaints of the window
+REPAINT_INTERVAL = 1.0
+# Seconds between writes to userData and the session log
+FLUSH_INTERVAL = 60.0
+HISTORY_LENGTH = 20
+USERDATA_KEY = "GlyphRace.timers"
+
 class Timer():
 	def __init__(self):
-		self.currentGlyph = Glyphs.font.selectedLayers[0].parent if Glyphs.font and Glyphs.font.selectedLayers else None
+		self.font = Glyphs.font
+		self.session = time.strftime("%Y-%m-%dT%H:%M:%S")
+		self.totals = self.loadTotals()  # {glyph name: {master name: seconds}}
+		self.pending = []  # log rows not yet written
+		self.lastFlush = time.time()
+		
+		self.currentLayer = None
+		self.current = None  # (glyph name, master name) of currentLayer
 		self.start = time.time()
+		if self.font and self.font.selectedLayers:
+			self.setCurrentLayer(self.font.selectedLayers[0])
 		
-		# Keep track of work history (glyph names only, max 20)
-		self.history = []
+		# Keep track of work history: [glyph name, master name, accumulated seconds], newest last
+		self.history = deque(maxlen=HISTORY_LENGTH)
 		
-		# Floating window with text + reset button
+		# Floating window with text + reset and report buttons
 		self.w = FloatingWindow((240, 400), "Glyph Race")
 		self.w.text = TextBox((10, 10, -10, 40), "⏱ Start already…")
 		self.w.summary = TextBox((10, 40, -10, -40), "")
-		self.w.resetButton = Button((10, -30, -10, 20), "New Round", callback=self.resetAll)
+		self.w.resetButton = Button((10, -30, 140, 20), "New Round", callback=self.resetAll)
+		self.w.reportButton = Button((160, -30, -10, 20), "Report", callback=self.writeReport)
 		
 		self.w.open()
 		self.addCallbacks()
@@ -23,9 +49,14 @@ class Timer():
 	
 	def addCallbacks(self):
 		Glyphs.addCallback(self.updateInterface, UPDATEINTERFACE)
+		# repaint at a fixed rate instead of on every interface update
+		self.repaintTimer = NSTimer.scheduledTimerWithTimeInterval_repeats_block_(REPAINT_INTERVAL, True, self.tick)
 	
 	def removeCallbacks(self, sender):
 		Glyphs.removeCallback(self.updateInterface, UPDATEINTERFACE)
+		self.repaintTimer.invalidate()
+		self.closeSegment(time.time())
+		self.flush()
 	
 	def formatTime(self, seconds):
 		"""Helper to format seconds into mm:ss"""
@@ -33,57 +64,149 @@ class Timer():
 		s = int(seconds % 60)
 		return f"{m:02}:{s:02}"
 	
+	def loadTotals(self):
+		"""Totals per glyph and master from the font's userData (migrating old per-glyph timers once)."""
+		if not self.font:
+			return {}
+		stored = self.font.userData[USERDATA_KEY]
+		if stored is not None:
+			totals = {}
+			for name, perMaster in stored.items():
+				if isinstance(perMaster, (int, float)):
+					perMaster = {"": perMaster}  # older per-glyph totals
+				totals[name] = {master: float(seconds) for master, seconds in perMaster.items()}
+			return totals
+		totals = {}
+		for g in self.font.glyphs:
+			if "timer" in g.userData:
+				totals[g.name] = {"": float(g.userData["timer"])}
+				del g.userData["timer"]
+		if totals:
+			self.font.userData[USERDATA_KEY] = totals
+		return totals
+	
+	def setCurrentLayer(self, layer):
+		self.currentLayer = layer
+		master = self.font.masters[layer.associatedMasterId] if layer else None
+		self.current = (layer.parent.name, master.name if master else "") if layer else None
+	
+	def currentTotal(self, elapsed=0):
+		if not self.current:
+			return 0
+		name, master = self.current
+		return self.totals.get(name, {}).get(master, 0) + elapsed
+	
 	def updateInterface(self, sender):
-		if not Glyphs.font or not Glyphs.font.selectedLayers:
+		"""Runs on every interface update (drags, node moves): only detect glyph/master switches."""
+		if Glyphs.font is not self.font or not self.font or not self.font.selectedLayers:
 			return
 		
-		newGlyph = Glyphs.font.selectedLayers[0].parent
-		if self.currentGlyph != newGlyph:
-			# switched glyph → store time
-			timeElapsed = time.time() - self.start
-			if self.currentGlyph:
-				prev = self.currentGlyph.userData.get("timer", 0)
-				self.currentGlyph.userData["timer"] = prev + timeElapsed
-				
-				# update history (keep last 20 unique glyphs, newest last)
-				if self.currentGlyph.name in self.history:
-					self.history.remove(self.currentGlyph.name)
-				self.history.append(self.currentGlyph.name)
-				if len(self.history) > 40:
-					self.history.pop(0)
-				
-				print(f"{self.currentGlyph.name} ⏱ {self.formatTime(self.currentGlyph.userData['timer'])}")
+		newLayer = self.font.selectedLayers[0]
+		if self.currentLayer != newLayer:
+			self.switchLayer(newLayer)
+	
+	def closeSegment(self, now):
+		"""Book the time since self.start on the current layer (in memory only)."""
+		if not self.current:
+			return 0
+		name, master = self.current
+		total = self.currentTotal(now - self.start)
+		self.totals.setdefault(name, {})[master] = total
+		layer = self.currentLayer
+		glyph = layer.parent
+		layerName = layer.name if layer.layerId != layer.associatedMasterId else ""
+		self.pending.append((self.session, name, master, self.start, now, layerName, glyph.script or "", glyph.category or ""))
+		self.start = now
+		return total
+	
+	def switchLayer(self, newLayer):
+		# switched glyph or master → store time
+		now = time.time()
+		if self.current:
+			total = self.closeSegment(now)
+			
+			# update history (unique glyph layers, newest last, oldest drop out)
+			name, master = self.current
+			for entry in self.history:
+				if entry[0] == name and entry[1] == master:
+					self.history.remove(entry)
+					break
+			self.history.append([name, master, total])
 			
-			# reset timer
-			self.start = time.time()
-			self.currentGlyph = newGlyph
+			print(f"{name} ({master}) ⏱ {self.formatTime(total)}")
 		
-		# update live timer for current glyph
-		if self.currentGlyph:
-			total = self.currentGlyph.userData.get("timer", 0) + (time.time() - self.start)
-			self.w.text.set(f"{self.currentGlyph.name} ⏱ {self.formatTime(total)}")
+		# reset timer
+		self.start = now
+		self.setCurrentLayer(newLayer)
+		self.repaint()
+	
+	def flush(self):
+		"""Write buffered timings: one userData update and one append to the session log."""
+		self.lastFlush = time.time()
+		if not self.font or not self.pending:
+			return
+		self.font.userData[USERDATA_KEY] = {name: dict(perMaster) for name, perMaster in self.totals.items()}
+		if self.font.filepath:
+			try:
+				appendSessionLog(sessionLogPath(self.font.filepath), self.pending)
+			except OSError as e:
+				print(f"⚠️ Could not write Glyph Race log: {e}")
+		self.pending = []
+	
+	def tick(self, timer=None):
+		self.repaint()
+		# nothing switched since the last flush: don't mark the font as modified
+		if self.pending and time.time() - self.lastFlush >= FLUSH_INTERVAL:
+			self.closeSegment(time.time())
+			self.flush()
+	
+	def repaint(self):
+		"""Refresh live timer and history from the cache, without touching the font."""
+		currentTotal = self.currentTotal(time.time() - self.start)
+		
+		# update live timer for current glyph layer
+		if self.current:
+			name, master = self.current
+			self.w.text.set(f"{name} ({master}) ⏱ {self.formatTime(currentTotal)}")
 		
-		# show history summary (last 20 glyphs)
+		# show history summary
 		summaryLines = []
-		for gName in reversed(self.history):
-			g = Glyphs.font.glyphs[gName]
-			if g:
-				t = g.userData.get("timer", 0)
-				if g.name == self.currentGlyph.name:
-					t += time.time() - self.start
-				summaryLines.append(f"{gName}: {self.formatTime(t)}")
+		for gName, master, t in reversed(self.history):
+			if (gName, master) == self.current:
+				t = currentTotal
+			summaryLines.append(f"{gName} ({master}): {self.formatTime(t)}")
 		self.w.summary.set("\n".join(summaryLines))
 	
+	def writeReport(self, sender):
+		"""Roll the session log up into totals and percentiles (CSV + JSON next to the font)."""
+		if not self.font or not self.font.filepath:
+			Message("Save the font first", "The Glyph Race log lives next to the .glyphs file.")
+			return
+		self.closeSegment(time.time())
+		self.flush()
+		logPath = sessionLogPath(self.font.filepath)
+		if not os.path.exists(logPath):
+			Message("No log yet", "Work on some glyphs first.")
+			return
+		report = aggregateSessionLog(readSessionLog(logPath))
+		basePath = os.path.splitext(logPath)[0] + "-report"
+		writeReport(report, basePath + ".csv")
+		writeReport(report, basePath + ".json")
+		print(f"📊 Glyph Race report: {basePath}.csv / .json")
+	
 	def resetAll(self, sender):
-		"""Clear all timers in font"""
-		if not Glyphs.font:
+		"""Clear all timers in font (the session log is kept)"""
+		if not self.font:
 			return
-		for g in Glyphs.font.glyphs:
-			if "timer" in g.userData:
-				del g.userData["timer"]
+		self.closeSegment(time.time())
+		self.flush()
+		self.totals = {}
+		if self.font.userData[USERDATA_KEY] is not None:
+			del self.font.userData[USERDATA_KEY]
 		print("🔄 All glyph timers reset.")
 		self.w.text.set("⏱ Reset – Work Bitch!")
 		self.w.summary.set("")
-		self.history = []
+		self.history.clear()
+		self.start = time.time()
 
 Timer()
@@ -0,0 +1,56 @@
+# MenuTitle: Kerning Audit
+# -*- coding: utf-8 -*-
+__doc__ = """
+Audits the kerning of all masters in one pass per master: pairs with groups
+no glyph belongs to, pairs of glyphs that no longer exist, zero pairs and
+exceptions equal to the group value they override.
+Writes a CSV report next to the .glyphs file; set pruneFindings to True to
+remove everything found in one go.
+"""
+
+import GlyphsApp
+from kerningCore import (AUDIT_ISSUES, GlyphIdCache, KerningGroupSets, auditKerning, kerningReportPath,
+                         pruneKerning, writeKerningAudit)
+
+# Set to True to remove all findings (otherwise report only)
+pruneFindings = False
+
+font = Glyphs.font
+if not font:
+    Message("No Font Open", "Open a font and run again.")
+    raise Exception("No font open")
+
+Glyphs.clearLog()
+print("🔍 Auditing kerning…\n")
+
+# Group membership and glyph IDs, read once for all masters
+glyphIds = GlyphIdCache(font)
+groups = KerningGroupSets(font)
+
+findingsPerMaster = []
+totalPairs = 0
+for master in font.masters:
+    kerningDict = font.kerning.get(master.id) or {}
+    pairCount = sum(len(rightDict) for rightDict in kerningDict.values())
+    findings = auditKerning(kerningDict, groups, glyphIds.resolveKey)
+    findingsPerMaster.append((master, findings))
+    totalPairs += pairCount
+
+    counts = {issue: 0 for issue in AUDIT_ISSUES}
+    for finding in findings:
+        counts[finding[3]] += 1
+    print(f"{master.name}: {len(findings)} of {pairCount} pairs can go ({', '.join(f'{issue} {count}' for issue, count in counts.items())})")
+
+totalFindings = sum(len(findings) for master, findings in findingsPerMaster)
+reportPath = writeKerningAudit(kerningReportPath(font, "kerningaudit"), findingsPerMaster, glyphIds.resolveKey)
+print(f"\nReport: {reportPath}")
+
+if not totalFindings:
+    Message("All Good!", "No kerning pairs to clean up.")
+elif pruneFindings:
+    removed = pruneKerning(font, findingsPerMaster, glyphIds.resolveKey)
+    print(f"✅ Pruned {removed} of {totalPairs} pairs ({removed / totalPairs:.1%}).")
+    Glyphs.showNotification("Kerning Audit", f"Pruned {removed} of {totalPairs} kerning pairs.")
+else:
+    print(f"Pruning would save {totalFindings} of {totalPairs} pairs ({totalFindings / totalPairs:.1%}). Set pruneFindings = True to remove them.")
+    Glyphs.showMacroWindow()
@@ -0,0 +1,53 @@
+# MenuTitle: Kerning Consistency
+# -*- coding: utf-8 -*-
+__doc__ = """
+Compares the kerning of all masters: lists pairs that are missing in some
+masters or kerned positive in one master and negative in another.
+Writes a CSV report with every master's value next to the .glyphs file.
+Set fillMissing to "zero" or "interpolate" to add the missing pairs.
+"""
+
+import GlyphsApp
+from kerningCore import GlyphIdCache, KerningMatrix, kerningReportPath
+
+# None = report only, "zero" = add missing pairs as 0,
+# "interpolate" = interpolate between the neighbouring masters along interpolationAxis
+fillMissing = None
+interpolationAxis = 0
+
+font = Glyphs.font
+if not font:
+    Message("No Font Open", "Open a font and run again.")
+    raise Exception("No font open")
+
+Glyphs.clearLog()
+print("🔍 Comparing kerning across masters…\n")
+
+# All masters in one sparse matrix, glyph IDs resolved once
+glyphIds = GlyphIdCache(font)
+matrix = KerningMatrix.fromFont(font, glyphIds.resolveKey)
+missing = matrix.missing()
+flips = matrix.signFlips()
+
+print(f"{matrix.pairCount()} pairs in {len(font.masters)} masters.")
+print(f"Missing in some masters: {len(missing)}")
+print(f"Sign flips: {len(flips)}\n")
+
+masterNames = [master.name for master in font.masters]
+for row in sorted(flips, key=matrix.pair)[:30]:
+    leftName, rightName = matrix.pair(row)
+    values = ", ".join(f"{name} {'–' if value is None else f'{value:g}'}" for name, value in zip(masterNames, matrix.pairValues(row)))
+    print(f"{leftName} {rightName}: {values}")
+if len(flips) > 30:
+    print(f"… and {len(flips) - 30} more.")
+
+reportPath = matrix.writeReport(kerningReportPath(font, "kerningmatrix"), missing, flips)
+print(f"\nReport: {reportPath}")
+
+if fillMissing and missing:
+    fills = matrix.fillValues(missing, fillMissing, interpolationAxis)
+    count = matrix.applyFills(font, fills)
+    print(f"✅ Added {count} missing pairs ({fillMissing}).")
+    Glyphs.showNotification("Kerning Consistency", f"Added {count} missing kerning pairs.")
+else:
+    Glyphs.showMacroWindow()
@@ -1,9 +1,18 @@
 # MenuTitle: Kerning Pairs Generator
 # -*- coding: utf-8 -*-
 # Based on the Kerning pair Generator of Junik Studio (https://www.junikstudio.com/kernings/)
-from GlyphsApp import Glyphs, Message
+from GlyphsApp import Glyphs, Message, GetOpenFile
+from collections import Counter
+from itertools import islice
+from operator import attrgetter
+import hashlib
+import heapq
+import json
+import os
 import vanilla
 
+BIGRAM_CACHE_FOLDER = os.path.expanduser("~/Library/Caches/KerningPairsGenerator")
+
 # Mapping for ambiguous characters → glyph names
 CHAR_TO_GLYPHNAME = {
     # numbers
@@ -39,19 +48,75 @@ PREDEFINED_SETS = {
 }
 
 
-def normalizeInput(tokens, font):
+class GlyphLookup(object):
+    """
+    One-shot lookup tables for a font: Unicode → glyph name (all unicodes
+    of a glyph), CHAR_TO_GLYPHNAME resolved against the font, and the set
+    of glyph names. Shared by all tokens of a generate call.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.stamp = self.stampForFont(font)
+        self.glyphNames = set()
+        self.nameForUnicode = {}
+        self.charForName = {}
+        for g in font.glyphs:
+            self.glyphNames.add(g.name)
+            for uni in g.unicodes or ():
+                self.nameForUnicode.setdefault(uni.upper(), g.name)
+                self.charForName.setdefault(g.name, chr(int(uni, 16)))
+        self.nameForChar = {
+            char: glyphName
+            for char, glyphName in CHAR_TO_GLYPHNAME.items()
+            if glyphName in self.glyphNames
+        }
+        self.niceNames = {}
+
+    @staticmethod
+    def stampForFont(font):
+        """
+        Glyph count and newest glyph lastChange, a cheap change marker:
+        adding or removing a glyph changes the count, renaming one or
+        editing its unicodes moves its lastChange.
+        """
+        glyphs = font.glyphs
+        return len(glyphs), max(map(str, filter(None, map(attrgetter("lastChange"), glyphs))), default=None)
+
+    def isCurrent(self, font):
+        return font is self.font and self.stampForFont(font) == self.stamp
+
+    def niceGlyphName(self, hexUni):
+        if hexUni not in self.niceNames:
+            self.niceNames[hexUni] = Glyphs.niceGlyphName(hexUni)
+        return self.niceNames[hexUni]
+
+
+_glyphLookup = None
+
+
+def glyphLookupForFont(font):
+    """Return the cached GlyphLookup for font, rebuilding it when the font changed."""
+    global _glyphLookup
+    if _glyphLookup is None or not _glyphLookup.isCurrent(font):
+        _glyphLookup = GlyphLookup(font)
+    return _glyphLookup
+
+
+def normalizeInput(tokens, font, lookup=None):
     """
     Convert characters or glyph names into valid glyph names.
     Uses manual CHAR_TO_GLYPHNAME, Unicode lookup in font, Glyphs niceGlyphName,
-    or skips missing.
+    or skips missing. All lookups go through one GlyphLookup per font.
     """
+    lookup = lookup or glyphLookupForFont(font)
     result = []
     skipped = []
     for t in tokens:
         # First: manual mapping
         if t in CHAR_TO_GLYPHNAME:
-            glyphName = CHAR_TO_GLYPHNAME[t]
-            if font.glyphs[glyphName]:
+            glyphName = lookup.nameForChar.get(t)
+            if glyphName:
                 result.append(glyphName)
             else:
                 skipped.append(t)
@@ -59,36 +124,23 @@ def normalizeInput(tokens, font):
 
         # Second: single character → Unicode lookup
         if len(t) == 1:
-            uni = ord(t)
-            hexUni = f"{uni:04X}"
-            glyph = None
-            try:
-                glyph = font.glyphForUnicode_(hexUni)  # Glyphs 3 API
-            except:
-                glyph = None
+            hexUni = f"{ord(t):04X}"
+            glyphName = lookup.nameForUnicode.get(hexUni)
 
-            if not glyph:
+            if not glyphName:
                 # fallback: Glyphs niceGlyphName (maps Unicode → name like "aacute")
-                glyphName = Glyphs.niceGlyphName(hexUni)
-                if glyphName and font.glyphs[glyphName]:
-                    glyph = font.glyphs[glyphName]
-
-            if not glyph:
-                # fallback: search manually
-                for g in font.glyphs:
-                    if g.unicode == hexUni:
-                        glyph = g
-                        break
-
-            if glyph:
-                result.append(glyph.name)
-                continue
+                glyphName = lookup.niceGlyphName(hexUni)
+                if glyphName not in lookup.glyphNames:
+                    glyphName = None
+
+            if glyphName:
+                result.append(glyphName)
             else:
                 skipped.append(t)
-                continue
+            continue
 
         # Third: user typed a glyph name directly
-        if font.glyphs[t]:
+        if t in lookup.glyphNames:
             result.append(t)
         else:
             skipped.append(t)
@@ -96,9 +148,131 @@ def normalizeInput(tokens, font):
     return result, skipped
 
 
+def kerningClasses(glyphNames, font):
+    """
+    Return {glyphName: (leftSideKeys, rightSideKeys)}, the kerning keys a glyph
+    can use on either side of a pair: its group first, then its ID and name.
+    """
+    classes = {}
+    for glyphName in glyphNames:
+        if glyphName in classes:
+            continue
+        g = font.glyphs[glyphName]
+        leftSideKeys = [g.id, glyphName]
+        rightSideKeys = [g.id, glyphName]
+        if g.rightKerningGroup:
+            leftSideKeys.insert(0, f"@MMK_L_{g.rightKerningGroup}")
+        if g.leftKerningGroup:
+            rightSideKeys.insert(0, f"@MMK_R_{g.leftKerningGroup}")
+        classes[glyphName] = (tuple(leftSideKeys), tuple(rightSideKeys))
+    return classes
+
+
+def iterPairs(firstInput, secondInput, font, onePerClass=False, kerningDict=None):
+    """
+    Lazily yield (first, second) glyph name pairs.
+    onePerClass keeps one representative per (left glyph's right group,
+    right glyph's left group). With a kerningDict, pairs that already have
+    kerning (group, exception or glyph pair) are skipped.
+    """
+    classes = kerningClasses(firstInput + secondInput, font) if onePerClass or kerningDict is not None else {}
+    seenClasses = set()
+    for f in firstInput:
+        for s in secondInput:
+            if not classes:
+                yield f, s
+                continue
+            leftSideKeys = classes[f][0]
+            rightSideKeys = classes[s][1]
+            pairClass = (leftSideKeys[0], rightSideKeys[0])
+            if onePerClass and pairClass in seenClasses:
+                continue
+            # A kerned representative (e.g. a glyph exception) must not use up its
+            # class: another glyph of the class may still stand for the unkerned pair
+            if kerningDict is not None and any(
+                rightKey in kerningDict.get(leftKey, ())
+                for leftKey in leftSideKeys
+                for rightKey in rightSideKeys
+            ):
+                continue
+            seenClasses.add(pairClass)
+            yield f, s
+
+
+def iterPages(pairs, pattern, pairsPerTab):
+    """Lazily turn pairs into tab strings of at most pairsPerTab pairs."""
+    pairs = iter(pairs)
+    while True:
+        page = []
+        for f, s in islice(pairs, pairsPerTab):
+            if pattern == 0:  # AB
+                page.append(f"/{f}/{s}")
+            else:  # ABA
+                page.append(f"/{f}/{s}/{f}")
+        if not page:
+            return
+        yield " ".join(page)
+
+
+def corpusHash(path):
+    """SHA-1 of a corpus file, read in blocks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def countBigrams(path):
+    """Count character bigrams of a plain-text corpus in one streaming pass (whitespace is skipped)."""
+    counts = Counter()
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            for word in line.split():
+                counts.update(map(str.__add__, word, word[1:]))
+    return counts
+
+
+def bigramCounts(path):
+    """Bigram counts for a corpus, cached on disk by the corpus' hash."""
+    cachePath = os.path.join(BIGRAM_CACHE_FOLDER, f"bigrams-{corpusHash(path)}.json")
+    if os.path.exists(cachePath):
+        try:
+            with open(cachePath, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    counts = dict(countBigrams(path))
+    try:
+        os.makedirs(BIGRAM_CACHE_FOLDER, exist_ok=True)
+        with open(cachePath, "w", encoding="utf-8") as f:
+            json.dump(counts, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠️ Could not cache bigram counts: {e}")
+    return counts
+
+
+def rankPairs(pairs, counts, lookup, maxPairs=0):
+    """
+    Order pairs by how often their characters follow each other in the corpus.
+    Pairs without a Unicode character count as 0. With maxPairs, keep the top ones only.
+    """
+    def frequency(pair):
+        first = lookup.charForName.get(pair[0])
+        second = lookup.charForName.get(pair[1])
+        if not first or not second:
+            return 0
+        return counts.get(first + second, 0)
+
+    if maxPairs:
+        return heapq.nlargest(maxPairs, pairs, key=frequency)
+    return sorted(pairs, key=frequency, reverse=True)
+
+
 class KerningPairsGenerator(object):
     def __init__(self):
-        self.w = vanilla.FloatingWindow((360, 240), "Kerning Pairs Generator")
+        self.w = vanilla.FloatingWindow((360, 395), "Kerning Pairs Generator")
+        self.pages = None
 
         # First set
         self.w.text1 = vanilla.TextBox((10, 10, -10, 20), "First set:")
@@ -127,8 +301,24 @@ class KerningPairsGenerator(object):
         )
         self.w.patternChoice.set(1)  # default = ABA
 
-        # Generate button
-        self.w.button = vanilla.Button((10, 190, -10, 30), "Generate", callback=self.generate)
+        # Options
+        self.w.onePerClass = vanilla.CheckBox((10, 185, -10, 20), "One pair per kerning group class", value=False)
+        self.w.skipKerned = vanilla.CheckBox((10, 205, -10, 20), "Skip pairs already kerned (current master)", value=False)
+        self.w.pairsPerTabText = vanilla.TextBox((10, 233, 100, 20), "Pairs per tab:")
+        self.w.pairsPerTab = vanilla.EditText((110, 230, 60, 22), text="500")
+
+        # Corpus frequency
+        self.w.useCorpus = vanilla.CheckBox((10, 262, -10, 20), "Order by corpus bigram frequency", value=False)
+        self.w.corpusPath = vanilla.EditText((10, 285, -70, 22), placeholder="Plain-text corpus (.txt)")
+        self.w.corpusButton = vanilla.Button((-60, 285, -10, 22), "…", callback=self.chooseCorpus)
+        self.w.maxPairsText = vanilla.TextBox((10, 318, 100, 20), "Max pairs:")
+        self.w.maxPairs = vanilla.EditText((110, 315, 60, 22), text="0")
+        self.w.maxPairsNote = vanilla.TextBox((180, 318, -10, 20), "0 = all", sizeStyle="small")
+
+        # Generate / next page buttons
+        self.w.button = vanilla.Button((10, 350, 165, 30), "Generate", callback=self.generate)
+        self.w.nextButton = vanilla.Button((185, 350, -10, 30), "Next Tab", callback=self.nextPage)
+        self.w.nextButton.enable(False)
 
         self.w.open()
         self.w.makeKey()
@@ -145,14 +335,20 @@ class KerningPairsGenerator(object):
             key = list(PREDEFINED_SETS.keys())[choice - 1]
             self.w.secondSet.set(" ".join(PREDEFINED_SETS[key]))
 
+    def chooseCorpus(self, sender):
+        path = GetOpenFile(message="Choose a plain-text corpus", filetypes=["txt"])
+        if path:
+            self.w.corpusPath.set(path)
+
     def generate(self, sender):
         font = Glyphs.font
         if not font:
             Message("No font open", "Open a font to generate pairs.")
             return
 
-        firstInput, skipped1 = normalizeInput(self.w.firstSet.get().strip().split(), font)
-        secondInput, skipped2 = normalizeInput(self.w.secondSet.get().strip().split(), font)
+        lookup = glyphLookupForFont(font)
+        firstInput, skipped1 = normalizeInput(self.w.firstSet.get().strip().split(), font, lookup)
+        secondInput, skipped2 = normalizeInput(self.w.secondSet.get().strip().split(), font, lookup)
 
         skipped = skipped1 + skipped2
         if skipped:
@@ -164,18 +360,46 @@ class KerningPairsGenerator(object):
             Message("Empty input", "Fill in both sets to generate pairs.")
             return
 
-        pairs = []
-        pattern = self.w.patternChoice.get()
-        for f in firstInput:
-            for s in secondInput:
-                if pattern == 0:  # AB
-                    seq = f"/{f}/{s}"
-                else:  # ABA
-                    seq = f"/{f}/{s}/{f}"
-                pairs.append(seq)
-
-        tabString = " ".join(pairs)
+        try:
+            pairsPerTab = int(self.w.pairsPerTab.get())
+            if pairsPerTab < 1:
+                raise ValueError
+        except ValueError:
+            Message("Pairs per tab", "Enter a whole number greater than 0.")
+            return
+
+        kerningDict = None
+        if self.w.skipKerned.get():
+            kerningDict = font.kerning.get(font.selectedFontMaster.id, {})
+
+        pairs = iterPairs(firstInput, secondInput, font, self.w.onePerClass.get(), kerningDict)
+
+        if self.w.useCorpus.get():
+            corpusPath = self.w.corpusPath.get().strip()
+            if not os.path.isfile(corpusPath):
+                Message("No corpus", "Choose a plain-text corpus file.")
+                return
+            try:
+                maxPairs = max(0, int(self.w.maxPairs.get() or 0))
+            except ValueError:
+                Message("Max pairs", "Enter a whole number (0 = all).")
+                return
+            pairs = rankPairs(pairs, bigramCounts(corpusPath), lookup, maxPairs)
+        self.pages = iterPages(pairs, self.w.patternChoice.get(), pairsPerTab)
+        if not self.nextPage(None):
+            Message("No pairs", "All pairs are already kerned or filtered out.")
+
+    def nextPage(self, sender):
+        """Open the next page of pairs in a new tab. Returns False when done."""
+        font = Glyphs.font
+        tabString = next(self.pages, None) if self.pages and font else None
+        if tabString is None:
+            self.pages = None
+            self.w.nextButton.enable(False)
+            return False
         font.newTab(tabString)
+        self.w.nextButton.enable(True)
+        return True
 
 
 KerningPairsGenerator()
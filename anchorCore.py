@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Anchor usage analysis for Find lost Anchors (no UI, no MenuTitle).
+The analysis works on plain names and sets, so it runs without Glyphs.
+"""
+
+import hashlib
+import json
+import os
+from collections import defaultdict
+
+
+def baseAnchorName(anchorName):
+    """Mark anchors attach with their _xxx counterpart: _top → top."""
+    return anchorName[1:] if anchorName.startswith("_") else anchorName
+
+
+def ligatureAnchorName(anchorName):
+    """Ligature anchors take the marks of their base anchor: top_1 → top."""
+    name, underscore, index = anchorName.rpartition("_")
+    return name if name and index.isdigit() else anchorName
+
+
+def findUnusedAnchors(baseAnchors, markAnchors, componentAnchors):
+    """
+    Return {glyphName: sorted unused anchor names} for base glyphs.
+
+    baseAnchors      {glyphName: set of anchor names} of the base glyphs
+    markAnchors      anchor names found on mark glyphs (with or without _)
+    componentAnchors (componentName, anchorName) of components that attach
+                     to a specific anchor of their base
+
+    Builds one anchor name → base glyphs index and joins it with the mark
+    anchors, so the cost is linear in the number of anchors. Ligature
+    anchors (top_1, top_2) are indexed under their base anchor (top).
+    """
+    glyphsByAnchor = defaultdict(set)  # anchor name → {(glyphName, anchor name on that glyph)}
+    for glyphName, anchorNames in baseAnchors.items():
+        for anchorName in anchorNames:
+            glyphsByAnchor[ligatureAnchorName(anchorName)].add((glyphName, anchorName))
+
+    used = defaultdict(set)
+
+    # 1. Components: the anchor a component is attached to counts for its base
+    for componentName, anchorName in componentAnchors:
+        if componentName in baseAnchors and anchorName:
+            used[componentName].add(anchorName)
+
+    # 2. Marks: every base glyph carrying a mark's anchor uses it
+    for markAnchorName in {baseAnchorName(name) for name in markAnchors}:
+        for glyphName, anchorName in glyphsByAnchor.get(markAnchorName, ()):
+            used[glyphName].add(anchorName)
+
+    # 3. Whatever is left is unused
+    unusedAnchorsPerGlyph = {}
+    for glyphName, anchorNames in baseAnchors.items():
+        unused = anchorNames - used[glyphName]
+        if unused:
+            unusedAnchorsPerGlyph[glyphName] = sorted(unused)
+    return unusedAnchorsPerGlyph
+
+
+def anchorRecord(glyph, layer):
+    """Plain, JSON-friendly summary of what a layer contributes to the analysis."""
+    return {
+        "mark": glyph.category == "Mark",
+        "anchors": [a.name for a in layer.anchors],
+        "components": [[c.componentName, c.anchor] for c in layer.components if c.anchor],
+    }
+
+
+def layerFingerprint(glyph, layer):
+    """Cheap change marker for a layer: its anchor names plus the glyph's lastChange."""
+    anchorNames = "|".join(sorted(a.name for a in layer.anchors))
+    lastChange = getattr(glyph, "lastChange", None)
+    if lastChange is None:
+        # unsaved or older API: fall back to the components themselves
+        lastChange = "|".join(f"{c.componentName}:{c.anchor}" for c in layer.components)
+    key = f"{anchorNames}|{lastChange}|{glyph.category}|{layer.name}"
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+class AnchorLayerCache(object):
+    """
+    Per-layer anchor records stored in a JSON sidecar next to the font.
+    Layers whose fingerprint did not change are not read again.
+    """
+
+    version = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.version:
+                    self.records = data.get("layers", {})
+            except (OSError, ValueError):
+                self.records = {}
+
+    @classmethod
+    def forFont(cls, font):
+        """Sidecar cache for a saved font, None for unsaved fonts."""
+        if not font.filepath:
+            return None
+        return cls(os.path.splitext(font.filepath)[0] + ".anchorcache.json")
+
+    def record(self, glyph, layer):
+        key = f"{glyph.name}/{layer.layerId}"
+        fingerprint = layerFingerprint(glyph, layer)
+        cached = self.records.get(key)
+        if cached and cached.get("fingerprint") == fingerprint:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        record = anchorRecord(glyph, layer)
+        record["fingerprint"] = fingerprint
+        self.records[key] = record
+        return record
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "layers": self.records}, f)
+
+
+def anchorDataForRecords(recordsByGlyph):
+    """
+    Collect (baseAnchors, markAnchors, componentAnchors) from layer records.
+    recordsByGlyph is an iterable of (glyphName, record) for one design location.
+    """
+    baseAnchors = {}
+    markAnchors = set()
+    componentAnchors = []
+    for glyphName, record in recordsByGlyph:
+        if record["mark"]:
+            markAnchors.update(record["anchors"])
+            continue
+        baseAnchors[glyphName] = set(record["anchors"])
+        componentAnchors.extend(tuple(c) for c in record["components"])
+    return baseAnchors, markAnchors, componentAnchors
+
+
+def findUnusedAnchorsInFont(font, allMasters=False, allLayers=False, cache=None):
+    """
+    Return report rows (master, layerName, glyphName, layerId, unusedAnchors).
+
+    By default only the first master layer of each glyph is checked.
+    allMasters analyses every master on its own. allLayers also analyses
+    special (brace/bracket) layers: all glyphs are checked at that location,
+    using their master layer where they have no special layer, and only the
+    special layers themselves are reported. Every layer is read once; the
+    master records are reused for the special locations of that master.
+    An AnchorLayerCache only re-reads layers that changed since the last run.
+    """
+    masters = font.masters if allMasters or allLayers else [font.masters[0]]
+    readRecord = cache.record if cache else anchorRecord
+
+    # (masterId, special layer name) → {glyphName: layer}
+    locations = {(m.id, None): {} for m in masters}
+    for g in font.glyphs:
+        for m in masters:
+            layer = g.layers[m.id]
+            if layer is not None:
+                locations[(m.id, None)][g.name] = layer
+        if not allLayers:
+            continue
+        for layer in g.layers:
+            if layer.isSpecialLayer and (layer.associatedMasterId, None) in locations:
+                locations.setdefault((layer.associatedMasterId, layer.name), {})[g.name] = layer
+
+    glyphsByName = {g.name: g for g in font.glyphs}
+    mastersById = {m.id: m for m in masters}
+    masterRecords = {}  # masterId → {glyphName: record}, read before the special locations
+    rows = []
+    for (masterId, layerName), specialLayers in locations.items():
+        records = {name: readRecord(glyphsByName[name], layer) for name, layer in specialLayers.items()}
+        if layerName is None:
+            masterRecords[masterId] = records
+        else:
+            records = {**masterRecords[masterId], **records}
+        unusedAnchorsPerGlyph = findUnusedAnchors(*anchorDataForRecords(records.items()))
+        for glyphName in sorted(unusedAnchorsPerGlyph.keys()):
+            if glyphName not in specialLayers:
+                continue
+            layerId = specialLayers[glyphName].layerId
+            rows.append((mastersById[masterId], layerName, glyphName, layerId, unusedAnchorsPerGlyph[glyphName]))
+
+    masterOrder = {m.id: i for i, m in enumerate(masters)}
+    rows.sort(key=lambda row: (masterOrder[row[0].id], row[1] or "", row[2]))
+    return rows
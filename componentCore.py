@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Component helpers for Copy Components and Component Dependencies (no UI,
+no MenuTitle). Plans work on plain component signatures, so they run
+without Glyphs.
+"""
+
+import heapq
+import json
+import os
+from collections import defaultdict, deque
+
+POLICIES = ("replace", "merge", "skip")
+
+
+def componentSignature(comp, position=None):
+    """
+    Everything that makes two components equal for copying purposes.
+    position replaces the component's own offset (see placeComponents).
+    """
+    transform = tuple(comp.transform)
+    if position is not None:
+        transform = transform[:4] + tuple(position)
+    return (comp.componentName, transform, comp.anchor or None)
+
+
+def componentSpec(comp):
+    """(componentName, anchorName, (x, y), fixed) input for placeComponents."""
+    transform = tuple(comp.transform)
+    fixed = transform[:4] != (1, 0, 0, 1) or bool(getattr(comp, "automaticAlignment", False))
+    return (comp.componentName, comp.anchor or None, (transform[4], transform[5]), fixed)
+
+
+def planComponents(sourceSignatures, targetSignatures, policy="replace"):
+    """
+    Work out the component list a target layer should get.
+
+    Returns a list of ("source", i) / ("target", j) references in final
+    order, or None if the layer should not be touched (already identical,
+    or skipped by the policy).
+
+    replace  target gets exactly the source components
+    merge    target components whose name also appears in the source are
+             swapped for the source version (nth occurrence ↔ nth occurrence),
+             other target components are kept, missing ones are appended
+    skip     only layers without components are filled
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}, use one of {', '.join(POLICIES)}")
+
+    if policy == "skip" and targetSignatures:
+        return None
+
+    if policy == "merge":
+        sourceByName = defaultdict(list)
+        for i, signature in enumerate(sourceSignatures):
+            sourceByName[signature[0]].append(i)
+        used = set()
+        plan = []
+        for j, signature in enumerate(targetSignatures):
+            candidates = sourceByName.get(signature[0])
+            if candidates:
+                i = candidates.pop(0)
+                used.add(i)
+                plan.append(("source", i))
+            else:
+                plan.append(("target", j))
+        plan.extend(("source", i) for i in range(len(sourceSignatures)) if i not in used)
+    else:
+        plan = [("source", i) for i in range(len(sourceSignatures))]
+
+    result = [sourceSignatures[i] if kind == "source" else targetSignatures[i] for kind, i in plan]
+    if result == list(targetSignatures):
+        return None
+    return plan
+
+
+class MasterMetricsTable(object):
+    """
+    Anchor positions and widths per (glyph name, master id), read from the
+    font at most once per run and shared by every component that needs them.
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self._anchors = {}
+        self._widths = {}
+
+    def _layer(self, glyphName, masterId):
+        glyph = self.font.glyphs[glyphName]
+        return glyph.layers[masterId] if glyph else None
+
+    def anchors(self, glyphName, masterId):
+        key = (glyphName, masterId)
+        if key not in self._anchors:
+            layer = self._layer(glyphName, masterId)
+            self._anchors[key] = {a.name: (a.position.x, a.position.y) for a in layer.anchors} if layer else {}
+        return self._anchors[key]
+
+    def width(self, glyphName, masterId):
+        key = (glyphName, masterId)
+        if key not in self._widths:
+            layer = self._layer(glyphName, masterId)
+            self._widths[key] = layer.width if layer else 0
+        return self._widths[key]
+
+    def forget(self, glyphName):
+        """Drop what was read for glyphName, e.g. after its components moved."""
+        for table in (self._anchors, self._widths):
+            for key in [key for key in table if key[0] == glyphName]:
+                del table[key]
+
+
+def placeComponents(specs, sourceMasterId, targetMasterId, table):
+    """
+    Recompute component offsets for another master, like Glyphs' own
+    attaching does: a component with a matching _anchor sits on the anchor
+    of the components before it, a component placed right after the
+    previous advance width follows that width. specs are
+    (componentName, anchorName, (x, y), fixed) in source order; fixed
+    components (scaled, or aligned by Glyphs itself) keep their offset.
+    Returns one (x, y) per spec, or None where the source offset is kept.
+    """
+    positions = []
+    attachAnchors = {}  # anchor name → position, built up as in Glyphs
+    sourceAdvance = 0
+    targetAdvance = 0
+    for componentName, anchorName, (x, y), fixed in specs:
+        anchors = table.anchors(componentName, targetMasterId)
+        position = None
+        if not fixed and positions:
+            if anchorName:
+                # explicit anchor, e.g. top_1 on a ligature takes the mark's _top
+                markName = "_" + anchorName.split("_")[0]
+                pairs = [(anchorName, markName)] if anchorName in attachAnchors and markName in anchors else []
+            else:
+                pairs = [(name[1:], name) for name in anchors if name.startswith("_") and name[1:] in attachAnchors]
+            if pairs:
+                baseName, markName = pairs[0]
+                baseX, baseY = attachAnchors[baseName]
+                markX, markY = anchors[markName]
+                position = (baseX - markX, baseY - markY)
+            elif abs(x - sourceAdvance) < 0.5 and y == 0:
+                position = (targetAdvance, 0)
+        positions.append(position)
+
+        offsetX, offsetY = position if position else (x, y)
+        for name, (anchorX, anchorY) in anchors.items():
+            if not name.startswith("_"):
+                attachAnchors[name] = (anchorX + offsetX, anchorY + offsetY)
+        sourceAdvance = x + table.width(componentName, sourceMasterId)
+        targetAdvance = offsetX + table.width(componentName, targetMasterId)
+    return positions
+
+
+def copyComponents(font, glyphs, sourceMaster, policy="skip", placement="copy", makePoint=None, graph=None):
+    """
+    Copy the components of sourceMaster into every other master of glyphs.
+    Runs in one update-disabled region with one undo step per glyph.
+    placement "anchors" recomputes the offsets per master (see placeComponents).
+    makePoint turns (x, y) into what component.position accepts (NSPoint in Glyphs).
+    A ComponentGraph passed as graph is updated for every glyph written.
+    Returns (report lines, number of layers that were already identical).
+    """
+    report = []
+    unchanged = 0
+
+    # Anchors and widths per glyph × master, read once per run
+    metrics = MasterMetricsTable(font)
+
+    # All in one go: no interface updates, one undo step per glyph
+    font.disableUpdateInterface()
+    try:
+        for glyph in glyphs:
+            # Source layer = current master
+            sourceLayer = glyph.layers[sourceMaster.id]
+
+            if not sourceLayer:
+                report.append(f"⚠️  {glyph.name}: No layer found for the current master.")
+                continue
+
+            sourceComponents = list(sourceLayer.components)
+
+            if not sourceComponents:
+                report.append(f"⚠️  {glyph.name}: No components in the current master ({sourceMaster.name}).")
+                continue
+
+            sourceSpecs = [componentSpec(c) for c in sourceComponents]
+
+            glyph.beginUndo()
+            try:
+                for master in font.masters:
+                    # Skip the source master
+                    if master.id == sourceMaster.id:
+                        continue
+
+                    targetLayer = glyph.layers[master.id]
+
+                    if not targetLayer:
+                        report.append(f"⚠️  {glyph.name} → {master.name}: No target layer found.")
+                        continue
+
+                    # Positions for this master (None = as in the source master)
+                    positions = [None] * len(sourceComponents)
+                    if placement == "anchors":
+                        positions = placeComponents(sourceSpecs, sourceMaster.id, master.id, metrics)
+                    sourceSignatures = [componentSignature(c, p) for c, p in zip(sourceComponents, positions)]
+
+                    targetComponents = list(targetLayer.components)
+                    plan = planComponents(sourceSignatures, [componentSignature(c) for c in targetComponents], policy)
+
+                    if plan is None:
+                        if policy == "skip" and targetComponents:
+                            report.append(f"⏭️  {glyph.name} → {master.name}: Already has components, skipped.")
+                        else:
+                            unchanged += 1
+                        continue
+
+                    # Build the new component list and write only this layer
+                    newComponents = []
+                    for kind, i in plan:
+                        if kind == "target":
+                            newComponents.append(targetComponents[i])
+                            continue
+                        newComp = sourceComponents[i].copy()
+                        if positions[i] is not None:
+                            newComp.position = makePoint(*positions[i]) if makePoint else positions[i]
+                        newComponents.append(newComp)
+                    for comp in targetComponents:
+                        targetLayer.shapes.remove(comp)
+                    for comp in newComponents:
+                        targetLayer.shapes.append(comp)
+
+                    report.append(f"✅  {glyph.name} → {master.name}: {len(newComponents)} component(s) set ({policy}).")
+            finally:
+                glyph.endUndo()
+            if graph is not None:
+                graph.glyphEdited(glyph)
+    finally:
+        font.enableUpdateInterface()
+
+    return report, unchanged
+
+
+def _glyphChangeMarker(glyph):
+    lastChange = getattr(glyph, "lastChange", None)
+    return None if lastChange is None else str(lastChange)
+
+
+class ComponentGraph(object):
+    """
+    Which glyph uses which as a component, for every master, as adjacency
+    lists: uses[masterId][glyphName] is the tuple of component names,
+    usedBy[masterId][componentName] the set of glyphs using it.
+    Glyphs are updated one at a time (updateGlyph), so edits never rebuild
+    the graph. forFont keeps it in a JSON sidecar and only re-reads glyphs
+    whose lastChange moved.
+    """
+
+    version = 1
+
+    def __init__(self, masterIds, path=None):
+        self.path = path
+        self.masterIds = list(masterIds)
+        self.uses = {masterId: {} for masterId in self.masterIds}
+        self.usedBy = {masterId: defaultdict(set) for masterId in self.masterIds}
+        self.changeMarkers = {}  # glyph name → lastChange when the glyph was read
+        self.updated = 0
+
+    @classmethod
+    def forFont(cls, font):
+        """Graph of all master layers; saved fonts reuse their .componentgraph.json."""
+        path = os.path.splitext(font.filepath)[0] + ".componentgraph.json" if font.filepath else None
+        graph = cls([master.id for master in font.masters], path)
+        graph._load()
+        graph.refresh(font)
+        return graph
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.version or data.get("masterIds") != self.masterIds:
+            return
+        for glyphName, entry in data.get("glyphs", {}).items():
+            for masterId, componentNames in entry.get("uses", {}).items():
+                self._setUses(glyphName, masterId, tuple(componentNames))
+            self.changeMarkers[glyphName] = entry.get("lastChange")
+
+    def save(self):
+        if not self.path:
+            return
+        glyphs = {glyphName: {"lastChange": marker, "uses": {}} for glyphName, marker in self.changeMarkers.items()}
+        for masterId, uses in self.uses.items():
+            for glyphName, componentNames in uses.items():
+                glyphs.setdefault(glyphName, {"lastChange": None, "uses": {}})["uses"][masterId] = list(componentNames)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "masterIds": self.masterIds, "glyphs": glyphs}, f)
+
+    def _setUses(self, glyphName, masterId, componentNames):
+        uses = self.uses[masterId]
+        usedBy = self.usedBy[masterId]
+        old = uses.get(glyphName, ())
+        if old == componentNames:
+            return
+        for componentName in set(old) - set(componentNames):
+            users = usedBy[componentName]
+            users.discard(glyphName)
+            if not users:
+                del usedBy[componentName]
+        for componentName in componentNames:
+            usedBy[componentName].add(glyphName)
+        if componentNames:
+            uses[glyphName] = componentNames
+        else:
+            uses.pop(glyphName, None)
+
+    def updateGlyph(self, glyph):
+        """Re-read the components of one glyph's master layers, e.g. after an edit."""
+        for masterId in self.masterIds:
+            layer = glyph.layers[masterId]
+            componentNames = tuple(c.componentName for c in layer.components) if layer is not None else ()
+            self._setUses(glyph.name, masterId, componentNames)
+        self.changeMarkers[glyph.name] = _glyphChangeMarker(glyph)
+        self.updated += 1
+
+    def glyphEdited(self, glyph):
+        """
+        Update after an edit made in this run. The glyph is read again next
+        time, as the edit may never be saved to the font file.
+        """
+        self.updateGlyph(glyph)
+        self.changeMarkers[glyph.name] = None
+
+    def removeGlyph(self, glyphName):
+        for masterId in self.masterIds:
+            self._setUses(glyphName, masterId, ())
+        self.changeMarkers.pop(glyphName, None)
+
+    def refresh(self, font):
+        """Update glyphs changed since the graph was read (or without lastChange), drop deleted ones."""
+        glyphNames = set()
+        for glyph in font.glyphs:
+            glyphNames.add(glyph.name)
+            marker = _glyphChangeMarker(glyph)
+            if marker is None or self.changeMarkers.get(glyph.name) != marker:
+                self.updateGlyph(glyph)
+        for glyphName in set(self.changeMarkers) - glyphNames:
+            self.removeGlyph(glyphName)
+
+    def _masterIds(self, masterId):
+        return [masterId] if masterId else self.masterIds
+
+    def components(self, glyphName, masterId=None):
+        """Names of the glyphs glyphName uses directly (in any master unless masterId is given)."""
+        return {name for m in self._masterIds(masterId) for name in self.uses[m].get(glyphName, ())}
+
+    def users(self, glyphName, masterId=None):
+        """Names of the glyphs using glyphName directly."""
+        return {name for m in self._masterIds(masterId) for name in self.usedBy[m].get(glyphName, ())}
+
+    def dependents(self, glyphNames, masterId=None):
+        """Every glyph using one of glyphNames, directly or through other composites."""
+        found = set()
+        queue = deque(glyphNames)
+        while queue:
+            for user in self.users(queue.popleft(), masterId):
+                if user not in found:
+                    found.add(user)
+                    queue.append(user)
+        return found
+
+    def topologicalOrder(self, glyphNames, masterId=None):
+        """
+        glyphNames with every glyph after the glyphs it uses (bases first),
+        alphabetical where the order is free. Raises ValueError for circular
+        components.
+        """
+        selected = set(glyphNames)
+        waiting = {name: len(self.components(name, masterId) & selected) for name in selected}
+        ready = [name for name, count in waiting.items() if not count]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            name = heapq.heappop(ready)
+            order.append(name)
+            for user in self.users(name, masterId) & selected:
+                waiting[user] -= 1
+                if not waiting[user]:
+                    heapq.heappush(ready, user)
+        if len(order) < len(selected):
+            raise ValueError(f"Circular components: {', '.join(sorted(selected - set(order)))}")
+        return order
+
+    def stale(self, changedGlyphNames, masterId=None):
+        """Composites affected by changes to changedGlyphNames, in the order to update them."""
+        return self.topologicalOrder(self.dependents(changedGlyphNames, masterId), masterId)
+
+
+def reanchorComponents(font, glyphs, masters, makePoint=None, graph=None):
+    """
+    Re-attach the components of glyphs to the current anchors and widths of
+    their bases in every master (see placeComponents). Automatically aligned
+    components are left to Glyphs. Pass glyphs bases first
+    (ComponentGraph.topologicalOrder), so nested composites see the already
+    moved components. Returns (report lines, unchanged layer count).
+    """
+    report = []
+    unchanged = 0
+    metrics = MasterMetricsTable(font)
+    font.disableUpdateInterface()
+    try:
+        for glyph in glyphs:
+            glyph.beginUndo()
+            try:
+                for master in masters:
+                    layer = glyph.layers[master.id]
+                    if layer is None or not layer.components:
+                        continue
+                    components = list(layer.components)
+                    positions = placeComponents([componentSpec(c) for c in components], master.id, master.id, metrics)
+                    moved = 0
+                    for component, position in zip(components, positions):
+                        if position is None:
+                            continue
+                        x, y = component.position[0], component.position[1]
+                        if abs(x - position[0]) < 0.01 and abs(y - position[1]) < 0.01:
+                            continue
+                        component.position = makePoint(*position) if makePoint else position
+                        moved += 1
+                    if moved:
+                        report.append(f"✅  {glyph.name} → {master.name}: {moved} component(s) reanchored.")
+                    else:
+                        unchanged += 1
+            finally:
+                glyph.endUndo()
+            # Dependent glyphs should see the new positions
+            metrics.forget(glyph.name)
+            if graph is not None:
+                graph.glyphEdited(glyph)
+    finally:
+        font.enableUpdateInterface()
+    return report, unchanged
+
+
+def decomposeComponents(font, glyphs, masters, graph=None):
+    """Decompose all components of glyphs in the given masters. Returns report lines."""
+    report = []
+    font.disableUpdateInterface()
+    try:
+        for glyph in glyphs:
+            glyph.beginUndo()
+            try:
+                for master in masters:
+                    layer = glyph.layers[master.id]
+                    if layer is None or not layer.components:
+                        continue
+                    count = len(layer.components)
+                    layer.decomposeComponents()
+                    report.append(f"✅  {glyph.name} → {master.name}: {count} component(s) decomposed.")
+            finally:
+                glyph.endUndo()
+            if graph is not None:
+                graph.glyphEdited(glyph)
+    finally:
+        font.enableUpdateInterface()
+    return report
+
+
+if __name__ == "__main__":
+    # Benchmark: python3 componentCore.py [glyphCount]
+    import sys
+    import tempfile
+    import time
+
+    import glyphsPlist
+    from fontAccess import GlyphsFileFont
+
+    glyphCount = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "Synthetic.glyphs")
+        glyphsPlist.writeSyntheticFont(path, glyphCount, masterCount=4, contours=1, nodesPerContour=3)
+        font = GlyphsFileFont(path)
+        print(f"Synthetic font: {glyphCount} glyphs × 4 masters")
+
+        for run in ("built", "from sidecar"):
+            start = time.time()
+            graph = ComponentGraph.forFont(font)
+            print(f"Graph {run} ({graph.updated} glyphs read): {time.time() - start:.3f}s")
+            graph.save()
+
+        start = time.time()
+        stale = graph.stale([f"g{g}" for g in range(0, glyphCount, 7)])
+        print(f"{len(stale)} dependents of {glyphCount // 7} glyphs, ordered: {time.time() - start:.3f}s")
+
+        start = time.time()
+        masterId = font.masters[0].id
+        layer = font.glyphs["g10"].layers[masterId]
+        layer.shapes.remove(layer.components[0])
+        graph.glyphEdited(font.glyphs["g10"])
+        print(f"Incremental update after an edit: {(time.time() - start) * 1000:.2f}ms "
+              f"(g9 users: {sorted(graph.users('g9', masterId))} in the edited master, {sorted(graph.users('g9'))} in all)")
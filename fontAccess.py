@@ -0,0 +1,724 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Font access shared by the scripts and the command-line batch jobs (no UI,
+no MenuTitle). Inside Glyphs, fonts are the live GSFont objects. Outside
+Glyphs, .glyphs files (format 2 and 3) are parsed into light objects with
+the same attribute names the *Core modules use: font.masters, font.glyphs,
+font.kerning[master.id], glyph.layers[master.id], layer.anchors,
+layer.components, layer.shapes, layer.LSB/RSB/width.
+"""
+
+import hashlib
+import math
+import os
+from collections import namedtuple
+
+import glyphsPlist
+
+try:
+    from GlyphsApp import Glyphs
+except ImportError:
+    Glyphs = None
+
+Point = namedtuple("Point", "x y")
+Bounds = namedtuple("Bounds", "xMin yMin xMax yMax")
+
+NODE_TYPES = {"LINE": "l", "CURVE": "c", "OFFCURVE": "o", "QCURVE": "q"}
+
+
+def insideGlyphs():
+    return Glyphs is not None
+
+
+def currentFont():
+    """The frontmost font in Glyphs, None outside Glyphs."""
+    return Glyphs.font if Glyphs is not None else None
+
+
+def openFont(path, **partial):
+    """
+    Open a .glyphs file: as a hidden GSFont inside Glyphs, parsed from disk
+    outside. partial (sections, skipKeys, glyphKeys, layers) limits what is
+    parsed outside Glyphs, see GlyphsFileFont.
+    """
+    if Glyphs is not None:
+        return Glyphs.open(path, showInterface=False)
+    return GlyphsFileFont(path, **partial)
+
+
+def iterFontPaths(paths):
+    """Yield every .glyphs file in paths; directories are searched recursively."""
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, folderNames, fileNames in os.walk(path):
+                folderNames.sort()
+                for fileName in sorted(fileNames):
+                    if fileName.endswith(".glyphs"):
+                        yield os.path.join(folder, fileName)
+        elif path.endswith(".glyphs"):
+            yield path
+
+
+# --- geometry ---
+
+
+def _cubicExtrema(p0, p1, p2, p3):
+    """Coordinates of a cubic's extrema on one axis (t strictly inside 0…1)."""
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 2 * (p0 - 2 * p1 + p2)
+    c = p1 - p0
+    if abs(a) < 1e-12:
+        roots = [-c / b] if abs(b) > 1e-12 else []
+    else:
+        discriminant = b * b - 4 * a * c
+        if discriminant < 0:
+            return []
+        root = math.sqrt(discriminant)
+        roots = [(-b + root) / (2 * a), (-b - root) / (2 * a)]
+    values = []
+    for t in roots:
+        if 0 < t < 1:
+            mt = 1 - t
+            values.append(mt * mt * mt * p0 + 3 * mt * mt * t * p1 + 3 * mt * t * t * p2 + t * t * t * p3)
+    return values
+
+
+def nodesBounds(nodes):
+    """Exact bounds of one closed or open contour given as (x, y, type) nodes."""
+    xs = [x for x, y, nodeType in nodes if nodeType != "o"]
+    ys = [y for x, y, nodeType in nodes if nodeType != "o"]
+    count = len(nodes)
+    for i, (x, y, nodeType) in enumerate(nodes):
+        if nodeType == "c" and count >= 4:
+            (x0, y0, _), (x1, y1, _), (x2, y2, _) = nodes[i - 3], nodes[i - 2], nodes[i - 1]
+            xs.extend(_cubicExtrema(x0, x1, x2, x))
+            ys.extend(_cubicExtrema(y0, y1, y2, y))
+        elif nodeType == "q":
+            # TrueType curves: the off-curve points bound the curve
+            j = i - 1
+            while j > i - count and nodes[j][2] == "o":
+                xs.append(nodes[j][0])
+                ys.append(nodes[j][1])
+                j -= 1
+    if not xs:
+        return None
+    return Bounds(min(xs), min(ys), max(xs), max(ys))
+
+
+def unionBounds(boundsList):
+    boundsList = [b for b in boundsList if b]
+    if not boundsList:
+        return None
+    return Bounds(
+        min(b.xMin for b in boundsList), min(b.yMin for b in boundsList),
+        max(b.xMax for b in boundsList), max(b.yMax for b in boundsList),
+    )
+
+
+def transformBounds(bounds, transform):
+    if not bounds:
+        return None
+    a, b, c, d, tx, ty = transform
+    corners = [(x, y) for x in (bounds.xMin, bounds.xMax) for y in (bounds.yMin, bounds.yMax)]
+    xs = [a * x + c * y + tx for x, y in corners]
+    ys = [b * x + d * y + ty for x, y in corners]
+    return Bounds(min(xs), min(ys), max(xs), max(ys))
+
+
+def _parsePointString(text):
+    """Glyphs 2 "{12, 34}" → [12.0, 34.0]"""
+    return [float(value) for value in str(text).strip("{}").split(",")]
+
+
+def _formatNumber(value):
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+# --- objects parsed from .glyphs files ---
+
+
+class FileMaster(object):
+    __slots__ = ("font", "raw")
+
+    def __init__(self, font, raw):
+        self.font = font
+        self.raw = raw
+
+    @property
+    def id(self):
+        return self.raw["id"]
+
+    @property
+    def name(self):
+        if "name" in self.raw:
+            return self.raw["name"]
+        for parameter in self.raw.get("customParameters", ()):
+            if parameter.get("name") == "Master Name":
+                return parameter.get("value")
+        parts = [self.raw.get(key) for key in ("width", "weight", "custom")]
+        return " ".join(str(part) for part in parts if part) or "Regular"
+
+    @property
+    def axes(self):
+        if "axesValues" in self.raw:
+            return [float(value) for value in self.raw["axesValues"]]
+        return [float(self.raw[key]) for key in ("weightValue", "widthValue", "customValue") if key in self.raw]
+
+    def _metric(self, key, metricType):
+        """Glyphs 2 stores metrics on the master, Glyphs 3 as metricValues in font order."""
+        if key in self.raw:
+            return float(self.raw[key])
+        values = self.raw.get("metricValues", [])
+        for i, metric in enumerate(self.font.raw.get("metrics", [])):
+            if metric.get("type") == metricType and "filter" not in metric and i < len(values):
+                return float(values[i].get("pos", 0))
+        return 0.0
+
+    @property
+    def xHeight(self):
+        return self._metric("xHeight", "x-height")
+
+    @property
+    def ascender(self):
+        return self._metric("ascender", "ascender")
+
+    @property
+    def descender(self):
+        return self._metric("descender", "descender")
+
+
+class FileAnchor(object):
+    __slots__ = ("font", "raw")
+
+    def __init__(self, font, raw):
+        self.font = font
+        self.raw = raw
+
+    @property
+    def name(self):
+        return self.raw.get("name", "")
+
+    @property
+    def position(self):
+        if "position" in self.raw:
+            return Point(*_parsePointString(self.raw["position"]))
+        x, y = self.raw.get("pos", (0, 0))
+        return Point(x, y)
+
+    @position.setter
+    def position(self, point):
+        x, y = point[0], point[1]
+        if self.font.formatVersion < 3:
+            self.raw["position"] = f"{{{_formatNumber(x)}, {_formatNumber(y)}}}"
+        else:
+            self.raw["pos"] = [x, y]
+
+
+class FileComponent(object):
+    __slots__ = ("font", "raw")
+
+    def __init__(self, font, raw):
+        self.font = font
+        self.raw = raw
+
+    @property
+    def componentName(self):
+        return self.raw.get("ref") or self.raw.get("name")
+
+    @property
+    def anchor(self):
+        return self.raw.get("anchor")
+
+    @property
+    def automaticAlignment(self):
+        return self.raw.get("alignment", 0) != -1 and not self.raw.get("disableAlignment")
+
+    @property
+    def transform(self):
+        if "transform" in self.raw:
+            return tuple(float(v) for v in str(self.raw["transform"]).strip("{}").split(","))
+        x, y = self.raw.get("pos", (0, 0))
+        scaleX, scaleY = self.raw.get("scale", (1, 1))
+        angle = math.radians(self.raw.get("angle", 0))
+        if not angle:
+            return (scaleX, 0, 0, scaleY, x, y)
+        cos, sin = math.cos(angle), math.sin(angle)
+        return (scaleX * cos, scaleX * sin, -scaleY * sin, scaleY * cos, x, y)
+
+    @property
+    def position(self):
+        transform = self.transform
+        return Point(transform[4], transform[5])
+
+    @position.setter
+    def position(self, point):
+        x, y = point[0], point[1]
+        if "transform" in self.raw:
+            transform = self.transform[:4] + (x, y)
+            self.raw["transform"] = "{" + ", ".join(_formatNumber(v) for v in transform) + "}"
+        elif self.font.formatVersion < 3:
+            self.raw["transform"] = f"{{1, 0, 0, 1, {_formatNumber(x)}, {_formatNumber(y)}}}"
+        elif x or y:
+            self.raw["pos"] = [x, y]
+        else:
+            self.raw.pop("pos", None)
+
+    def copy(self):
+        return FileComponent(self.font, glyphsPlist.loads(glyphsPlist.dumps(self.raw)))
+
+    def bounds(self, masterId, depth=0):
+        glyph = self.font.glyphs[self.componentName]
+        layer = glyph.layers[masterId] if glyph else None
+        if layer is None or depth > 10:
+            return None
+        return transformBounds(layer.bounds(depth + 1), self.transform)
+
+
+class FilePath(object):
+    __slots__ = ("font", "raw")
+
+    def __init__(self, font, raw):
+        self.font = font
+        self.raw = raw
+
+    @property
+    def nodes(self):
+        """[(x, y, type)] with type l, c, o or q."""
+        nodes = []
+        for node in self.raw.get("nodes", ()):
+            if isinstance(node, str):
+                parts = node.split()
+                nodes.append((float(parts[0]), float(parts[1]), NODE_TYPES.get(parts[2], "l")))
+            else:
+                nodes.append((node[0], node[1], str(node[2])[0]))
+        return nodes
+
+    def shift(self, dx):
+        rawNodes = self.raw.get("nodes", [])
+        for i, node in enumerate(rawNodes):
+            if isinstance(node, str):
+                parts = node.split(" ")
+                parts[0] = _formatNumber(float(parts[0]) + dx)
+                rawNodes[i] = " ".join(parts)
+            else:
+                node[0] += dx
+
+    def transformed(self, transform):
+        """Copy of the path with transform (a, b, c, d, tx, ty) applied to every node."""
+        a, b, c, d, tx, ty = transform
+        raw = glyphsPlist.loads(glyphsPlist.dumps(self.raw))
+        rawNodes = raw.get("nodes", [])
+        for i, node in enumerate(rawNodes):
+            if isinstance(node, str):
+                parts = node.split(" ")
+                x, y = float(parts[0]), float(parts[1])
+                parts[0], parts[1] = _formatNumber(a * x + c * y + tx), _formatNumber(b * x + d * y + ty)
+                rawNodes[i] = " ".join(parts)
+            else:
+                x, y = node[0], node[1]
+                node[0], node[1] = a * x + c * y + tx, b * x + d * y + ty
+        return FilePath(self.font, raw)
+
+    def bounds(self):
+        return nodesBounds(self.nodes)
+
+
+class FileShapes(object):
+    """layer.shapes: paths and components in file order; append/remove work on components."""
+
+    def __init__(self, layer):
+        self.layer = layer
+
+    def _lists(self):
+        raw = self.layer.raw
+        if self.layer.font.formatVersion < 3:
+            return [raw.get("paths", []), raw.get("components", [])]
+        return [raw.get("shapes", [])]
+
+    def __iter__(self):
+        font = self.layer.font
+        for shapes in self._lists():
+            for raw in shapes:
+                yield FileComponent(font, raw) if ("ref" in raw or "name" in raw) else FilePath(font, raw)
+
+    def __len__(self):
+        return sum(len(shapes) for shapes in self._lists())
+
+    def append(self, shape):
+        key = "shapes" if self.layer.font.formatVersion >= 3 else ("components" if isinstance(shape, FileComponent) else "paths")
+        self.layer.raw.setdefault(key, []).append(shape.raw)
+
+    def remove(self, shape):
+        for shapes in self._lists():
+            for i, raw in enumerate(shapes):
+                if raw is shape.raw:
+                    del shapes[i]
+                    return
+        raise ValueError("shape not in layer")
+
+
+class FileLayer(object):
+    __slots__ = ("font", "glyph", "raw")
+
+    def __init__(self, font, glyph, raw):
+        self.font = font
+        self.glyph = glyph
+        self.raw = raw
+
+    @property
+    def parent(self):
+        return self.glyph
+
+    @property
+    def layerId(self):
+        return self.raw.get("layerId")
+
+    @property
+    def associatedMasterId(self):
+        return self.raw.get("associatedMasterId") or self.layerId
+
+    @property
+    def name(self):
+        if "name" in self.raw:
+            return self.raw["name"]
+        master = self.font.masterForId(self.layerId)
+        return master.name if master else None
+
+    @property
+    def isMasterLayer(self):
+        return self.font.masterForId(self.layerId) is not None
+
+    @property
+    def isSpecialLayer(self):
+        attributes = self.raw.get("attr", {})
+        if "coordinates" in attributes or "axisRules" in attributes:
+            return True
+        name = self.raw.get("name", "")
+        return not self.isMasterLayer and ("{" in name or "[" in name)
+
+    @property
+    def width(self):
+        return self.raw.get("width", 0)
+
+    @width.setter
+    def width(self, value):
+        self.raw["width"] = value
+
+    @property
+    def anchors(self):
+        return [FileAnchor(self.font, raw) for raw in self.raw.get("anchors", ())]
+
+    @property
+    def shapes(self):
+        return FileShapes(self)
+
+    @property
+    def components(self):
+        return [shape for shape in self.shapes if isinstance(shape, FileComponent)]
+
+    @property
+    def paths(self):
+        return [shape for shape in self.shapes if isinstance(shape, FilePath)]
+
+    def bounds(self, depth=0):
+        masterId = self.associatedMasterId
+        return unionBounds(
+            shape.bounds(masterId, depth) if isinstance(shape, FileComponent) else shape.bounds()
+            for shape in self.shapes
+        )
+
+    def _componentPaths(self, component, depth=0):
+        """Outlines of a component in this layer's master, nested components included."""
+        glyph = self.font.glyphs[component.componentName]
+        layer = glyph.layers[self.associatedMasterId] if glyph else None
+        if layer is None or depth > 10:
+            return []
+        paths = []
+        for shape in layer.shapes:
+            if isinstance(shape, FileComponent):
+                paths.extend(path.transformed(component.transform) for path in layer._componentPaths(shape, depth + 1))
+            else:
+                paths.append(shape.transformed(component.transform))
+        return paths
+
+    def decomposeComponents(self):
+        """Like in Glyphs: replaces every component with its outlines."""
+        for component in self.components:
+            paths = self._componentPaths(component)
+            self.shapes.remove(component)
+            for path in paths:
+                self.shapes.append(path)
+
+    @property
+    def LSB(self):
+        bounds = self.bounds()
+        return bounds.xMin if bounds else 0
+
+    @LSB.setter
+    def LSB(self, value):
+        """Like in Glyphs: shifts outlines, components and anchors, keeps the RSB."""
+        bounds = self.bounds()
+        if not bounds:
+            return
+        dx = value - bounds.xMin
+        if not dx:
+            return
+        for shape in self.shapes:
+            if isinstance(shape, FileComponent):
+                x, y = shape.position
+                shape.position = (x + dx, y)
+            else:
+                shape.shift(dx)
+        for anchor in self.anchors:
+            x, y = anchor.position
+            anchor.position = (x + dx, y)
+        self.width = self.width + dx
+
+    @property
+    def RSB(self):
+        bounds = self.bounds()
+        return self.width - bounds.xMax if bounds else 0
+
+    @RSB.setter
+    def RSB(self, value):
+        bounds = self.bounds()
+        if bounds:
+            self.width = bounds.xMax + value
+
+
+class FileLayers(object):
+    """glyph.layers: index by position or by layer/master id (None if missing)."""
+
+    def __init__(self, glyph):
+        self.glyph = glyph
+        self._layers = [FileLayer(glyph.font, glyph, raw) for raw in glyph.raw.get("layers", ())]
+        self._byId = {layer.layerId: layer for layer in self._layers}
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._layers[key]
+        return self._byId.get(key)
+
+    def __iter__(self):
+        return iter(self._layers)
+
+    def __len__(self):
+        return len(self._layers)
+
+
+class FileGlyph(object):
+    __slots__ = ("font", "raw", "_layers")
+
+    def __init__(self, font, raw):
+        self.font = font
+        self.raw = raw
+        self._layers = None
+
+    @property
+    def name(self):
+        return str(self.raw.get("glyphname"))
+
+    @property
+    def id(self):
+        # kerning in .glyphs files is keyed by glyph name
+        return self.name
+
+    @property
+    def leftKerningGroup(self):
+        return self.raw.get("kernLeft", self.raw.get("leftKerningGroup"))
+
+    @leftKerningGroup.setter
+    def leftKerningGroup(self, value):
+        self._setKey("kernLeft" if self.font.formatVersion >= 3 else "leftKerningGroup", value)
+
+    @property
+    def rightKerningGroup(self):
+        return self.raw.get("kernRight", self.raw.get("rightKerningGroup"))
+
+    @rightKerningGroup.setter
+    def rightKerningGroup(self, value):
+        self._setKey("kernRight" if self.font.formatVersion >= 3 else "rightKerningGroup", value)
+
+    def _setKey(self, key, value):
+        if value:
+            self.raw[key] = value
+        else:
+            self.raw.pop(key, None)
+
+    @property
+    def category(self):
+        """Stored category; without Glyphs' glyph data, glyphs with _anchors count as marks."""
+        if "category" in self.raw:
+            return self.raw["category"]
+        layers = self.layers
+        if len(layers) and any(anchor.name.startswith("_") for anchor in layers[0].anchors):
+            return "Mark"
+        return None
+
+    @property
+    def unicodes(self):
+        value = self.raw.get("unicode")
+        if value is None:
+            return []
+        if self.font.formatVersion >= 3:
+            values = value if isinstance(value, list) else [value]
+            return [f"{int(v):04X}" for v in values]
+        return [str(v).zfill(4) for v in str(value).split(",")]
+
+    @property
+    def unicode(self):
+        unicodes = self.unicodes
+        return unicodes[0] if unicodes else None
+
+    @property
+    def lastChange(self):
+        return self.raw.get("lastChange")
+
+    @property
+    def layers(self):
+        if self._layers is None:
+            self._layers = FileLayers(self)
+        return self._layers
+
+    def beginUndo(self):
+        pass
+
+    def endUndo(self):
+        pass
+
+
+class FileGlyphs(object):
+    """font.glyphs: index by name or position (None if missing), iterate in file order."""
+
+    def __init__(self, font):
+        self._glyphs = [FileGlyph(font, raw) for raw in font.raw.get("glyphs", ())]
+        self._byName = {glyph.name: glyph for glyph in self._glyphs}
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._glyphs[key]
+        return self._byName.get(key)
+
+    def __iter__(self):
+        return iter(self._glyphs)
+
+    def __len__(self):
+        return len(self._glyphs)
+
+
+class KerningTable(dict):
+    """font.kerning: masters without kerning get an empty dict on first access."""
+
+    def __missing__(self, masterId):
+        self[masterId] = {}
+        return self[masterId]
+
+
+class GlyphsFileFont(object):
+    """
+    A .glyphs file parsed without Glyphs; save() writes it back.
+
+    With sections/skipKeys/glyphKeys/layers only part of the file is built
+    (see glyphsPlist.streamSections): layers "masters" keeps master layers,
+    "first" only the first master's. Saving a partly loaded font replaces
+    just the sections that changed since loading (glyphs only if
+    unfiltered); the rest of the file keeps its bytes.
+    """
+
+    def __init__(self, path=None, raw=None, sections=None, skipKeys=(), glyphKeys=None, layers="all"):
+        self.filepath = path
+        self.glyphsFiltered = bool(skipKeys) or glyphKeys is not None or layers != "all"
+        self.partial = sections is not None or self.glyphsFiltered
+        if raw is None:
+            raw = self._load(path, sections, skipKeys, glyphKeys, layers) if self.partial else glyphsPlist.load(path)
+        self.raw = raw
+        self.formatVersion = int(self.raw.get(".formatVersion", 2))
+        self.masters = [FileMaster(self, raw) for raw in self.raw.get("fontMaster", ())]
+        self._mastersById = {master.id: master for master in self.masters}
+        self.glyphs = FileGlyphs(self)
+        kerningKey = "kerningLTR" if self.formatVersion >= 3 else "kerning"
+        self.kerning = None  # kerning section not loaded
+        if sections is None or kerningKey in sections:
+            self.raw[kerningKey] = self.kerning = KerningTable(self.raw.get(kerningKey, {}))
+        # what each section looked like when loaded, so save() only writes changed ones
+        self._sectionHashes = {key: self._sectionHash(value) for key, value in self.raw.items()} if self.partial else {}
+
+    @staticmethod
+    def _sectionHash(value):
+        return hashlib.md5(glyphsPlist.dumps(value).encode("utf-8")).digest()
+
+    @staticmethod
+    def _load(path, sections, skipKeys, glyphKeys, layers):
+        masterIds = []
+        if layers == "first":
+            layerFilter = lambda layer: layer.get("layerId") in masterIds[:1]
+        elif layers == "masters":
+            layerFilter = lambda layer: layer.get("layerId") in masterIds
+        else:
+            layerFilter = None
+        raw = {}
+        for key, value in glyphsPlist.streamSections(path, sections, skipKeys, glyphKeys, layerFilter):
+            if key == "glyphs":
+                raw.setdefault(key, []).append(value)
+                continue
+            if key == "fontMaster":
+                # fontMaster comes before glyphs, so the filter sees the ids in time
+                masterIds.extend(master.get("id") for master in value)
+            raw[key] = value
+        return raw
+
+    @property
+    def familyName(self):
+        return self.raw.get("familyName")
+
+    @property
+    def upm(self):
+        return self.raw.get("unitsPerEm", 1000)
+
+    @property
+    def userData(self):
+        return self.raw.setdefault("userData", {})
+
+    def masterForId(self, masterId):
+        return self._mastersById.get(masterId)
+
+    def glyphForId_(self, glyphId):
+        return self.glyphs[glyphId]
+
+    def kerningForPair(self, masterId, leftKey, rightKey):
+        return self.kerning[masterId].get(leftKey, {}).get(rightKey)
+
+    def setKerningForPair(self, masterId, leftKey, rightKey, value):
+        self.kerning[masterId].setdefault(leftKey, {})[rightKey] = value
+
+    def removeKerningForPair(self, masterId, leftKey, rightKey):
+        rightDict = self.kerning[masterId].get(leftKey)
+        if rightDict and rightKey in rightDict:
+            del rightDict[rightKey]
+            if not rightDict:
+                del self.kerning[masterId][leftKey]
+
+    def disableUpdateInterface(self):
+        pass
+
+    def enableUpdateInterface(self):
+        pass
+
+    def save(self, path=None):
+        path = path or self.filepath
+        if self.kerning is not None:
+            for masterId in [masterId for masterId, pairs in self.kerning.items() if not pairs]:
+                del self.kerning[masterId]
+        if self.partial:
+            sections = {
+                key: value for key, value in self.raw.items()
+                if key != ".formatVersion" and self._sectionHashes.get(key) != self._sectionHash(value)
+            }
+            if self.glyphsFiltered:
+                sections.pop("glyphs", None)
+            glyphsPlist.replaceSections(self.filepath, sections, path)
+            self._sectionHashes.update((key, self._sectionHash(value)) for key, value in sections.items())
+        else:
+            glyphsPlist.dump(self.raw, path)
+        self.filepath = path
+        return path
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Run the kerning, anchor, component and sidebearing tools over .glyphs files
+without Glyphs (no MenuTitle). Paths can be files or folders (searched
+recursively). Nothing is saved unless --write is given.
+
+    python3 glyphsBatch.py lost-anchors [--all-masters] [--all-layers] PATH…
+    python3 glyphsBatch.py adjust-kerning --glyphs "A V" --value -5 [--all-masters] PATH…
+    python3 glyphsBatch.py copy-kerning-groups --pair A=AE --pair O=OE PATH…
+    python3 glyphsBatch.py audit-kerning [--prune] PATH…
+    python3 glyphsBatch.py kerning-consistency [--fill zero|interpolate] [--axis 0] PATH…
+    python3 glyphsBatch.py auto-kerning-groups [--tolerance 10] [--all-masters] [--overwrite] PATH…
+    python3 glyphsBatch.py copy-components [--glyphs "Aacute …"] [--source-master Regular]
+                           [--policy skip|replace|merge] [--placement copy|anchors] PATH…
+    python3 glyphsBatch.py component-dependents --glyphs "A acutecomb" [--action reanchor|decompose|copy]
+                           [--source-master Regular] [--policy …] [--placement …] PATH…
+    python3 glyphsBatch.py copy-sidebearings --source Source.glyphs [--all-masters]
+                           [--match name|axes] [--scale absolute|upm|xheight]
+                           [--rounding round|none|floor|ceil] [--report csv|json] PATH…
+"""
+
+import argparse
+import sys
+import traceback
+
+from anchorCore import AnchorLayerCache, findUnusedAnchorsInFont
+from componentCore import POLICIES, ComponentGraph, copyComponents, decomposeComponents, reanchorComponents
+from fontAccess import iterFontPaths, openFont
+from glyphsPlist import OUTLINE_KEYS
+from profileCore import ProfileCache, applyGroups, collectProfiles, proposeGroups
+from kerningCore import (GlyphIdCache, KerningGroupSets, KerningIndex, KerningMatrix, applyKerningPlan, auditKerning, kerningReportPath,
+                         kerningKeysForGlyph, planKerningGroupCopies, pruneKerning, writeKerningAudit)
+from sidebearingCore import (ROUNDING, applyMetrics, extractMetrics, matchMasters, metricsDeltas,
+                             reportPathForFont, scaleFactors, transformMetrics, writeMetricsReport)
+
+
+def lostAnchors(font, args):
+    """Report unused anchors (see Find lost Anchors). Never changes the font."""
+    cache = AnchorLayerCache.forFont(font)
+    rows = findUnusedAnchorsInFont(font, allMasters=args.all_masters, allLayers=args.all_layers, cache=cache)
+    if cache:
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"⚠️ Could not write anchor cache: {e}")
+    for master, layerName, glyphName, layerId, unusedAnchors in rows:
+        print(f"  {glyphName} [{master.name}{' ' + layerName if layerName else ''}]: {', '.join(unusedAnchors)}")
+    print(f"  {len(rows)} layers with unused anchors.")
+    return False
+
+
+def adjustKerning(font, args):
+    """Adjust every pair of the given glyphs' groups (see AOCK)."""
+    glyphIds = GlyphIdCache(font)
+    allKeys = set()
+    for glyphName in args.glyphs.replace(",", " ").split():
+        glyph = font.glyphs[glyphName]
+        if not glyph:
+            print(f"  ⚠️ Glyph '{glyphName}' not found.")
+            continue
+        allKeys.update(kerningKeysForGlyph(glyph))
+        allKeys.update(glyphIds.exceptionKeys(glyphName))
+
+    masters = font.masters if args.all_masters else [font.masters[0]]
+    totalCount = 0
+    for master in masters:
+        count = KerningIndex(font.kerning.get(master.id) or {}).adjust(allKeys, args.value)
+        print(f"  {master.name}: Adjusted {count} unique pairs by {args.value:g}.")
+        totalCount += count
+    return totalCount > 0
+
+
+def copyKerningGroups(font, args):
+    """Copy kerning from group to group in all masters (see Copy Kerning Group to)."""
+    pairs = []
+    for item in args.pair:
+        base, _, target = [part.strip() for part in item.partition("=")]
+        if base and target:
+            pairs.append((base, target))
+
+    glyphIds = GlyphIdCache(font)
+    plans = [(master, planKerningGroupCopies(font.kerning[master.id], pairs, glyphIds.resolveKey)) for master in font.masters]
+    totalCount = 0
+    for master, plan in plans:
+        count = applyKerningPlan(font.kerning[master.id], plan)
+        print(f"  {master.name}: Copied {count} kerning pairs.")
+        totalCount += count
+    return totalCount > 0
+
+
+def auditKerningJob(font, args):
+    """Report (and with --prune remove) kerning pairs that change nothing (see Kerning Audit)."""
+    glyphIds = GlyphIdCache(font)
+    groups = KerningGroupSets(font)
+    findingsPerMaster = []
+    totalPairs = 0
+    for master in font.masters:
+        kerningDict = font.kerning[master.id]
+        findings = auditKerning(kerningDict, groups, glyphIds.resolveKey)
+        findingsPerMaster.append((master, findings))
+        totalPairs += sum(len(rightDict) for rightDict in kerningDict.values())
+        print(f"  {master.name}: {len(findings)} pairs can go.")
+    reportPath = writeKerningAudit(kerningReportPath(font, "kerningaudit"), findingsPerMaster, glyphIds.resolveKey)
+    totalFindings = sum(len(findings) for master, findings in findingsPerMaster)
+    print(f"  {totalFindings} of {totalPairs} pairs can go. Report: {reportPath}")
+    if not args.prune or not totalFindings:
+        return False
+    removed = pruneKerning(font, findingsPerMaster, glyphIds.resolveKey)
+    print(f"  Pruned {removed} pairs, {totalPairs - removed} left.")
+    return True
+
+
+def kerningConsistency(font, args):
+    """Report pairs missing or sign-flipped across masters, optionally fill the gaps (see Kerning Consistency)."""
+    matrix = KerningMatrix.fromFont(font)
+    missing = matrix.missing()
+    flips = matrix.signFlips()
+    reportPath = matrix.writeReport(kerningReportPath(font, "kerningmatrix"), missing, flips)
+    print(f"  {matrix.pairCount()} pairs: {len(missing)} missing in some masters, {len(flips)} sign flips. Report: {reportPath}")
+    if not args.fill or not missing:
+        return False
+    count = matrix.applyFills(font, matrix.fillValues(missing, args.fill, args.axis))
+    print(f"  Added {count} missing pairs ({args.fill}).")
+    return True
+
+
+def autoKerningGroups(font, args):
+    """Propose kerning groups from side profiles (see Auto Kerning Groups); --write sets them."""
+    masters = font.masters if args.all_masters else font.masters[:1]
+    cache = ProfileCache.forFont(font)
+    profiles, bases = collectProfiles(font, font.glyphs, masters, cache)
+    cache.save()
+    proposals = proposeGroups(font, profiles, bases, args.tolerance, keepExisting=not args.overwrite)
+    for glyphName, side, oldGroup, newGroup in proposals:
+        print(f"  {glyphName} {side}: {oldGroup or '–'} → {newGroup}")
+    print(f"  {cache.misses} profiles sampled, {cache.hits} cached; {len(proposals)} groups proposed.")
+    if not proposals:
+        return False
+    applyGroups(font, proposals)
+    return True
+
+
+def copyComponentsJob(font, args):
+    """Copy components from one master into all others (see Copy components in all Masters)."""
+    sourceMaster = font.masters[0]
+    if args.source_master:
+        sourceMaster = next((master for master in font.masters if master.name == args.source_master), None)
+        if sourceMaster is None:
+            print(f"  ⚠️ Master '{args.source_master}' not found.")
+            return False
+
+    if args.glyphs:
+        glyphs = [font.glyphs[name] for name in args.glyphs.replace(",", " ").split() if font.glyphs[name]]
+    else:
+        glyphs = [g for g in font.glyphs if g.layers[sourceMaster.id] is not None and g.layers[sourceMaster.id].components]
+
+    report, unchanged = copyComponents(font, glyphs, sourceMaster, args.policy, args.placement)
+    for line in report:
+        print(f"  {line}")
+    if unchanged:
+        print(f"  ℹ️  {unchanged} layers already identical, left unchanged.")
+    return any(line.startswith("✅") for line in report)
+
+
+def componentDependents(font, args):
+    """List (and with --action update) every composite built from --glyphs, bases first (see Component Dependencies)."""
+    graph = ComponentGraph.forFont(font)
+    glyphNames = [name for name in args.glyphs.replace(",", " ").split() if font.glyphs[name]]
+    stale = graph.stale(glyphNames)
+    print(f"  {graph.updated} glyphs read into the component graph; {len(stale)} dependents: {' '.join(stale)}")
+    glyphs = [font.glyphs[name] for name in stale]
+    report = []
+    if args.action == "reanchor":
+        report, unchanged = reanchorComponents(font, glyphs, font.masters, graph=graph)
+    elif args.action == "decompose":
+        report = decomposeComponents(font, glyphs, font.masters, graph=graph)
+    elif args.action == "copy":
+        sourceMaster = next((master for master in font.masters if master.name == args.source_master), font.masters[0])
+        report, unchanged = copyComponents(font, glyphs, sourceMaster, args.policy, args.placement, graph=graph)
+    graph.save()
+    for line in report:
+        print(f"  {line}")
+    return any(line.startswith("✅") for line in report)
+
+
+def copySidebearings(font, args):
+    """Copy sidebearings from --source into the font (see Copy Sidebearings)."""
+    sourceFont = args.sourceFont
+    if args.all_masters:
+        masterPairs = matchMasters(sourceFont.masters, font.masters, by=args.match)
+        if not masterPairs:
+            print(f"  ⚠️ No matching masters found (matched by {args.match}).")
+            return False
+    else:
+        masterPairs = [(sourceFont.masters[0], font.masters[0])]
+
+    sourceNames = {glyph.name for glyph in sourceFont.glyphs}
+    destinationNames = {glyph.name for glyph in font.glyphs}
+    if args.glyphs:
+        scopeNames = [name for name in args.glyphs.replace(",", " ").split() if name in sourceNames]
+    else:
+        scopeNames = [glyph.name for glyph in sourceFont.glyphs]
+    glyphNames = [name for name in scopeNames if name in destinationNames]
+    notInDestination = set(scopeNames) - destinationNames
+    notInSource = set() if args.glyphs else destinationNames - sourceNames
+
+    table = extractMetrics(sourceFont, glyphNames, [source.id for source, destination in masterPairs])
+    if args.scale != "absolute":
+        factors = scaleFactors(masterPairs, args.scale, sourceFont, font)
+        table = transformMetrics(table, factors, rounding=args.rounding)
+    before = extractMetrics(font, glyphNames, [destination.id for source, destination in masterPairs])
+
+    written = None
+    if args.write:
+        written, errors = applyMetrics(font, table, [destination.id for source, destination in masterPairs])
+        for glyphName, e in errors:
+            print(f"  Error copying {glyphName}: {e}")
+    deltas = metricsDeltas(table, before, masterPairs, written, status="copied" if args.write else "planned")
+    reportPath = writeMetricsReport(reportPathForFont(font, args.report), deltas, notInDestination, notInSource)
+    changed = sum(1 for row in deltas if row["status"] != "empty" and row["deltaWidth"])
+    print(f"  {changed} of {len(deltas)} glyph layers change their advance width. Report: {reportPath}")
+    return bool(written)
+
+
+JOBS = {
+    "lost-anchors": lostAnchors,
+    "adjust-kerning": adjustKerning,
+    "copy-kerning-groups": copyKerningGroups,
+    "audit-kerning": auditKerningJob,
+    "kerning-consistency": kerningConsistency,
+    "auto-kerning-groups": autoKerningGroups,
+    "copy-components": copyComponentsJob,
+    "component-dependents": componentDependents,
+    "copy-sidebearings": copySidebearings,
+}
+
+
+KERNING_SECTIONS = {"fontMaster", "kerningLTR", "kerning"}
+GROUP_KEYS = {"kernLeft", "kernRight", "leftKerningGroup", "rightKerningGroup"}
+
+
+def loadOptions(args):
+    """
+    What a job needs from the file, so large sources are never fully built.
+    Kerning jobs save by replacing the kerning section in place; component
+    and sidebearing jobs need the outlines and load everything.
+    """
+    if args.job == "lost-anchors":
+        layers = "all" if args.all_layers else "masters" if args.all_masters else "first"
+        return {"sections": {"fontMaster", "glyphs"}, "skipKeys": OUTLINE_KEYS, "layers": layers}
+    if args.job in ("adjust-kerning", "audit-kerning"):
+        return {"sections": KERNING_SECTIONS | {"glyphs"}, "glyphKeys": GROUP_KEYS}
+    if args.job in ("copy-kerning-groups", "kerning-consistency"):
+        return {"sections": KERNING_SECTIONS}
+    return {}
+
+
+def argumentParser():
+    parser = argparse.ArgumentParser(description="Batch jobs for .glyphs files.", usage=__doc__)
+    jobs = parser.add_subparsers(dest="job", required=True)
+
+    def addJob(name):
+        job = jobs.add_parser(name)
+        job.add_argument("paths", nargs="+", metavar="PATH", help=".glyphs files or folders")
+        job.add_argument("--write", action="store_true", help="save the changed fonts in place")
+        return job
+
+    job = addJob("lost-anchors")
+    job.add_argument("--all-masters", action="store_true")
+    job.add_argument("--all-layers", action="store_true")
+
+    job = addJob("adjust-kerning")
+    job.add_argument("--glyphs", required=True)
+    job.add_argument("--value", type=float, required=True)
+    job.add_argument("--all-masters", action="store_true")
+
+    job = addJob("copy-kerning-groups")
+    job.add_argument("--pair", action="append", required=True, help="base=target, e.g. A=AE (repeatable)")
+
+    job = addJob("audit-kerning")
+    job.add_argument("--prune", action="store_true", help="remove what the audit finds (save with --write)")
+
+    job = addJob("kerning-consistency")
+    job.add_argument("--fill", choices=("zero", "interpolate"), help="add the missing pairs (save with --write)")
+    job.add_argument("--axis", type=int, default=0, help="axis to interpolate along")
+
+    job = addJob("auto-kerning-groups")
+    job.add_argument("--tolerance", type=float, default=10, help="largest profile difference within a group, in units")
+    job.add_argument("--all-masters", action="store_true")
+    job.add_argument("--overwrite", action="store_true", help="also change groups that are already set")
+
+    job = addJob("copy-components")
+    job.add_argument("--glyphs", help="default: every glyph with components in the source master")
+    job.add_argument("--source-master", help="master name (default: first master)")
+    job.add_argument("--policy", choices=POLICIES, default="skip")
+    job.add_argument("--placement", choices=("copy", "anchors"), default="copy")
+
+    job = addJob("component-dependents")
+    job.add_argument("--glyphs", required=True, help="base glyphs, e.g. \"A acutecomb\"")
+    job.add_argument("--action", choices=("reanchor", "decompose", "copy"), help="update the dependents (save with --write)")
+    job.add_argument("--source-master", help="master to copy from with --action copy (default: first master)")
+    job.add_argument("--policy", choices=POLICIES, default="skip")
+    job.add_argument("--placement", choices=("copy", "anchors"), default="copy")
+
+    job = addJob("copy-sidebearings")
+    job.add_argument("--source", required=True, help="font to copy the sidebearings from")
+    job.add_argument("--glyphs", help="default: all glyphs")
+    job.add_argument("--all-masters", action="store_true")
+    job.add_argument("--match", choices=("name", "axes"), default="name")
+    job.add_argument("--scale", choices=("absolute", "upm", "xheight"), default="absolute")
+    job.add_argument("--rounding", choices=sorted(ROUNDING), default="round")
+    job.add_argument("--report", choices=("csv", "json"), default="csv")
+    return parser
+
+
+def main(argv=None):
+    args = argumentParser().parse_args(argv)
+    if args.job == "copy-sidebearings":
+        args.sourceFont = openFont(args.source)
+
+    job = JOBS[args.job]
+    fontCount = 0
+    failed = []
+    for path in iterFontPaths(args.paths):
+        print(f"🔹 {path}")
+        fontCount += 1
+        try:
+            font = openFont(path, **loadOptions(args))
+            changed = job(font, args)
+            if changed and args.write:
+                font.save()
+                print("  💾 Saved.")
+        except Exception as e:
+            print(f"  ❌ {e}")
+            print(traceback.format_exc(), file=sys.stderr)
+            failed.append(path)
+    if not fontCount:
+        print("No .glyphs files found.")
+        return 1
+    if failed:
+        print(f"❌ {len(failed)} of {fontCount} files failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
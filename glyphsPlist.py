@@ -0,0 +1,489 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Reader and writer for the old-style (OpenStep) property lists used by
+.glyphs files, Glyphs 2 and 3 (no UI, no MenuTitle, no Glyphs needed).
+Dicts come back as dicts, arrays as lists, numbers as int/float and
+everything else as str. Numbers with leading zeros (e.g. Glyphs 2
+unicodes like 0061) stay strings so they survive a round trip.
+
+Files are memory-mapped and parsed in place. streamSections only builds
+the top-level sections that were asked for, hands out glyphs one at a
+time and jumps over skipped values (outlines, backgrounds…) without
+materialising them, so memory stays flat however large the file is.
+Run this file directly for a benchmark on a synthetic font:
+
+    python3 glyphsPlist.py [glyphCount]
+"""
+
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+TOKEN_PATTERN = re.compile(rb"""
+    (?:\s+|//[^\n]*|/\*.*?\*/)*      # whitespace and comments
+    (?:
+        (?P<punct>[{}()=;,])
+      | "(?P<quoted>(?:[^"\\]|\\.)*)"
+      | (?P<data><[0-9A-Fa-f\s]*>)
+      | (?P<bare>[^\s{}()=;,"]+)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+
+def _skipPattern(possessive):
+    """
+    Everything up to the next bracket that changes the depth. Quoted
+    strings and groups nested up to eight levels deep (a whole glyph with
+    its layers and outlines) are consumed inside a single match.
+    Possessive quantifiers (Python 3.11+) keep the regex engine from
+    recording backtracking state, so skipping costs no memory.
+    """
+    plus = b"+" if possessive else b""
+    flat = rb'[^{}()"]+' + plus + rb'|"(?:[^"\\]|\\.)*' + plus + b'"'
+    group = rb'[({](?:' + flat + rb')*' + plus + rb'[)}]'
+    for _ in range(7):
+        group = rb'[({](?:' + flat + rb'|' + group + rb')*' + plus + rb'[)}]'
+    return re.compile(rb'(?:' + flat + rb'|' + group + rb')*' + plus + rb'([{}()])', re.DOTALL)
+
+
+try:
+    SKIP_PATTERN = _skipPattern(possessive=True)
+except re.error:
+    SKIP_PATTERN = _skipPattern(possessive=False)
+
+# an array of unquoted scalars only, e.g. a node (12,34,l) or pos = (100,0)
+FLAT_ARRAY_PATTERN = re.compile(rb'\s*\(([^{}()"/<]*)\)')
+
+# the ids of a layer (nothing nested inside a layer uses these keys)
+LAYER_ID_PATTERN = re.compile(rb'\b(layerId|associatedMasterId) = "?([^";\s]+)"?;')
+
+NUMBER_PATTERN = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?$")
+BARE_PATTERN = re.compile(r"[A-Za-z0-9._/]+$")
+ESCAPE_PATTERN = re.compile(r"\\(U[0-9A-Fa-f]{4}|u[0-9A-Fa-f]{4}|[0-7]{3}|.)", re.DOTALL)
+PUNCTUATION = {bytes([c]): chr(c) for c in b"{}()=;,"}
+ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\", "b": "\b", "f": "\f", "a": "\a", "v": "\v"}
+
+# Arrays Glyphs writes on one line; everything else gets one item per line
+NODE_ITEM = object()  # a Glyphs 3 node, (x,y,type) inside "nodes"
+INLINE_ARRAY_KEYS = frozenset({"pos", "scale", "color", "origin", "target", "place", NODE_ITEM})
+
+# Layer content nobody needs for kerning, anchor or component checks
+OUTLINE_KEYS = frozenset({
+    "nodes", "paths", "hints", "background", "backgroundImage",
+    "guides", "guideLines", "annotations",
+})
+
+
+class Data(str):
+    """Hex data (<0a1b...>) kept verbatim."""
+
+
+class PlistError(ValueError):
+    pass
+
+
+def _unescape(match):
+    code = match.group(1)
+    if code[0] in "Uu" and len(code) == 5:
+        return chr(int(code[1:], 16))
+    if len(code) == 3 and code.isdigit():
+        return chr(int(code, 8))
+    return ESCAPES.get(code, code)
+
+
+def bareValue(text):
+    """Unquoted token → int, float or str."""
+    if NUMBER_PATTERN.match(text):
+        if "." in text or "e" in text or "E" in text:
+            return float(text)
+        return int(text)
+    return text
+
+
+class Parser(object):
+    """
+    Recursive-descent parser working directly on a bytes-like buffer
+    (bytes or mmap). Values under a key in skipKeys are jumped over.
+    """
+
+    def __init__(self, buffer, skipKeys=()):
+        self.buffer = buffer
+        self.pos = 0
+        self.skipKeys = frozenset(skipKeys)
+
+    def next(self):
+        """Return (kind, value): kind is a punctuation char, 'str' or 'data'."""
+        match = TOKEN_PATTERN.match(self.buffer, self.pos)
+        if match is None:
+            raise PlistError(f"Unexpected end of file at offset {self.pos}")
+        self.pos = match.end()
+        group = match.lastgroup
+        token = match.group(group)
+        if group == "punct":
+            return PUNCTUATION[token], None
+        if group == "bare":
+            return "str", bareValue(token.decode("utf-8"))
+        if group == "quoted":
+            text = token.decode("utf-8")
+            return "str", ESCAPE_PATTERN.sub(_unescape, text) if "\\" in text else text
+        return "data", Data(token.decode("ascii"))
+
+    def peekKind(self):
+        pos = self.pos
+        kind, _ = self.next()
+        self.pos = pos
+        return kind
+
+    def expect(self, expected):
+        kind, _ = self.next()
+        if kind != expected:
+            raise PlistError(f"Expected {expected!r}, found {kind!r} at offset {self.pos}")
+
+    def value(self):
+        flat = FLAT_ARRAY_PATTERN.match(self.buffer, self.pos)
+        if flat is not None:
+            # (12,34,l) and friends in one step
+            self.pos = flat.end()
+            content = "".join(flat.group(1).decode("utf-8").split())
+            return [bareValue(item) for item in content.split(",") if item] if content else []
+        kind, value = self.next()
+        if kind == "{":
+            return self.dict()
+        if kind == "(":
+            return self.array()
+        if kind in ("str", "data"):
+            return value
+        raise PlistError(f"Unexpected {kind!r} at offset {self.pos}")
+
+    def skipValue(self):
+        """Move past the next value without building it."""
+        kind, _ = self.next()
+        if kind not in ("{", "("):
+            return
+        depth = 1
+        while depth:
+            match = SKIP_PATTERN.match(self.buffer, self.pos)
+            if match is None:
+                raise PlistError(f"Unexpected end of file at offset {self.pos}")
+            self.pos = match.end()
+            depth += 1 if match.group(1) in (b"{", b"(") else -1
+
+    def entries(self):
+        """Iterate the keys of a dict whose '{' was just read; the caller reads or skips each value."""
+        while True:
+            kind, key = self.next()
+            if kind == "}":
+                return
+            if kind != "str":
+                raise PlistError(f"Expected key at offset {self.pos}")
+            self.expect("=")
+            yield str(key)
+            kind, _ = self.next()
+            if kind == "}":
+                return
+            if kind != ";":
+                raise PlistError(f"Expected ';' at offset {self.pos}")
+
+    def dict(self, keys=None):
+        """Parse a dict after its '{'; keys limits which entries are built."""
+        result = {}
+        for key in self.entries():
+            if key in self.skipKeys or (keys is not None and key not in keys):
+                self.skipValue()
+            else:
+                result[key] = self.value()
+        return result
+
+    def items(self):
+        """Iterate the items of an array whose '(' was just read; the caller reads each value."""
+        if self.peekKind() == ")":
+            self.next()
+            return
+        while True:
+            yield
+            kind, _ = self.next()
+            if kind == ")":
+                return
+            if kind != ",":
+                raise PlistError(f"Expected ',' at offset {self.pos}")
+            if self.peekKind() == ")":  # trailing comma
+                self.next()
+                return
+
+    def array(self):
+        return [self.value() for _ in self.items()]
+
+
+@contextmanager
+def openBuffer(path):
+    """The file as a read-only memory map (plain bytes where mmap is not possible)."""
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty file, pipes, …
+            yield f.read()
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def _filteredLayers(parser, layerFilter):
+    """Build only the layers layerFilter accepts, judged by their ids."""
+    layers = []
+    parser.expect("(")
+    for _ in parser.items():
+        start = parser.pos
+        parser.skipValue()
+        span = parser.buffer[start:parser.pos]
+        ids = {key.decode("ascii"): value.decode("utf-8") for key, value in LAYER_ID_PATTERN.findall(span)}
+        if layerFilter(ids):
+            layers.append(Parser(span, parser.skipKeys).value())
+    return layers
+
+
+def streamSections(path, sections=None, skipKeys=(), glyphKeys=None, layerFilter=None):
+    """
+    Yield (key, value) for the top-level sections of a .glyphs file in file order.
+
+    sections     top-level keys to build (None = all); .formatVersion always comes along
+    skipKeys     keys skipped at any depth inside glyphs, e.g. OUTLINE_KEYS
+    glyphKeys    keys to build per glyph (glyphname always), None = all
+    layerFilter  callable({"layerId": …, "associatedMasterId": …}) → keep?
+                 decides per layer before it is built; rejected layers are skipped
+
+    "glyphs" is yielded once per glyph, so only one glyph is in memory at a
+    time. Since fontMaster comes before glyphs, a layerFilter can depend on
+    what was yielded earlier (e.g. only the first master's layers).
+    """
+    if sections is not None:
+        sections = set(sections) | {".formatVersion"}
+    if glyphKeys is not None:
+        glyphKeys = set(glyphKeys) | {"glyphname"}
+    with openBuffer(path) as buffer:
+        parser = Parser(buffer)
+        parser.expect("{")
+        for key in parser.entries():
+            if sections is not None and key not in sections:
+                parser.skipValue()
+            elif key == "glyphs":
+                parser.skipKeys = frozenset(skipKeys)
+                parser.expect("(")
+                for _ in parser.items():
+                    parser.expect("{")
+                    glyph = {}
+                    for glyphKey in parser.entries():
+                        if glyphKey in parser.skipKeys or (glyphKeys is not None and glyphKey not in glyphKeys):
+                            parser.skipValue()
+                        elif glyphKey == "layers" and layerFilter is not None:
+                            glyph[glyphKey] = _filteredLayers(parser, layerFilter)
+                        else:
+                            glyph[glyphKey] = parser.value()
+                    yield key, glyph
+                parser.skipKeys = frozenset()
+            else:
+                yield key, parser.value()
+
+
+def loadSections(path, sections=None, skipKeys=(), glyphKeys=None, layerFilter=None):
+    """Like streamSections, collected into one dict (glyphs as a list)."""
+    result = {}
+    for key, value in streamSections(path, sections, skipKeys, glyphKeys, layerFilter):
+        if key == "glyphs":
+            result.setdefault("glyphs", []).append(value)
+        else:
+            result[key] = value
+    if sections is None or "glyphs" in sections:
+        result.setdefault("glyphs", [])
+    return result
+
+
+def sectionSpans(buffer):
+    """{top-level key: (start, end)} byte offsets of each value."""
+    parser = Parser(buffer)
+    parser.expect("{")
+    spans = {}
+    for key in parser.entries():
+        start = parser.pos
+        parser.skipValue()
+        spans[key] = (start, parser.pos)
+    return spans, parser.pos
+
+
+def replaceSections(path, values, outputPath=None):
+    """
+    Write path with the given top-level sections replaced (or added), copying
+    everything else byte for byte from the memory map, so a font loaded with
+    loadSections can be saved without ever building the rest of the file.
+    """
+    outputPath = outputPath or path
+    temporaryPath = outputPath + ".tmp"
+    with openBuffer(path) as buffer:
+        spans, end = sectionSpans(buffer)
+        closing = buffer.rfind(b"}", 0, end)
+        cuts = sorted((spans[key][0], spans[key][1], key) for key in values if key in spans)
+        with open(temporaryPath, "wb") as f:
+            pos = 0
+            for start, stop, key in cuts:
+                f.write(buffer[pos:start])
+                f.write(b" " + dumps(values[key]).rstrip("\n").encode("utf-8"))
+                pos = stop
+            f.write(buffer[pos:closing])
+            for key, value in values.items():
+                if key not in spans:
+                    f.write(f"{_string(key)} = {dumps(value).rstrip()};\n".encode("utf-8"))
+            f.write(buffer[closing:])
+    os.replace(temporaryPath, outputPath)
+    return outputPath
+
+
+def loads(text):
+    return Parser(text.encode("utf-8")).value()
+
+
+def load(path):
+    with openBuffer(path) as buffer:
+        return Parser(buffer).value()
+
+
+def _string(value):
+    if isinstance(value, Data):
+        return str(value)
+    if BARE_PATTERN.match(value) and not NUMBER_PATTERN.match(value):
+        return value
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\012")
+    return f'"{escaped}"'
+
+
+def _number(value):
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+
+def _dump(value, out, key=None):
+    """
+    Write value in Glyphs' own layout: one dict entry and one array item per
+    line, except the coordinate-like tuples Glyphs keeps on one line (pos,
+    scale, … and the nodes of Glyphs 3 paths).
+    """
+    if isinstance(value, dict):
+        out.append("{\n")
+        for itemKey, item in value.items():
+            out.append(_string(str(itemKey)))
+            out.append(" = ")
+            _dump(item, out, itemKey)
+            out.append(";\n")
+        out.append("}")
+    elif isinstance(value, (list, tuple)):
+        if key in INLINE_ARRAY_KEYS:
+            out.append("(")
+            for i, item in enumerate(value):
+                if i:
+                    out.append(",")
+                _dump(item, out)
+            out.append(")")
+        elif not value:
+            out.append("(\n)")
+        else:
+            itemKey = NODE_ITEM if key == "nodes" else None
+            out.append("(\n")
+            for i, item in enumerate(value):
+                if i:
+                    out.append(",\n")
+                _dump(item, out, itemKey)
+            out.append("\n)")
+    elif isinstance(value, bool):
+        out.append("1" if value else "0")
+    elif isinstance(value, (int, float)):
+        out.append(_number(value))
+    else:
+        out.append(_string(str(value)))
+
+
+def dumps(value):
+    out = []
+    _dump(value, out)
+    out.append("\n")
+    return "".join(out)
+
+
+def dump(value, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dumps(value))
+
+
+def writeSyntheticFont(path, glyphCount, masterCount=2, contours=2, nodesPerContour=12):
+    """Glyphs 3 test file with outlines, anchors, components and group kerning."""
+    masterIds = [f"m{i:02}" for i in range(masterCount)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{\n.formatVersion = 3;\nfamilyName = Synthetic;\nunitsPerEm = 1000;\n")
+        f.write("fontMaster = (\n")
+        f.write(",\n".join(f"{{\nid = {masterId};\nname = \"Master {i}\";\n}}" for i, masterId in enumerate(masterIds)))
+        f.write("\n);\nglyphs = (\n")
+        for g in range(glyphCount):
+            layers = []
+            for m, masterId in enumerate(masterIds):
+                nodes = ",\n".join(f"({(g + n * 37) % 600},{(n * 53 + m) % 700},{'o' if n % 3 else 'c'})" for n in range(nodesPerContour))
+                shapes = ",\n".join(f"{{\nclosed = 1;\nnodes = (\n{nodes}\n);\n}}" for _ in range(contours))
+                if g % 10 == 0:
+                    shapes += f",\n{{\nref = g{g - 1};\npos = (10,0);\n}}"
+                layers.append(
+                    f"{{\nanchors = (\n{{\nname = top;\npos = ({g % 500},700);\n}},\n{{\nname = bottom;\npos = ({g % 500},0);\n}}\n);\n"
+                    f"layerId = {masterId};\nshapes = (\n{shapes}\n);\nwidth = 600;\n}}"
+                )
+            f.write(f"{{\nglyphname = g{g};\nkernLeft = k{g % 300};\nkernRight = k{g % 300};\nlastChange = \"2024-01-01 00:00:00 +0000\";\nlayers = (\n" + ",\n".join(layers) + "\n);\n}")
+            f.write(",\n" if g < glyphCount - 1 else "\n")
+        f.write(");\nkerningLTR = {\n")
+        for masterId in masterIds:
+            f.write(f"{masterId} = {{\n")
+            for left in range(300):
+                f.write(f"\"@MMK_L_k{left}\" = {{" + "".join(f"\"@MMK_R_k{right}\" = {-(left + right) % 80};" for right in range(0, 300, 7)) + "};\n")
+            f.write("};\n")
+        f.write("};\n}\n")
+
+
+if __name__ == "__main__":
+    # Benchmark: python3 glyphsPlist.py [glyphCount]
+    import sys
+    import tempfile
+    import time
+    import tracemalloc
+
+    glyphCount = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "Synthetic.glyphs")
+    writeSyntheticFont(path, glyphCount)
+    print(f"Synthetic font: {glyphCount} glyphs, {os.path.getsize(path) / 1e6:.0f} MB")
+
+    def firstMasterAnchors():
+        firstMaster = []
+        for key, value in streamSections(path, {"fontMaster", "glyphs"}, OUTLINE_KEYS, {"layers"},
+                                         layerFilter=lambda layer: layer.get("layerId") == firstMaster[0]):
+            if key == "fontMaster":
+                firstMaster.append(value[0]["id"])
+            elif key == "glyphs":
+                for layer in value["layers"]:
+                    len(layer.get("anchors", ()))
+
+    runs = [
+        ("kerningLTR only", lambda: loadSections(path, {"kerningLTR"})),
+        ("first-master anchors, streamed", firstMasterAnchors),
+        ("groups, no layers", lambda: loadSections(path, {"fontMaster", "glyphs"}, glyphKeys={"kernLeft", "kernRight"})),
+        ("whole file", lambda: load(path)),
+    ]
+    for name, run in runs:
+        start = time.time()
+        run()
+        seconds = time.time() - start
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:32} {seconds:6.2f}s  peak {peak / 1e6:7.1f} MB")
+    os.remove(path)
+    os.rmdir(folder)
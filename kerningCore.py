@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Shared kerning helpers for the kerning scripts (no UI, no MenuTitle).
+Everything here works on plain font.kerning[master.id] dictionaries.
+"""
+
+import csv
+import os
+from array import array
+from collections import Counter, defaultdict
+from itertools import chain, compress, repeat
+
+
+def kerningKeysForGlyph(glyph):
+    """
+    Return the (leftSideKey, rightSideKey) a glyph uses in kerning pairs.
+    On the left side of a pair a glyph kerns with its right group (@MMK_L_),
+    on the right side with its left group (@MMK_R_).
+    """
+    leftSideKey = f"@MMK_L_{glyph.rightKerningGroup or glyph.name}"
+    rightSideKey = f"@MMK_R_{glyph.leftKerningGroup or glyph.name}"
+    return leftSideKey, rightSideKey
+
+
+class GlyphIdCache(object):
+    """
+    Glyph ID ↔ name lookup for one font, built in a single pass over
+    font.glyphs. Glyphs 3 keys kerning exceptions by glyph ID; build one
+    cache per run and resolve every key with a dict lookup.
+    """
+
+    def __init__(self, font):
+        self.nameForId = {}
+        self.idForName = {}
+        for glyph in font.glyphs:
+            self.nameForId[glyph.id] = glyph.name
+            self.idForName[glyph.name] = glyph.id
+
+    def resolveKey(self, key):
+        """Group keys stay as they are, glyph IDs become names; None for unknown glyphs."""
+        if not isinstance(key, str):
+            key = str(key)
+        if key.startswith("@"):
+            return key
+        if key in self.nameForId:
+            return self.nameForId[key]
+        return key if key in self.idForName else None
+
+    def exceptionKeys(self, glyphName):
+        """Keys a glyph's own (exception) pairs can be stored under: its ID and its name."""
+        return {key for key in (self.idForName.get(glyphName), glyphName) if key}
+
+
+class KerningIndex(object):
+    """
+    Inverted index over one master's kerning: key → pairs the key appears in.
+    Build it once per master, then query as many keys as needed.
+    """
+
+    def __init__(self, kerningDict):
+        self.kerning = kerningDict
+        self.pairsByKey = defaultdict(list)
+        for leftKey, rightDict in kerningDict.items():
+            for rightKey in rightDict.keys():
+                pair = (leftKey, rightKey)
+                self.pairsByKey[leftKey].append(pair)
+                if rightKey != leftKey:
+                    self.pairsByKey[rightKey].append(pair)
+
+    def pairsForKeys(self, keys):
+        """Return the set of (leftKey, rightKey) pairs touching any of the keys."""
+        pairs = set()
+        for key in keys:
+            pairs.update(self.pairsByKey.get(key, ()))
+        return pairs
+
+    def adjust(self, keys, adjustment):
+        """
+        Add adjustment to every pair touching any of the keys.
+        Each pair is adjusted exactly once, even if both of its sides match
+        or several keys point to it. Returns the number of adjusted pairs.
+        """
+        pairs = self.pairsForKeys(keys)
+        for leftKey, rightKey in pairs:
+            self.kerning[leftKey][rightKey] += adjustment
+        return len(pairs)
+
+
+def resolvedKerningRows(kerningDict, resolveKey=None):
+    """
+    Walk one master's kerning a row at a time: yield (leftName, rightDict)
+    with glyph-ID keys turned into names by resolveKey (e.g.
+    GlyphIdCache.resolveKey). Keys it cannot resolve are skipped. Without
+    resolveKey the rows are yielded as they are, without copying.
+    """
+    for leftKey, rightDict in kerningDict.items():
+        if resolveKey is None:
+            yield leftKey, rightDict
+            continue
+        leftName = resolveKey(leftKey)
+        if not leftName:
+            continue
+        yield leftName, {rightName: value for rightName, value in zip(map(resolveKey, rightDict), rightDict.values()) if rightName}
+
+
+def planKerningGroupCopies(kerningDict, groupPairs, resolveKey=None):
+    """
+    Work out every pair needed to copy kerning groups in one master.
+    groupPairs is a list of (base, target) group names, e.g. ("A", "AE").
+    Walks the kerning once and returns {(leftKey, rightKey): value}.
+    Values are always taken from the original table, never from other copies.
+    resolveKey turns glyph-ID keys (Glyphs 3 exceptions) into names, e.g.
+    GlyphIdCache.resolveKey; pairs it cannot resolve are skipped.
+    """
+    leftTargets = defaultdict(list)
+    rightTargets = defaultdict(list)
+    for base, target in groupPairs:
+        leftTargets[f"@MMK_L_{base}"].append(f"@MMK_L_{target}")
+        rightTargets[f"@MMK_R_{base}"].append(f"@MMK_R_{target}")
+
+    plan = {}
+    for leftName, rightDict in resolvedKerningRows(kerningDict, resolveKey):
+        # --- LEFT SIDE COPY ---
+        if leftName in leftTargets:
+            for rightName, value in rightDict.items():
+                for leftTarget in leftTargets[leftName]:
+                    plan[(leftTarget, rightName)] = value
+
+        # --- RIGHT SIDE COPY (reverse lookup of the requested right keys) ---
+        for rightSource, targets in rightTargets.items():
+            if rightSource in rightDict:
+                value = rightDict[rightSource]
+                for rightTarget in targets:
+                    plan[(leftName, rightTarget)] = value
+
+    return plan
+
+
+def applyKerningPlan(kerningDict, plan):
+    """Write a plan from planKerningGroupCopies into a plain kerning dict."""
+    for (leftKey, rightKey), value in plan.items():
+        kerningDict.setdefault(leftKey, {})[rightKey] = value
+    return len(plan)
+
+
+AUDIT_ISSUES = ("orphanGroup", "unknownGlyph", "zero", "redundantException")
+AUDIT_FIELDS = ["master", "left", "right", "value", "issue", "fallback"]
+
+
+class KerningGroupSets(object):
+    """
+    Kerning group membership of a font, read once: glyph name → group per
+    side, and the sets of groups that exist on the left (@MMK_L_, from
+    right groups) and right (@MMK_R_, from left groups) side of a pair.
+    """
+
+    def __init__(self, font):
+        self.glyphNames = set()
+        self.leftGroupOf = {}
+        self.rightGroupOf = {}
+        for glyph in font.glyphs:
+            self.glyphNames.add(glyph.name)
+            if glyph.leftKerningGroup:
+                self.leftGroupOf[glyph.name] = glyph.leftKerningGroup
+            if glyph.rightKerningGroup:
+                self.rightGroupOf[glyph.name] = glyph.rightKerningGroup
+        self.leftSideKeys = {f"@MMK_L_{group}" for group in self.rightGroupOf.values()}
+        self.rightSideKeys = {f"@MMK_R_{group}" for group in self.leftGroupOf.values()}
+
+
+def auditKerning(kerningDict, groups, resolveKey=None):
+    """
+    Find kerning pairs that can go without changing the kerning.
+    Returns [(leftKey, rightKey, value, issue, fallback)], issue one of:
+
+    orphanGroup         a side is a group no glyph belongs to
+    unknownGlyph        a side is a glyph ID/name that is not in the font
+    zero                value 0 and nothing less specific to override
+    redundantException  glyph exception equal to the pair it overrides
+
+    The table is walked once, sorting pairs by specificity. Exceptions are
+    then compared against what would apply once the less specific junk is
+    gone (glyph–glyph falls back to glyph–group, group–glyph, group–group),
+    so every finding can be pruned together.
+    """
+    findings = []
+    levels = ([], [], [])  # group–group, glyph–group / group–glyph, glyph–glyph
+    sideGroup = {}  # glyph key → (its group key on the left side, on the right side)
+
+    def groupKeys(key):
+        """(left side group key, right side group key) of a glyph key, None for unknown glyphs."""
+        if key not in sideGroup:
+            name = resolveKey(key) if resolveKey else key
+            if name not in groups.glyphNames:
+                sideGroup[key] = None
+            else:
+                rightGroup = groups.rightGroupOf.get(name)
+                leftGroup = groups.leftGroupOf.get(name)
+                sideGroup[key] = (f"@MMK_L_{rightGroup}" if rightGroup else None, f"@MMK_R_{leftGroup}" if leftGroup else None)
+        return sideGroup[key]
+
+    for leftKey, rightDict in kerningDict.items():
+        leftIsGroup = leftKey.startswith("@MMK_L_")
+        if leftIsGroup:
+            leftIssue = None if leftKey in groups.leftSideKeys else "orphanGroup"
+        else:
+            leftIssue = None if groupKeys(leftKey) is not None else "unknownGlyph"
+        for rightKey, value in rightDict.items():
+            rightIsGroup = rightKey.startswith("@MMK_R_")
+            issue = leftIssue
+            if issue is None:
+                if rightIsGroup:
+                    issue = None if rightKey in groups.rightSideKeys else "orphanGroup"
+                else:
+                    issue = None if groupKeys(rightKey) is not None else "unknownGlyph"
+            if issue:
+                findings.append((leftKey, rightKey, value, issue, None))
+                continue
+            levels[(not leftIsGroup) + (not rightIsGroup)].append((leftKey, rightKey, value))
+
+    removed = set()
+
+    def lookup(leftKey, rightKey):
+        if leftKey is None or rightKey is None or (leftKey, rightKey) in removed:
+            return None
+        return kerningDict.get(leftKey, {}).get(rightKey)
+
+    for level in levels:
+        for leftKey, rightKey, value in level:
+            leftGroupKey = leftKey if leftKey.startswith("@") else groupKeys(leftKey)[0]
+            rightGroupKey = rightKey if rightKey.startswith("@") else groupKeys(rightKey)[1]
+            fallback = None
+            for candidate in ((leftKey, rightGroupKey), (leftGroupKey, rightKey), (leftGroupKey, rightGroupKey)):
+                if candidate != (leftKey, rightKey):
+                    fallback = lookup(*candidate)
+                    if fallback is not None:
+                        break
+            if fallback is None and value == 0:
+                issue = "zero"
+            elif fallback is not None and value == fallback:
+                issue = "redundantException"
+            else:
+                continue
+            removed.add((leftKey, rightKey))
+            findings.append((leftKey, rightKey, value, issue, fallback))
+    return findings
+
+
+def pruneKerning(font, findingsPerMaster, resolveKey=None):
+    """
+    Remove audit findings from the font in one update-disabled batch.
+    findingsPerMaster is [(master, findings)]. Glyph-ID keys are written
+    back as glyph names. Returns the number of removed pairs.
+    """
+    removed = 0
+    font.disableUpdateInterface()
+    try:
+        for master, findings in findingsPerMaster:
+            for leftKey, rightKey, value, issue, fallback in findings:
+                if issue == "unknownGlyph":
+                    # no glyph to name the pair by: drop it from the table directly
+                    kerningDict = font.kerning[master.id]
+                    if rightKey in kerningDict.get(leftKey, {}):
+                        del kerningDict[leftKey][rightKey]
+                        if not kerningDict[leftKey]:
+                            del kerningDict[leftKey]
+                        removed += 1
+                    continue
+                leftName = resolveKey(leftKey) if resolveKey else leftKey
+                rightName = resolveKey(rightKey) if resolveKey else rightKey
+                font.removeKerningForPair(master.id, leftName, rightName)
+                removed += 1
+    finally:
+        font.enableUpdateInterface()
+    return removed
+
+
+def kerningReportPath(font, suffix):
+    """MyFont.glyphs → MyFont.<suffix>.csv, on the Desktop for unsaved fonts."""
+    if font.filepath:
+        return os.path.splitext(font.filepath)[0] + f".{suffix}.csv"
+    return os.path.join(os.path.expanduser("~/Desktop"), f"{font.familyName}.{suffix}.csv")
+
+
+def writeKerningAudit(path, findingsPerMaster, resolveKey=None):
+    """Write the audit as CSV (see AUDIT_FIELDS), glyph IDs shown as names."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, AUDIT_FIELDS)
+        writer.writeheader()
+        for master, findings in findingsPerMaster:
+            for leftKey, rightKey, value, issue, fallback in findings:
+                writer.writerow({
+                    "master": master.name,
+                    "left": (resolveKey(leftKey) if resolveKey else None) or leftKey,
+                    "right": (resolveKey(rightKey) if resolveKey else None) or rightKey,
+                    "value": value,
+                    "issue": issue,
+                    "fallback": "" if fallback is None else fallback,
+                })
+    return path
+
+
+class KerningMatrix(object):
+    """
+    The kerning of all masters as one sparse pair × master matrix.
+    Left and right keys are interned once and every (left, right) pair gets
+    one integer row, left index × len(rightNames) + right index (see pair).
+    Each master column is a pair of compact arrays: rows[column] with the
+    rows it has and values[column] with their values. resolveKey
+    (GlyphIdCache.resolveKey) turns glyph-ID keys into names; the rows are
+    read with the same walk as planKerningGroupCopies (resolvedKerningRows).
+    """
+
+    def __init__(self, masters, kerningDicts, resolveKey=None):
+        self.masters = list(masters)
+        rowsPerMaster = [list(resolvedKerningRows(kerningDict, resolveKey)) for kerningDict in kerningDicts]
+
+        self.leftNames = list(dict.fromkeys(leftName for rows in rowsPerMaster for leftName, rightDict in rows))
+        self.rightNames = list(dict.fromkeys(chain.from_iterable(
+            rightDict.keys() for rows in rowsPerMaster for leftName, rightDict in rows
+        )))
+        leftIndex = {name: i for i, name in enumerate(self.leftNames)}
+        rightIndex = {name: i for i, name in enumerate(self.rightNames)}
+        self.width = width = len(self.rightNames)
+
+        self.rows = []
+        self.values = []
+        for masterRows in rowsPerMaster:
+            rows = array("q")
+            values = array("d")
+            for leftName, rightDict in masterRows:
+                offset = leftIndex[leftName] * width
+                rows.extend(map(offset.__add__, map(rightIndex.__getitem__, rightDict.keys())))
+                values.extend(rightDict.values())
+            self.rows.append(rows)
+            self.values.append(values)
+        self._columnValues = {}
+
+    @classmethod
+    def fromFont(cls, font, resolveKey=None):
+        return cls(font.masters, [font.kerning.get(master.id) or {} for master in font.masters], resolveKey)
+
+    def pair(self, row):
+        """(leftName, rightName) of a row."""
+        return self.leftNames[row // self.width], self.rightNames[row % self.width]
+
+    def pairCount(self):
+        return len(set().union(*self.rows))
+
+    def columnValues(self, column):
+        """{row: value} of one master (built on first use)."""
+        if column not in self._columnValues:
+            self._columnValues[column] = dict(zip(self.rows[column], self.values[column]))
+        return self._columnValues[column]
+
+    def pairValues(self, row):
+        """Values of one pair in every master, None where it is missing."""
+        return [self.columnValues(column).get(row) for column in range(len(self.masters))]
+
+    def missing(self):
+        """{row: [columns without the pair]} for pairs that are not in every master."""
+        columns = [set(rows) for rows in self.rows]
+        if not columns:
+            return {}
+        partial = set().union(*columns).difference(set.intersection(*columns))
+        result = defaultdict(list)
+        for column, present in enumerate(columns):
+            for row in partial.difference(present):
+                result[row].append(column)
+        return dict(result)
+
+    def signFlips(self):
+        """Rows kerned positive in one master and negative in another."""
+        positive = set()
+        negative = set()
+        for rows, values in zip(self.rows, self.values):
+            positive.update(compress(rows, map((0.0).__lt__, values)))
+            negative.update(compress(rows, map((0.0).__gt__, values)))
+        return positive & negative
+
+    def fillValues(self, missing, mode="zero", axis=0):
+        """
+        Values for the missing entries: {column: {row: value}}.
+        "zero" fills 0; "interpolate" interpolates linearly along one axis
+        between the nearest masters that have the pair on either side, and
+        falls back to 0 outside of them (which is what Glyphs assumes anyway).
+        """
+        positions = [float(master.axes[axis]) if master.axes else float(i) for i, master in enumerate(self.masters)]
+        fills = defaultdict(dict)
+        for row, columns in missing.items():
+            known = sorted(
+                (positions[column], value)
+                for column, value in enumerate(self.pairValues(row)) if value is not None
+            ) if mode == "interpolate" else []
+            for column in columns:
+                value = 0
+                position = positions[column]
+                lower = [item for item in known if item[0] <= position]
+                upper = [item for item in known if item[0] >= position]
+                if lower and upper:
+                    (x0, y0), (x1, y1) = lower[-1], upper[0]
+                    value = y0 if x1 == x0 else round(y0 + (y1 - y0) * (position - x0) / (x1 - x0))
+                fills[column][row] = value
+        return dict(fills)
+
+    def applyFills(self, font, fills):
+        """Write fillValues into the font in one update-disabled batch. Returns the number of pairs."""
+        count = 0
+        font.disableUpdateInterface()
+        try:
+            for column, rowValues in fills.items():
+                masterId = self.masters[column].id
+                for row, value in rowValues.items():
+                    leftKey, rightKey = self.pair(row)
+                    font.setKerningForPair(masterId, leftKey, rightKey, value)
+                    count += 1
+        finally:
+            font.enableUpdateInterface()
+        return count
+
+    def writeReport(self, path, missing, flips):
+        """CSV with one row per inconsistent pair and one value column per master."""
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["left", "right", "issue"] + [master.name for master in self.masters])
+            for row in sorted(set(missing) | flips, key=self.pair):
+                issues = [issue for issue, rows in (("missing", missing), ("signFlip", flips)) if row in rows]
+                values = ["" if value is None else value for value in self.pairValues(row)]
+                writer.writerow(list(self.pair(row)) + ["+".join(issues)] + values)
+        return path
+
+
+if __name__ == "__main__":
+    # Rough benchmark on a synthetic 100k-pair table: python3 kerningCore.py
+    import random
+    import time
+
+    random.seed(0)
+    groups = [f"g{i}" for i in range(400)]
+    kerning = {}
+    for leftGroup in groups:
+        kerning[f"@MMK_L_{leftGroup}"] = {f"@MMK_R_{rightGroup}": random.randint(-80, 20) for rightGroup in groups[:250]}
+    pairCount = sum(len(rightDict) for rightDict in kerning.values())
+    groupPairs = [(groups[i], f"new{i}") for i in range(30)]
+
+    start = time.time()
+    index = KerningIndex(kerning)
+    print(f"KerningIndex over {pairCount} pairs: {time.time() - start:.3f}s")
+
+    start = time.time()
+    for masterIndex in range(12):
+        plan = planKerningGroupCopies(kerning, groupPairs)
+    print(f"Planned {len(plan)} copies × 12 masters: {time.time() - start:.3f}s")
+
+    class Glyph(object):
+        def __init__(self, name, group):
+            self.name = self.id = name
+            self.leftKerningGroup = self.rightKerningGroup = group
+
+    class Font(object):
+        glyphs = [Glyph(f"{group}.{i}", group) for group in groups[:380] for i in range(3)]
+
+    start = time.time()
+    masterKerning = []
+    for masterIndex in range(12):
+        masterKerning.append({
+            f"@MMK_L_g{left}": {f"@MMK_R_g{right}": random.randint(-80, 20) for right in range(200) if random.random() < 0.97}
+            for left in range(400)
+        })
+    print(f"12 masters × {sum(map(len, masterKerning[0].values()))} pairs generated: {time.time() - start:.3f}s")
+
+    class Master(object):
+        def __init__(self, i):
+            self.id = self.name = f"m{i}"
+            self.axes = [i * 100]
+
+    start = time.time()
+    matrix = KerningMatrix([Master(i) for i in range(12)], masterKerning)
+    loaded = time.time()
+    missing = matrix.missing()
+    flips = matrix.signFlips()
+    end = time.time()
+    print(f"Matrix load {loaded - start:.3f}s, {len(missing)} pairs missing somewhere and {len(flips)} sign flips: {end - loaded:.3f}s")
+    start = time.time()
+    fills = matrix.fillValues(missing, "interpolate")
+    print(f"Interpolated {sum(map(len, fills.values()))} missing entries: {time.time() - start:.3f}s")
+
+    start = time.time()
+    findings = auditKerning(kerning, KerningGroupSets(Font))
+    print(f"Audited {pairCount} pairs, {len(findings)} findings: {time.time() - start:.3f}s")
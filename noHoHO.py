@@ -2,24 +2,71 @@
 # -*- coding: utf-8 -*-
 __doc__ = """
 Inserts n, o, H, O after every character in the current Edit view text.
+Figures and Cyrillic get their own control glyphs (see CONTROL_SETS).
+Long texts are split over several tabs.
 """
 
 import GlyphsApp
 
-def insert_noHOHO(text):
-    result = ""
+# Control glyphs per kind of character, edit to taste
+CONTROL_SETS = {
+    "default": ["n", "o", "H", "O"],
+    "figures": ["0", "1"],
+    "cyrillic": ["н", "о", "Н", "О"],
+}
+
+# Maximum number of characters per Edit tab
+MAX_TAB_LENGTH = 3000
+
+
+def controlsForChar(char):
+    """Pick the control glyphs that suit a character."""
+    if char.isdigit():
+        return CONTROL_SETS["figures"]
+    if "Ѐ" <= char <= "ӿ":
+        return CONTROL_SETS["cyrillic"]
+    return CONTROL_SETS["default"]
+
+
+def noHOHOParts(text):
+    """Yield the spacing string piece by piece: n$n$o$o$H$H$O$O for each character."""
     for char in text:
-        result += f"n{char}n{char}o{char}o{char}H{char}H{char}O{char}O"
-    return result
+        if char == "\n":
+            yield char
+            continue
+        controls = controlsForChar(char)
+        yield char.join(c for control in controls for c in (control, control))
+
+
+def insert_noHOHO(text):
+    return "".join(noHOHOParts(text))
+
+
+def noHOHOChunks(text, maxLength=MAX_TAB_LENGTH):
+    """Yield the spacing string in chunks of at most maxLength characters (one character's group is never split)."""
+    chunk = []
+    length = 0
+    for part in noHOHOParts(text):
+        if chunk and length + len(part) > maxLength:
+            yield "".join(chunk)
+            chunk = []
+            length = 0
+        chunk.append(part)
+        length += len(part)
+    if chunk:
+        yield "".join(chunk)
+
 
 font = Glyphs.font
 if font:
     tab = font.currentTab
     if tab:
         original_text = tab.text
-        new_text = insert_noHOHO(original_text)
-        tab.text = new_text
+        chunks = noHOHOChunks(original_text)
+        tab.text = next(chunks, "")
+        for chunk in chunks:
+            font.newTab(chunk)
     else:
         Message("No Edit tab open", "Please open an Edit tab to use this script.")
 else:
-    Message("No font open", "Please open a font to use this script.")
\ No newline at end of file
+    Message("No font open", "Please open a font to use this script.")
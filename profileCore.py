@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Side profile helpers for Auto Kerning Groups (no UI, no MenuTitle).
+Every layer's left and right contour profile is sampled at fixed heights
+into a fixed-length vector; similar vectors share a kerning group.
+"""
+
+import bisect
+import hashlib
+import json
+import math
+import os
+from array import array
+from collections import Counter
+from itertools import chain, compress, count
+from operator import ne, sub
+
+SAMPLE_COUNT = 24
+CURVE_STEPS = 8
+
+# Bernstein weights of the flattened cubic, one row per step (t = 1/steps … 1)
+CUBIC_WEIGHTS = [
+    ((1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t * t, t ** 3)
+    for t in (step / CURVE_STEPS for step in range(1, CURVE_STEPS + 1))
+]
+QUADRATIC_WEIGHTS = [
+    ((1 - t) ** 2, 2 * (1 - t) * t, t * t)
+    for t in (step / CURVE_STEPS for step in range(1, CURVE_STEPS + 1))
+]
+
+SIDES = ("left", "right")
+
+
+def layerContours(layer, depth=0):
+    """
+    Contours of a layer with its components decomposed, as [(x, y, type)]
+    node lists (type l, c, o or q).
+    """
+    if hasattr(layer, "copyDecomposedLayer"):
+        # GSLayer: let Glyphs decompose nested and transformed components
+        decomposed = layer.copyDecomposedLayer()
+        return [[(node.position.x, node.position.y, node.type[0]) for node in path.nodes] for path in decomposed.paths]
+    contours = [path.nodes for path in layer.paths]
+    if depth > 10:
+        return contours
+    for component in layer.components:
+        glyph = component.font.glyphs[component.componentName]
+        baseLayer = glyph.layers[layer.associatedMasterId] if glyph else None
+        if baseLayer is None:
+            continue
+        a, b, c, d, tx, ty = component.transform
+        for nodes in layerContours(baseLayer, depth + 1):
+            contours.append([(a * x + c * y + tx, b * x + d * y + ty, nodeType) for x, y, nodeType in nodes])
+    return contours
+
+
+def contourPoints(nodes):
+    """
+    Flatten one closed contour into a polygon, returned as (xs, ys) columns;
+    curves get CURVE_STEPS points.
+    """
+    xs = []
+    ys = []
+    count = len(nodes)
+    for i, (x, y, nodeType) in enumerate(nodes):
+        if nodeType == "o":
+            continue
+        offcurves = []
+        j = i - 1
+        while j > i - count and nodes[j][2] == "o":
+            offcurves.append(nodes[j])
+            j -= 1
+        if nodeType == "c" and len(offcurves) == 2:
+            x0, y0 = nodes[j][0], nodes[j][1]
+            (x2, y2, _), (x1, y1, _) = offcurves
+            xs.extend([w0 * x0 + w1 * x1 + w2 * x2 + w3 * x for w0, w1, w2, w3 in CUBIC_WEIGHTS])
+            ys.extend([w0 * y0 + w1 * y1 + w2 * y2 + w3 * y for w0, w1, w2, w3 in CUBIC_WEIGHTS])
+        elif nodeType == "q" and offcurves:
+            # TrueType: implied on-curve points halfway between off-curve points
+            offcurves.reverse()
+            startX, startY = nodes[j][0], nodes[j][1]
+            for k, (cx, cy, _) in enumerate(offcurves):
+                if k + 1 < len(offcurves):
+                    endX, endY = (cx + offcurves[k + 1][0]) / 2, (cy + offcurves[k + 1][1]) / 2
+                else:
+                    endX, endY = x, y
+                xs.extend([w0 * startX + w1 * cx + w2 * endX for w0, w1, w2 in QUADRATIC_WEIGHTS])
+                ys.extend([w0 * startY + w1 * cy + w2 * endY for w0, w1, w2 in QUADRATIC_WEIGHTS])
+                startX, startY = endX, endY
+        else:
+            xs.append(x)
+            ys.append(y)
+    return xs, ys
+
+
+def sideProfiles(contours, bottom, top, depth, sampleCount=SAMPLE_COUNT):
+    """
+    (left, right) margins at sampleCount heights from bottom to top: the
+    distance of the outline from the glyph's left/right extreme, capped at
+    depth (heights without outline count as depth). None for empty layers.
+
+    Each polygon point is binned by the sample line below it in one C-level
+    pass; only segments whose end points fall in different bins cross a
+    sample line, so the Python loop sees a small share of the segments.
+    """
+    step = (top - bottom) / (sampleCount - 1)
+    offset, scale = float(-bottom), 1.0 / step
+    leftX = [math.inf] * sampleCount
+    rightX = [-math.inf] * sampleCount
+    xMin, xMax = math.inf, -math.inf
+    for nodes in contours:
+        xs, ys = contourPoints(nodes)
+        if len(xs) < 2:
+            continue
+        xMin = min(xMin, min(xs))
+        xMax = max(xMax, max(xs))
+        positions = list(map(scale.__mul__, map(offset.__add__, ys)))  # in sample steps
+        bins = list(map(math.floor, positions))
+        # segment i runs from point i - 1 to point i (the first closes the contour)
+        for i in compress(range(len(bins)), map(ne, bins, bins[-1:] + bins[:-1])):
+            x0, y0, bin0 = xs[i - 1], ys[i - 1], bins[i - 1]
+            x1, y1, bin1 = xs[i], ys[i], bins[i]
+            slope = (x1 - x0) / (y1 - y0)
+            low = i - 1 if bin0 < bin1 else i
+            first = bins[low] if positions[low] == bins[low] else bins[low] + 1  # lower end exactly on a line
+            last = (bin1 if bin0 < bin1 else bin0) + 1
+            for k in range(first if first > 0 else 0, last if last < sampleCount else sampleCount):
+                x = x0 + (bottom + k * step - y0) * slope
+                if x < leftX[k]:
+                    leftX[k] = x
+                if x > rightX[k]:
+                    rightX[k] = x
+    if xMin > xMax:
+        return None
+    left = array("d", (min(x - xMin, depth) for x in leftX))
+    right = array("d", (min(xMax - x, depth) for x in rightX))
+    return left, right
+
+
+def sampleZone(font, master):
+    """(bottom, top, depth) of the sample heights for a master: descender to ascender."""
+    upm = font.upm
+    bottom = getattr(master, "descender", 0) or -0.2 * upm
+    top = getattr(master, "ascender", 0) or 0.8 * upm
+    return bottom, top, 0.25 * upm
+
+
+def isPlainComponent(component):
+    return tuple(component.transform)[:4] == (1, 0, 0, 1)
+
+
+def layerBases(font, layer):
+    """
+    For a layer built only from unscaled components: the glyph names whose
+    left and right side it inherits (first and last non-mark component).
+    (None, None) if the layer has its own outlines.
+    """
+    if layer.paths:
+        return None, None
+    bases = []
+    for component in layer.components:
+        glyph = font.glyphs[component.componentName]
+        if glyph is not None and glyph.category != "Mark" and isPlainComponent(component):
+            bases.append(component.componentName)
+    if not bases:
+        return None, None
+    return bases[0], bases[-1]
+
+
+def profileRecord(font, layer, zone, sampleCount=SAMPLE_COUNT):
+    """Plain, JSON-friendly profile of a layer: left/right vectors or the glyphs it inherits from."""
+    leftBase, rightBase = layerBases(font, layer)
+    if leftBase:
+        return {"leftBase": leftBase, "rightBase": rightBase}
+    profiles = sideProfiles(layerContours(layer), *zone, sampleCount=sampleCount)
+    if profiles is None:
+        return {}
+    return {"left": list(profiles[0]), "right": list(profiles[1])}
+
+
+def _changeMarker(font, glyph, layer, depth=0):
+    """lastChange of the glyph and, recursively, of every glyph its components use."""
+    lastChange = getattr(glyph, "lastChange", None)
+    if lastChange is None:
+        # unsaved or older API: fall back to the outline itself
+        lastChange = hashlib.md5(repr(layerContours(layer)).encode("utf-8")).hexdigest()
+    parts = [str(lastChange)]
+    if depth < 10:
+        for component in layer.components:
+            componentGlyph = font.glyphs[component.componentName]
+            componentLayer = componentGlyph.layers[layer.associatedMasterId] if componentGlyph else None
+            if componentLayer is not None:
+                parts.append(_changeMarker(font, componentGlyph, componentLayer, depth + 1))
+    return "|".join(parts)
+
+
+def profileFingerprint(font, glyph, layer, zone, sampleCount=SAMPLE_COUNT):
+    """Cheap change marker for a layer's profile, including its components and the sample zone."""
+    key = f"{_changeMarker(font, glyph, layer)}|{glyph.category}|{layer.name}|{zone}|{sampleCount}"
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+class ProfileCache(object):
+    """
+    Per-layer profile records stored in a JSON sidecar next to the font.
+    Layers whose fingerprint did not change are not sampled again.
+    """
+
+    version = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.version:
+                    self.records = data.get("layers", {})
+            except (OSError, ValueError):
+                self.records = {}
+
+    @classmethod
+    def forFont(cls, font):
+        """Sidecar cache for a saved font, None for unsaved fonts."""
+        if not font.filepath:
+            return None
+        return cls(os.path.splitext(font.filepath)[0] + ".profilecache.json")
+
+    def record(self, font, glyph, layer, zone, sampleCount=SAMPLE_COUNT):
+        key = f"{glyph.name}/{layer.layerId}"
+        fingerprint = profileFingerprint(font, glyph, layer, zone, sampleCount)
+        cached = self.records.get(key)
+        if cached and cached.get("fingerprint") == fingerprint:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        record = profileRecord(font, layer, zone, sampleCount)
+        record["fingerprint"] = fingerprint
+        self.records[key] = record
+        return record
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "layers": self.records}, f)
+
+
+def glyphPartition(glyph):
+    """Glyphs are only grouped with glyphs of the same category, case and script."""
+    case = getattr(glyph, "case", None) or getattr(glyph, "subCategory", None)
+    return (glyph.category, case, getattr(glyph, "script", None))
+
+
+def collectProfiles(font, glyphs, masters, cache=None, sampleCount=SAMPLE_COUNT):
+    """
+    Return ({glyphName: {"left": vector, "right": vector}}, {glyphName: (leftBase, rightBase)}).
+    Vectors of several masters are concatenated; marks and empty glyphs are left out.
+    """
+    zones = {master.id: sampleZone(font, master) for master in masters}
+    readRecord = cache.record if cache else (lambda font, glyph, layer, zone, count: profileRecord(font, layer, zone, count))
+    profiles = {}
+    bases = {}
+    for glyph in glyphs:
+        if glyph.category == "Mark":
+            continue
+        records = []
+        for master in masters:
+            layer = glyph.layers[master.id]
+            if layer is not None:
+                records.append(readRecord(font, glyph, layer, zones[master.id], sampleCount))
+        if not records or len(records) < len(masters):
+            continue
+        if all("leftBase" in record for record in records):
+            bases[glyph.name] = (records[0]["leftBase"], records[0]["rightBase"])
+        elif all("left" in record for record in records):
+            profiles[glyph.name] = {
+                side: array("d", (value for record in records for value in record[side])) for side in SIDES
+            }
+    return profiles, bases
+
+
+def clusterVectors(vectors, tolerance):
+    """
+    Leader clustering: each vector joins the nearest cluster whose leader
+    is within tolerance on every sample (max |a - b|), or starts a new one.
+    vectors is [(name, vector)] in leader order. Leaders are kept sorted by
+    their mean, and only leaders whose mean is within tolerance can match,
+    so most distances are never computed. Returns [[names]], leader first.
+    """
+    clusters = []
+    leaderMeans = []  # sorted (mean, cluster index)
+    for name, vector in vectors:
+        mean = sum(vector) / len(vector)
+        start = bisect.bisect_left(leaderMeans, (mean - tolerance, -1))
+        end = bisect.bisect_right(leaderMeans, (mean + tolerance, len(clusters)))
+        best, bestDistance = None, tolerance
+        for leaderMean, index in leaderMeans[start:end]:
+            distance = max(map(abs, map(sub, vector, clusters[index][1])))
+            if distance <= bestDistance:
+                best, bestDistance = index, distance
+        if best is None:
+            bisect.insort(leaderMeans, (mean, len(clusters)))
+            clusters.append(([name], vector))
+        else:
+            clusters[best][0].append(name)
+    return [names for names, leader in clusters]
+
+
+def leaderOrder(glyphName):
+    """Short, plain names lead their cluster: n before n.sc before napostrophe."""
+    return (glyphName.count("."), len(glyphName), glyphName)
+
+
+def proposeGroups(font, profiles, bases, tolerance=10, keepExisting=True):
+    """
+    Cluster the profiles per side and partition, name every cluster after
+    the group most of its glyphs already use (or its leader glyph, with a
+    numeric suffix if that name is taken), and let composites follow their
+    base glyphs. Composites whose base has no group stay ungrouped.
+    Returns [(glyphName, side, oldGroup, newGroup)] for the groups that change.
+    """
+    attribute = {"left": "leftKerningGroup", "right": "rightKerningGroup"}
+    proposals = []
+    for sideIndex, side in enumerate(SIDES):
+        partitions = {}
+        for glyphName in sorted(profiles, key=leaderOrder):
+            partitions.setdefault(glyphPartition(font.glyphs[glyphName]), []).append((glyphName, profiles[glyphName][side]))
+
+        groupFor = {}
+        usedNames = set()
+        fontGroups = {getattr(glyph, attribute[side]) for glyph in font.glyphs}
+        for vectors in partitions.values():
+            for names in clusterVectors(vectors, tolerance):
+                existing = Counter(getattr(font.glyphs[name], attribute[side]) for name in names)
+                existing.pop(None, None)
+                existing.pop("", None)
+                groupName = next((group for group, glyphCount in existing.most_common() if group not in usedNames), None)
+                if groupName is None:
+                    # the leader's name, unless another cluster or an existing group has it
+                    groupName = next(
+                        candidate for candidate in chain((names[0],), (f"{names[0]}.{n}" for n in count(1)))
+                        if candidate not in usedNames and candidate not in fontGroups
+                    )
+                usedNames.add(groupName)
+                for name in names:
+                    groupFor[name] = groupName
+
+        for glyphName, sideBases in bases.items():
+            baseName = sideBases[sideIndex]
+            groupName = groupFor.get(baseName) or getattr(font.glyphs[baseName], attribute[side], None)
+            if groupName:
+                groupFor[glyphName] = groupName
+
+        for glyphName in sorted(groupFor):
+            oldGroup = getattr(font.glyphs[glyphName], attribute[side])
+            newGroup = groupFor[glyphName]
+            if oldGroup == newGroup or (keepExisting and oldGroup):
+                continue
+            proposals.append((glyphName, side, oldGroup, newGroup))
+    return proposals
+
+
+def applyGroups(font, proposals):
+    """Write proposed groups in one update-disabled batch. Returns the number of changed glyphs."""
+    changed = set()
+    font.disableUpdateInterface()
+    try:
+        for glyphName, side, oldGroup, newGroup in proposals:
+            glyph = font.glyphs[glyphName]
+            if side == "left":
+                glyph.leftKerningGroup = newGroup
+            else:
+                glyph.rightKerningGroup = newGroup
+            changed.add(glyphName)
+    finally:
+        font.enableUpdateInterface()
+    return len(changed)
+
+
+if __name__ == "__main__":
+    # Benchmark: python3 profileCore.py [glyphCount]
+    import sys
+    import tempfile
+    import time
+
+    import glyphsPlist
+    from fontAccess import GlyphsFileFont
+
+    glyphCount = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "Synthetic.glyphs")
+        glyphsPlist.writeSyntheticFont(path, glyphCount, masterCount=1, contours=3, nodesPerContour=24)
+        font = GlyphsFileFont(path)
+        print(f"Synthetic font: {glyphCount} glyphs")
+
+        for run in ("cold", "warm"):
+            cache = ProfileCache.forFont(font)
+            start = time.time()
+            profiles, bases = collectProfiles(font, font.glyphs, font.masters[:1], cache)
+            print(f"Profiles ({run} cache, {cache.misses} sampled): {time.time() - start:.3f}s")
+            cache.save()
+
+        start = time.time()
+        proposals = proposeGroups(font, profiles, bases, keepExisting=False)
+        groups = len({(side, group) for glyphName, side, oldGroup, group in proposals})
+        print(f"Clustered {len(profiles)} profiles into {groups} groups: {time.time() - start:.3f}s")
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Session log for Samara's Glyph Race (no UI, no MenuTitle).
+Every stretch of work on a glyph layer is one CSV row appended to a log
+that sits next to the .glyphs file. aggregateSessionLog rolls the log up
+into totals and percentiles; run this file directly for a JSON/CSV report:
+
+    python3 raceCore.py MyFont.glyphrace.csv [report.json|report.csv]
+"""
+
+import csv
+import json
+import math
+import os
+import sys
+from collections import defaultdict
+
+LOG_FIELDS = ["session", "glyph", "master", "start", "end", "layer", "script", "category"]
+
+# Report dimensions: name → fields of a log row
+REPORT_GROUPS = {
+    "glyph×master": ("glyph", "master"),
+    "glyph": ("glyph",),
+    "master": ("master",),
+    "script": ("script",),
+    "category": ("category",),
+    "session": ("session",),
+}
+REPORT_FIELDS = ["group", "key", "total", "items", "mean", "p50", "p90", "max"]
+
+
+def sessionLogPath(fontPath):
+    """Log file for a font: MyFont.glyphs → MyFont.glyphrace.csv"""
+    return os.path.splitext(fontPath)[0] + ".glyphrace.csv"
+
+
+def upgradeSessionLog(path):
+    """Rewrite a log with an older header so new columns line up (runs once per log)."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), None)
+        if header == LOG_FIELDS:
+            return
+        f.seek(0)
+        rows = list(csv.DictReader(f))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, LOG_FIELDS, restval="", extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def appendSessionLog(path, rows):
+    """Append (session, glyph, master, start, end, layer, script, category) rows, writing the header for new logs."""
+    isNew = not os.path.exists(path) or os.path.getsize(path) == 0
+    if not isNew:
+        upgradeSessionLog(path)
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if isNew:
+            writer.writerow(LOG_FIELDS)
+        for session, glyph, master, start, end, layer, script, category in rows:
+            writer.writerow([session, glyph, master, f"{start:.1f}", f"{end:.1f}", layer, script, category])
+    return len(rows)
+
+
+def readSessionLog(path):
+    """Stream the log as dicts with float start/end, one row at a time."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                row["start"] = float(row["start"])
+                row["end"] = float(row["end"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            yield row
+
+
+def percentile(sortedValues, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sortedValues:
+        return 0
+    index = max(0, min(len(sortedValues) - 1, math.ceil(fraction * len(sortedValues)) - 1))
+    return sortedValues[index]
+
+
+def aggregateSessionLog(rows, groups=REPORT_GROUPS):
+    """
+    Roll session rows up into report rows, sorted by total time per group.
+    One streaming pass sums the time per (glyph, master, layer); every group
+    is then built from those totals, so percentiles describe how long one
+    glyph layer takes (e.g. the median lowercase letter in Bold).
+    """
+    layerTotals = defaultdict(float)
+    layerInfo = {}
+    sessionTotals = defaultdict(float)
+    for row in rows:
+        seconds = max(0.0, row["end"] - row["start"])
+        key = (row["glyph"], row["master"] or "", row.get("layer") or "")
+        layerTotals[key] += seconds
+        sessionTotals[row["session"]] += seconds
+        info = layerInfo.setdefault(key, {})
+        for field in LOG_FIELDS:
+            if not info.get(field):
+                info[field] = row.get(field) or ""
+
+    report = []
+    for groupName, fields in groups.items():
+        values = defaultdict(list)
+        if fields == ("session",):
+            for session, seconds in sessionTotals.items():
+                values[session].append(seconds)
+        else:
+            for key, seconds in layerTotals.items():
+                info = layerInfo[key]
+                values[" / ".join(info[field] for field in fields)].append(seconds)
+
+        groupRows = []
+        for key, seconds in values.items():
+            seconds.sort()
+            total = sum(seconds)
+            groupRows.append({
+                "group": groupName,
+                "key": key,
+                "total": round(total, 1),
+                "items": len(seconds),
+                "mean": round(total / len(seconds), 1),
+                "p50": round(percentile(seconds, 0.5), 1),
+                "p90": round(percentile(seconds, 0.9), 1),
+                "max": round(seconds[-1], 1),
+            })
+        groupRows.sort(key=lambda reportRow: reportRow["total"], reverse=True)
+        report.extend(groupRows)
+    return report
+
+
+def writeReport(report, path):
+    """Write report rows as .json or .csv, depending on the file extension."""
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(report)
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    report = aggregateSessionLog(readSessionLog(sys.argv[1]))
+    if len(sys.argv) > 2:
+        print(f"Report written to {writeReport(report, sys.argv[2])}")
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=1)
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Sidebearing helpers for Copy Sidebearings (no UI, no MenuTitle).
+Metrics are pulled into flat arrays in one pass and written back in one
+update-disabled region.
+"""
+
+import csv
+import json
+import math
+import os
+from array import array
+
+ROUNDING = {
+    "none": lambda value: value,
+    "round": lambda value: math.floor(value + 0.5),
+    "floor": math.floor,
+    "ceil": math.ceil,
+}
+
+REPORT_FIELDS = [
+    "glyph", "status", "sourceMaster", "destinationMaster",
+    "oldLSB", "newLSB", "deltaLSB", "oldRSB", "newRSB", "deltaRSB",
+    "oldWidth", "newWidth", "deltaWidth",
+]
+
+
+def masterAxes(master):
+    """Axis coordinates of a master as a tuple (empty for single-master fonts)."""
+    axes = getattr(master, "axes", None)
+    return tuple(float(value) for value in axes) if axes else ()
+
+
+def matchMasters(sourceMasters, destinationMasters, by="name"):
+    """
+    Pair up masters of two fonts by name or by axis coordinates.
+    Returns [(sourceMaster, destinationMaster)] in destination order;
+    destination masters without a counterpart are left out.
+    """
+    if by == "axes":
+        keyFor = masterAxes
+    else:
+        keyFor = lambda master: master.name
+    sourceByKey = {}
+    for master in sourceMasters:
+        sourceByKey.setdefault(keyFor(master), master)
+    return [(sourceByKey[keyFor(master)], master) for master in destinationMasters if keyFor(master) in sourceByKey]
+
+
+class MetricsTable(object):
+    """
+    LSB, RSB and width of many glyphs × masters in flat arrays.
+    Row r = glyph index * len(masterIds) + master index.
+    """
+
+    def __init__(self, glyphNames, masterIds):
+        self.glyphNames = list(glyphNames)
+        self.masterIds = list(masterIds)
+        size = len(self.glyphNames) * len(self.masterIds)
+        self.lsb = array("d", bytes(8 * size))
+        self.rsb = array("d", bytes(8 * size))
+        self.width = array("d", bytes(8 * size))
+        self.empty = array("b", bytes(size))  # 1 = no paths, only the width counts
+        self.missing = array("b", bytes(size))  # 1 = layer not found
+
+    def rows(self):
+        """Yield (row, glyphName, column) for every cell; column indexes masterIds."""
+        row = 0
+        for glyphName in self.glyphNames:
+            for column in range(len(self.masterIds)):
+                yield row, glyphName, column
+                row += 1
+
+
+def extractMetrics(font, glyphNames, masterIds):
+    """Read LSB/RSB/width for glyphNames × masterIds from a font in one pass."""
+    table = MetricsTable(glyphNames, masterIds)
+    glyph = None
+    for row, glyphName, column in table.rows():
+        if column == 0:
+            glyph = font.glyphs[glyphName]
+        layer = glyph.layers[table.masterIds[column]] if glyph else None
+        if layer is None:
+            table.missing[row] = 1
+            continue
+        table.width[row] = layer.width
+        if not layer.paths:  # no contours
+            table.empty[row] = 1
+        else:
+            table.lsb[row] = layer.LSB
+            table.rsb[row] = layer.RSB
+    return table
+
+
+def applyMetrics(font, table, masterIds):
+    """
+    Write a MetricsTable into font, column i of the table → masterIds[i].
+    Updates are disabled once for the whole batch.
+    Returns (written glyph names, [(glyphName, error)]).
+    """
+    written = set()
+    errors = []
+    font.disableUpdateInterface()
+    try:
+        glyph = None
+        for row, glyphName, column in table.rows():
+            if column == 0:
+                glyph = font.glyphs[glyphName]
+            if table.missing[row]:
+                continue
+            layer = glyph.layers[masterIds[column]] if glyph else None
+            if layer is None:
+                continue
+            try:
+                # For empty glyphs, copy width only
+                if table.empty[row]:
+                    layer.width = table.width[row]
+                else:
+                    layer.LSB = table.lsb[row]
+                    layer.RSB = table.rsb[row]
+                written.add(glyphName)
+            except Exception as e:
+                errors.append((glyphName, e))
+    finally:
+        font.enableUpdateInterface()
+    return written, errors
+
+
+def scaleFactors(masterPairs, basis, sourceFont=None, destinationFont=None):
+    """
+    One scale factor per master pair (table column):
+    "absolute" 1.0, "upm" destination/source unitsPerEm,
+    "xheight" destination/source x-height of each master pair.
+    """
+    if basis == "upm":
+        factor = destinationFont.upm / sourceFont.upm
+        return [factor] * len(masterPairs)
+    if basis == "xheight":
+        return [
+            (destination.xHeight / source.xHeight) if source.xHeight else 1.0
+            for source, destination in masterPairs
+        ]
+    return [1.0] * len(masterPairs)
+
+
+def transformMetrics(table, columnFactors, categories=None, categoryRatios=None, rounding="none"):
+    """
+    Return a new MetricsTable with every value scaled in one batch:
+    value × column factor × category ratio, then rounded (see ROUNDING).
+    categories maps glyph name → category, categoryRatios category → ratio.
+    """
+    roundValue = ROUNDING[rounding]
+    categoryRatios = categoryRatios or {}
+    categories = categories or {}
+    columns = len(table.masterIds)
+    factors = array("d", (
+        columnFactors[column] * categoryRatios.get(categories.get(glyphName), 1.0)
+        for glyphName in table.glyphNames
+        for column in range(columns)
+    ))
+
+    result = MetricsTable(table.glyphNames, table.masterIds)
+    result.empty = array("b", table.empty)
+    result.missing = array("b", table.missing)
+    result.lsb = array("d", map(roundValue, map(float.__mul__, table.lsb, factors)))
+    result.rsb = array("d", map(roundValue, map(float.__mul__, table.rsb, factors)))
+    result.width = array("d", map(roundValue, map(float.__mul__, table.width, factors)))
+    return result
+
+
+def metricsDeltas(sourceTable, destinationTable, masterPairs, written=None, status="copied"):
+    """
+    Report rows (dicts, see REPORT_FIELDS) comparing destination metrics
+    before the copy with the copied source metrics, per glyph × master pair.
+    Both tables must cover the same glyph names, column i ↔ masterPairs[i].
+    Only glyphs in written are reported (all if written is None, e.g. for a dry run).
+    Rows whose destination layer has no paths but the source has are
+    reported as "empty", without LSB/RSB deltas; their width stays as it is.
+    """
+    rows = []
+    for row, glyphName, column in sourceTable.rows():
+        if sourceTable.missing[row] or destinationTable.missing[row]:
+            continue
+        if written is not None and glyphName not in written:
+            continue
+        sourceMaster, destinationMaster = masterPairs[column]
+        oldWidth = destinationTable.width[row]
+        entry = {
+            "glyph": glyphName,
+            "status": status,
+            "sourceMaster": sourceMaster.name,
+            "destinationMaster": destinationMaster.name,
+            "oldWidth": oldWidth,
+        }
+        if destinationTable.empty[row] and not sourceTable.empty[row]:
+            # no paths to move in the destination: its LSB/RSB read as 0 and
+            # setting them leaves the layer (and its width) unchanged
+            entry.update({"status": "empty", "newWidth": oldWidth, "deltaWidth": 0})
+            rows.append(entry)
+            continue
+        if sourceTable.empty[row]:
+            newWidth = sourceTable.width[row]
+        else:
+            oldLSB, oldRSB = destinationTable.lsb[row], destinationTable.rsb[row]
+            newLSB, newRSB = sourceTable.lsb[row], sourceTable.rsb[row]
+            newWidth = oldWidth + (newLSB - oldLSB) + (newRSB - oldRSB)
+            entry.update({
+                "oldLSB": oldLSB, "newLSB": newLSB, "deltaLSB": newLSB - oldLSB,
+                "oldRSB": oldRSB, "newRSB": newRSB, "deltaRSB": newRSB - oldRSB,
+            })
+        entry["newWidth"] = newWidth
+        entry["deltaWidth"] = newWidth - oldWidth
+        rows.append(entry)
+    return rows
+
+
+def writeMetricsReport(path, deltas, notInDestination=(), notInSource=()):
+    """Write the copy report as .json or .csv (by extension). Returns the path."""
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "copied": sorted({row["glyph"] for row in deltas if row["status"] == "copied"}),
+                "notInDestination": sorted(notInDestination),
+                "notInSource": sorted(notInSource),
+                "deltas": deltas,
+            }, f, ensure_ascii=False, indent=1)
+        return path
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, REPORT_FIELDS, restval="")
+        writer.writeheader()
+        writer.writerows(deltas)
+        for glyphName in sorted(notInDestination):
+            writer.writerow({"glyph": glyphName, "status": "notInDestination"})
+        for glyphName in sorted(notInSource):
+            writer.writerow({"glyph": glyphName, "status": "notInSource"})
+    return path
+
+
+def reportPathForFont(font, extension):
+    """Report file next to the font, or on the Desktop for unsaved fonts."""
+    if font.filepath:
+        return os.path.splitext(font.filepath)[0] + f".sidebearings.{extension}"
+    return os.path.join(os.path.expanduser("~/Desktop"), f"{font.familyName}.sidebearings.{extension}")
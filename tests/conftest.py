@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# The helper modules live next to the Glyphs scripts in the repository root
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Unused anchor analysis on plain stand-in objects, without Glyphs."""
+
+from types import SimpleNamespace
+
+from anchorCore import AnchorLayerCache, findUnusedAnchors, findUnusedAnchorsInFont
+
+
+class Layers(list):
+    """glyph.layers: index by position or by layer/master id, like in Glyphs."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next((layer for layer in self if layer.layerId == key), None)
+        return list.__getitem__(self, key)
+
+
+def makeLayer(masterId, anchors, components=(), name=None):
+    return SimpleNamespace(
+        layerId=f"{masterId}-{name}" if name else masterId,
+        associatedMasterId=masterId,
+        name=name or masterId,
+        isSpecialLayer=bool(name),
+        anchors=[SimpleNamespace(name=anchorName) for anchorName in anchors],
+        components=[SimpleNamespace(componentName=base, anchor=anchor) for base, anchor in components],
+    )
+
+
+def makeGlyph(name, layers, category="Letter"):
+    return SimpleNamespace(name=name, category=category, lastChange="2024-01-01 00:00:00 +0000", layers=Layers(layers))
+
+
+def makeFont(glyphs, masterIds=("m01",)):
+    return SimpleNamespace(masters=[SimpleNamespace(id=masterId, name=masterId) for masterId in masterIds], glyphs=glyphs, filepath=None)
+
+
+def test_marks_and_components_use_base_anchors():
+    baseAnchors = {
+        "a": {"top", "bottom", "ogonek"},
+        "f_f": {"top_1", "top_2", "caret_1"},
+        "o": {"top", "center"},
+    }
+    markAnchors = {"_top", "top", "_bottom"}
+    componentAnchors = [("o", "center"), ("missing", "top")]
+    assert findUnusedAnchors(baseAnchors, markAnchors, componentAnchors) == {
+        "a": ["ogonek"],
+        "f_f": ["caret_1"],
+    }
+
+
+def test_special_layers_are_analysed_at_their_location():
+    font = makeFont([
+        makeGlyph("a", [
+            makeLayer("m01", ["top", "bottom"]),
+            makeLayer("m02", ["top", "bottom"]),
+            makeLayer("m01", ["top", "bottom", "ogonek"], name="{50}"),
+        ]),
+        makeGlyph("f_f", [makeLayer("m01", ["top_1", "top_2"]), makeLayer("m02", ["top_1", "top_2", "horn_2"])]),
+        makeGlyph("acutecomb", [makeLayer("m01", ["_top"]), makeLayer("m02", ["_top"])], category="Mark"),
+        makeGlyph("aacute", [makeLayer("m01", [], [("a", "top")]), makeLayer("m02", [], [("a", "top"), ("a", "bottom")])]),
+    ], masterIds=("m01", "m02"))
+
+    rows = [(master.id, layerName, glyphName, unused) for master, layerName, glyphName, layerId, unused in findUnusedAnchorsInFont(font)]
+    assert rows == [("m01", None, "a", ["bottom"])]
+
+    cache = AnchorLayerCache(None)
+    rows = findUnusedAnchorsInFont(font, allLayers=True, cache=cache)
+    assert [(master.id, layerName, glyphName, unused) for master, layerName, glyphName, layerId, unused in rows] == [
+        ("m01", None, "a", ["bottom"]),
+        ("m01", "{50}", "a", ["bottom", "ogonek"]),
+        ("m02", None, "f_f", ["horn_2"]),
+    ]
+    assert rows[1][3] == "m01-{50}"
+    # every layer is read once, the brace location reuses the master records
+    assert (cache.hits, cache.misses) == (0, 9)
+
+    findUnusedAnchorsInFont(font, allLayers=True, cache=cache)
+    assert (cache.hits, cache.misses) == (9, 9)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""Round trips, streaming and partial saves of the .glyphs reader and writer."""
+
+import os
+import time
+import tracemalloc
+
+import pytest
+
+import glyphsPlist
+from fontAccess import GlyphsFileFont
+
+GLYPHS3 = """\
+{
+.appVersion = "3151";
+.formatVersion = 3;
+axes = (
+{
+name = Weight;
+tag = wght;
+}
+);
+familyName = "My Test";
+fontMaster = (
+{
+axesValues = (
+100
+);
+id = m01;
+metricValues = (
+{
+over = 16;
+pos = 800;
+},
+{
+over = -16;
+},
+{
+pos = 500;
+}
+);
+name = Light;
+}
+);
+glyphs = (
+{
+glyphname = A;
+kernLeft = A;
+lastChange = "2024-01-01 10:00:00 +0000";
+layers = (
+{
+anchors = (
+{
+name = top;
+pos = (300,700);
+}
+);
+layerId = m01;
+shapes = (
+{
+closed = 1;
+nodes = (
+(0,0,l),
+(600,0,l),
+(300.5,700,cs)
+);
+},
+{
+pos = (10,0);
+ref = acutecomb;
+scale = (-1,1);
+}
+);
+width = 600;
+}
+);
+unicode = 65;
+}
+);
+kerningLTR = {
+m01 = {
+"@MMK_L_A" = {
+"@MMK_R_V" = -40;
+};
+};
+};
+metrics = (
+{
+type = ascender;
+},
+{
+type = baseline;
+},
+{
+type = "x-height";
+}
+);
+unitsPerEm = 1000;
+}
+"""
+
+GLYPHS2 = """\
+{
+.appVersion = "1353";
+familyName = Test;
+fontMaster = (
+{
+alignmentZones = (
+"{800, 16}",
+"{0, -16}"
+);
+ascender = 800;
+id = "UUID-1";
+weightValue = 100;
+xHeight = 500;
+}
+);
+glyphs = (
+{
+glyphname = A;
+lastChange = "2019-01-01 10:00:00 +0000";
+layers = (
+{
+anchors = (
+{
+name = top;
+position = "{300, 700}";
+}
+);
+components = (
+{
+name = acutecomb;
+transform = "{1, 0, 0, 1, 10, 0}";
+}
+);
+layerId = "UUID-1";
+paths = (
+{
+closed = 1;
+nodes = (
+"0 0 LINE",
+"600 0 LINE",
+"300 700 LINE SMOOTH"
+);
+}
+);
+width = 600;
+}
+);
+leftKerningGroup = A;
+unicode = 0041;
+}
+);
+kerning = {
+"UUID-1" = {
+"@MMK_L_A" = {
+"@MMK_R_V" = -40;
+};
+};
+};
+unitsPerEm = 1000;
+}
+"""
+
+
+def test_glyphs3_round_trip_keeps_glyphs_layout():
+    assert glyphsPlist.dumps(glyphsPlist.loads(GLYPHS3)) == GLYPHS3
+
+
+def test_glyphs2_round_trip_keeps_glyphs_layout():
+    assert glyphsPlist.dumps(glyphsPlist.loads(GLYPHS2)) == GLYPHS2
+
+
+def test_round_trip_keeps_value_types():
+    font = glyphsPlist.loads(GLYPHS2)
+    glyph = font["glyphs"][0]
+    assert glyph["unicode"] == "0041"
+    assert font[".appVersion"] == "1353"
+    assert font["unitsPerEm"] == 1000
+
+
+# --- streaming and partial saves on a synthetic font ---
+
+SYNTHETIC_GLYPHS = 2000
+
+
+@pytest.fixture(scope="module")
+def syntheticPath(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("synthetic") / "Synthetic.glyphs")
+    glyphsPlist.writeSyntheticFont(path, SYNTHETIC_GLYPHS)
+    return path
+
+
+def peakMemory(run):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        return result, elapsed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def firstMasterAnchors(path, firstMaster):
+    """Yield (glyph name, anchors) of the first master, streamed one glyph at a time."""
+    for key, value in glyphsPlist.streamSections(path, {"fontMaster", "glyphs"}, glyphsPlist.OUTLINE_KEYS, {"glyphname", "layers"},
+                                                 layerFilter=lambda layer: layer.get("layerId") == firstMaster):
+        if key == "glyphs":
+            layer, = value["layers"]
+            assert all("nodes" not in shape for shape in layer.get("shapes", ()))
+            yield value["glyphname"], layer["anchors"]
+
+
+def test_streamed_sections_match_full_load(syntheticPath):
+    full = glyphsPlist.load(syntheticPath)
+
+    kerning, elapsed, peak = peakMemory(lambda: glyphsPlist.loadSections(syntheticPath, {"kerningLTR"}))
+    assert kerning["kerningLTR"] == full["kerningLTR"]
+    assert elapsed < 5.0, f"kerning-only load took {elapsed:.2f}s"
+
+    firstMaster = full["fontMaster"][0]["id"]
+    assert dict(firstMasterAnchors(syntheticPath, firstMaster)) == {
+        glyph["glyphname"]: glyph["layers"][0]["anchors"] for glyph in full["glyphs"]
+    }
+    # glyphs stream through one at a time: peak memory does not grow with the file
+    count, elapsed, peak = peakMemory(lambda: sum(1 for glyph in firstMasterAnchors(syntheticPath, firstMaster)))
+    assert count == SYNTHETIC_GLYPHS
+    assert peak < 1e6, f"streaming {count} glyphs peaked at {peak / 1e6:.1f} MB"
+
+
+def test_partial_save_only_rewrites_changed_sections(tmp_path):
+    source = tmp_path / "Test.glyphs"
+    source.write_text(GLYPHS3.replace("axesValues = (\n100\n);", "axesValues = (100);"), encoding="utf-8")
+    original = source.read_bytes()
+
+    font = GlyphsFileFont(str(source), sections={"fontMaster", "kerningLTR"})
+    font.save()
+    assert source.read_bytes() == original
+
+    font.setKerningForPair("m01", "@MMK_L_A", "@MMK_R_O", -10)
+    font.save()
+    saved = source.read_text(encoding="utf-8")
+    assert "axesValues = (100);" in saved  # untouched section keeps its bytes
+    assert glyphsPlist.loads(saved)["kerningLTR"]["m01"]["@MMK_L_A"] == {"@MMK_R_V": -40, "@MMK_R_O": -10}
+    assert glyphsPlist.loads(saved)["glyphs"] == glyphsPlist.loads(GLYPHS3)["glyphs"]
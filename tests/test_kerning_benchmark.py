@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the headless kerning engine on a synthetic 100k-pair table
+(400 left × 250 right groups), with generous time bounds so the test
+catches regressions to per-pair rescans, not machine noise.
+"""
+
+import random
+import time
+
+from kerningCore import KerningIndex, applyKerningPlan, planKerningGroupCopies
+
+LEFT_GROUPS = 400
+RIGHT_GROUPS = 250
+MASTERS = 12
+GROUP_PAIRS = [(f"g{i}", f"new{i}") for i in range(30)]
+
+
+def syntheticKerning():
+    rng = random.Random(0)
+    return {
+        f"@MMK_L_g{left}": {f"@MMK_R_g{right}": rng.randint(-80, 20) for right in range(RIGHT_GROUPS)}
+        for left in range(LEFT_GROUPS)
+    }
+
+
+def test_copy_30_groups_across_12_masters():
+    kerning = syntheticKerning()
+    assert sum(len(rightDict) for rightDict in kerning.values()) == 100000
+
+    start = time.perf_counter()
+    plans = [planKerningGroupCopies(kerning, GROUP_PAIRS) for master in range(MASTERS)]
+    elapsed = time.perf_counter() - start
+
+    plan = plans[0]
+    # every right group for each new left group, every left group for each new right group
+    assert len(plan) == len(GROUP_PAIRS) * RIGHT_GROUPS + LEFT_GROUPS * len(GROUP_PAIRS)
+    assert plan[("@MMK_L_new3", "@MMK_R_g7")] == kerning["@MMK_L_g3"]["@MMK_R_g7"]
+    assert plan[("@MMK_L_g250", "@MMK_R_new12")] == kerning["@MMK_L_g250"]["@MMK_R_g12"]
+    assert all(other == plan for other in plans[1:])
+    assert elapsed < 3.0, f"planning 12 masters took {elapsed:.2f}s"
+
+    written = applyKerningPlan(kerning, plan)
+    assert written == len(plan)
+    assert kerning["@MMK_L_new3"]["@MMK_R_g7"] == kerning["@MMK_L_g3"]["@MMK_R_g7"]
+
+
+def test_adjust_touches_every_pair_once():
+    kerning = syntheticKerning()
+    before = {leftKey: dict(rightDict) for leftKey, rightDict in kerning.items()}
+    keys = [f"@MMK_L_{base}" for base, target in GROUP_PAIRS] + [f"@MMK_R_{base}" for base, target in GROUP_PAIRS]
+
+    start = time.perf_counter()
+    index = KerningIndex(kerning)
+    adjusted = index.adjust(keys, -5)
+    elapsed = time.perf_counter() - start
+
+    overlap = len(GROUP_PAIRS) * len(GROUP_PAIRS)  # pairs with both sides in the list
+    assert adjusted == len(GROUP_PAIRS) * RIGHT_GROUPS + LEFT_GROUPS * len(GROUP_PAIRS) - overlap
+    assert kerning["@MMK_L_g0"]["@MMK_R_g0"] == before["@MMK_L_g0"]["@MMK_R_g0"] - 5
+    assert kerning["@MMK_L_g300"]["@MMK_R_g200"] == before["@MMK_L_g300"]["@MMK_R_g200"]
+    assert elapsed < 2.0, f"indexing and adjusting 100k pairs took {elapsed:.2f}s"
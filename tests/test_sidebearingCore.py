@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Sidebearing copies between two small .glyphs files, including empty layers."""
+
+import json
+
+import glyphsBatch
+from fontAccess import GlyphsFileFont
+from sidebearingCore import applyMetrics, extractMetrics, matchMasters, metricsDeltas
+
+SQUARE = """\
+{{
+closed = 1;
+nodes = (
+({left},0,l),
+({right},0,l),
+({right},500,l),
+({left},500,l)
+);
+}}"""
+
+
+def writeFont(path, glyphs):
+    """glyphs: {name: (left, right, width)}, or (None, None, width) for a layer without paths."""
+    entries = []
+    for name, (left, right, width) in glyphs.items():
+        shapes = f"shapes = (\n{SQUARE.format(left=left, right=right)}\n);\n" if left is not None else ""
+        entries.append(f"{{\nglyphname = {name};\nlayers = (\n{{\nlayerId = m01;\n{shapes}width = {width};\n}}\n);\n}}")
+    path.write_text(
+        "{\n.formatVersion = 3;\nfamilyName = Test;\nfontMaster = (\n{\nid = m01;\nname = Regular;\n}\n);\n"
+        f"glyphs = (\n{(',' + chr(10)).join(entries)}\n);\nunitsPerEm = 1000;\n}}\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def copyDeltas(sourceFont, destinationFont, write):
+    masterPairs = matchMasters(sourceFont.masters, destinationFont.masters)
+    glyphNames = [glyph.name for glyph in sourceFont.glyphs]
+    table = extractMetrics(sourceFont, glyphNames, [source.id for source, destination in masterPairs])
+    before = extractMetrics(destinationFont, glyphNames, [destination.id for source, destination in masterPairs])
+    written = None
+    if write:
+        written, errors = applyMetrics(destinationFont, table, [destination.id for source, destination in masterPairs])
+        assert not errors
+    return metricsDeltas(table, before, masterPairs, written, status="copied" if write else "planned")
+
+
+def test_empty_destination_layer_reports_width_only(tmp_path):
+    source = GlyphsFileFont(writeFont(tmp_path / "Source.glyphs", {"A": (50, 550, 600), "B": (40, 460, 500)}))
+    destination = GlyphsFileFont(writeFont(tmp_path / "Empty.glyphs", {"A": (None, None, 620), "B": (60, 460, 520)}))
+
+    for write in (False, True):
+        rows = {row["glyph"]: row for row in copyDeltas(source, destination, write)}
+        assert rows["A"]["status"] == "empty"
+        assert (rows["A"]["oldWidth"], rows["A"]["newWidth"], rows["A"]["deltaWidth"]) == (620, 620, 0)
+        assert "deltaLSB" not in rows["A"]
+        assert rows["B"]["status"] == ("copied" if write else "planned")
+        assert (rows["B"]["deltaLSB"], rows["B"]["deltaRSB"], rows["B"]["deltaWidth"]) == (-20, -20, -40)
+
+    layer = destination.glyphs["A"].layers["m01"]
+    assert (layer.width, layer.paths) == (620, [])
+
+
+def test_batch_dry_run_and_copy_with_empty_layer(tmp_path, capsys):
+    source = writeFont(tmp_path / "Source.glyphs", {"A": (50, 550, 600), "B": (40, 460, 500)})
+    destination = writeFont(tmp_path / "Empty.glyphs", {"A": (None, None, 620), "B": (60, 460, 520)})
+    original = open(destination, encoding="utf-8").read()
+
+    assert glyphsBatch.main(["copy-sidebearings", "--source", source, "--report", "json", destination]) == 0
+    assert "1 of 2 glyph layers change their advance width" in capsys.readouterr().out
+    assert open(destination, encoding="utf-8").read() == original
+    with open(tmp_path / "Empty.sidebearings.json", encoding="utf-8") as f:
+        statuses = {row["glyph"]: row["status"] for row in json.load(f)["deltas"]}
+    assert statuses == {"A": "empty", "B": "planned"}
+
+    assert glyphsBatch.main(["copy-sidebearings", "--source", source, "--write", destination]) == 0
+    assert "1 of 2 glyph layers change their advance width" in capsys.readouterr().out
+    assert GlyphsFileFont(destination).glyphs["B"].layers["m01"].width == 480
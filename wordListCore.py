@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+__doc__ = """
+Word lists for KernKween (no UI, no MenuTitle).
+Lists are plain .txt files of whitespace-separated words, loaded lazily
+and tokenised once, with a per-word bigram bitset index for coverage
+selection. Drop your own lists into the wordlists folder next
+to the scripts, or into USER_WORDLIST_FOLDER.
+"""
+
+import heapq
+import os
+import re
+
+WORDLIST_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlists")
+USER_WORDLIST_FOLDER = os.path.expanduser("~/Library/Application Support/KernKween")
+
+# Bundled lists first, in this order
+DEFAULT_LISTS = ["lc-lc", "Uc-lc"]
+
+# A unit is one character or a /glyphname escape as used in Edit view text
+UNIT_PATTERN = re.compile(r"/[^/\s]+|.")
+
+_wordCache = {}
+_indexCache = {}
+
+
+def availableWordLists():
+    """Return {list name: path} for bundled and user lists (user lists win on name clashes)."""
+    lists = {}
+    for folder in (WORDLIST_FOLDER, USER_WORDLIST_FOLDER):
+        if not os.path.isdir(folder):
+            continue
+        for fileName in sorted(os.listdir(folder)):
+            name, ext = os.path.splitext(fileName)
+            if ext.lower() == ".txt":
+                lists[name] = os.path.join(folder, fileName)
+    ordered = {name: lists.pop(name) for name in DEFAULT_LISTS if name in lists}
+    ordered.update(lists)
+    return ordered
+
+
+def loadWords(path):
+    """Tokenised words of a list, cached until the file changes."""
+    mtime = os.path.getmtime(path)
+    cached = _wordCache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        words = tuple(f.read().split())
+    _wordCache[path] = (mtime, words)
+    return words
+
+
+def wordUnits(word):
+    """Split a word into characters and /glyphname escapes."""
+    return UNIT_PATTERN.findall(word)
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+class WordIndex(object):
+    """
+    Precomputed per-word data for coverage selection: the units of each word
+    and a bitset of its bigrams (bit i = bigram i of self.bigrams).
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.units = []
+        self.masks = []
+        self.bigrams = []
+        bigramIds = {}
+        for word in words:
+            units = wordUnits(word)
+            mask = 0
+            for bigram in zip(units, units[1:]):
+                bit = bigramIds.get(bigram)
+                if bit is None:
+                    bit = bigramIds[bigram] = len(self.bigrams)
+                    self.bigrams.append(bigram)
+                mask |= 1 << bit
+            self.units.append(frozenset(units))
+            self.masks.append(mask)
+
+    def availableWords(self, availableUnits):
+        """Indices of the words whose units are all in availableUnits."""
+        return [i for i, units in enumerate(self.units) if units <= availableUnits]
+
+    def bigramMask(self, predicate):
+        """Bitset of all bigrams for which predicate(first, second) is true."""
+        mask = 0
+        for bit, (first, second) in enumerate(self.bigrams):
+            if predicate(first, second):
+                mask |= 1 << bit
+        return mask
+
+    def selectCoverage(self, count, candidates=None, preferredMask=0):
+        """
+        Greedily pick up to count word indices that add the most new bigrams.
+        New bigrams in preferredMask count double. Uses lazy greedy evaluation:
+        a word's gain can only shrink, so stale heap entries are re-scored on pop.
+        """
+        if candidates is None:
+            candidates = range(len(self.words))
+
+        def gain(i, covered):
+            new = self.masks[i] & ~covered
+            return popcount(new) + popcount(new & preferredMask)
+
+        heap = [(-gain(i, 0), i) for i in candidates]
+        heapq.heapify(heap)
+        covered = 0
+        selected = []
+        while heap and len(selected) < count:
+            negGain, i = heapq.heappop(heap)
+            currentGain = gain(i, covered)
+            if heap and currentGain < -heap[0][0]:
+                heapq.heappush(heap, (-currentGain, i))
+                continue
+            selected.append(i)
+            covered |= self.masks[i]
+        return selected
+
+
+def wordIndex(path):
+    """WordIndex for a list, cached together with its words."""
+    words = loadWords(path)
+    cached = _indexCache.get(path)
+    if cached and cached.words is words:
+        return cached
+    index = _indexCache[path] = WordIndex(words)
+    return index